@@ -1,55 +1,174 @@
-import json
-import os
-from datetime import date, datetime
-from json import JSONDecodeError
-
-today = date.today()
-
-PERSON_DATA_FILE = "json_program1.json"
-
-
-def age_calculation(dob):
-    """
-    Calculates age based on the date of birth.
-    :param dob: Date of birth in YYYY-MM-DD format.
-    :return: Age as integer or None if format is invalid.
-    """
-    try:
-        birth_datetime = datetime.strptime(dob, "%Y-%m-%d")
-    except ValueError:
-        print(f"Invalid date format: {dob}")
-        return None
-    birth_date = birth_datetime.date()
-    person_age = today.year - birth_date.year
-    if (today.month, today.day) < (birth_date.month, birth_date.day):
-        person_age -= 1
-    return person_age
-
-
-def main():
-    """
-    Main program execution logic.
-    """
-    if os.path.exists(PERSON_DATA_FILE):
-        try:
-            with open(PERSON_DATA_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except FileNotFoundError:
-            print("File is not found")
-        except JSONDecodeError:
-            print("There are issues with JSON file")
-        else:
-            new_list = []
-            for person in data:
-                dob = person.get("birth_date", "")
-                person_age = age_calculation(dob)
-                if person_age is not None and person_age < 18:
-                    new_list.append(person)
-            for row in new_list:
-                print(json.dumps(row, ensure_ascii=False, indent=2))
-    else:
-        print("File does not exist")
-
-
-if __name__ == "__main__":
-    main()
+import calendar
+import json
+import os
+import re
+from datetime import date, datetime
+from json import JSONDecodeError
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+from persons_io import read_persons
+
+PERSON_DATA_FILE = "json_program1.json"
+
+ADULT_AGE = 18
+
+_ISO_DATE = re.compile(r"\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])", re.ASCII)
+_LAST_DAYS = {"01": "31", "03": "31", "04": "30", "05": "31", "06": "30", "07": "31",
+              "08": "31", "09": "30", "10": "31", "11": "30", "12": "31"}
+# Sentinels above and below every well-formed date string
+_NO_UPPER_BOUND = "9999-99-99"
+_NO_LOWER_BOUND = ""
+
+
+def age_calculation(dob, today: Optional[date] = None, quiet: bool = False):
+    """
+    Calculates age based on the date of birth.
+    :param dob: Date of birth in YYYY-MM-DD format.
+    :param today: Day the age is calculated on, the current date by default.
+    :param quiet: Do not print a message for an invalid date.
+    :return: Age as integer or None if format is invalid.
+    """
+    today = today or date.today()
+    try:
+        birth_datetime = datetime.strptime(dob, "%Y-%m-%d")
+    except ValueError:
+        if not quiet:
+            print(f"Invalid date format: {dob}")
+        return None
+    birth_date = birth_datetime.date()
+    person_age = today.year - birth_date.year
+    if (today.month, today.day) < (birth_date.month, birth_date.day):
+        person_age -= 1
+    return person_age
+
+
+def is_iso_date(dob) -> bool:
+    """Check that dob is a zero-padded YYYY-MM-DD string naming a real day"""
+    if not isinstance(dob, str) or not _ISO_DATE.fullmatch(dob) or dob.startswith("0000"):
+        return False
+    day = dob[8:]
+    if day <= "28":
+        return True
+    month = dob[5:7]
+    if month == "02":
+        return day == "29" and calendar.isleap(int(dob[:4]))
+    return day <= _LAST_DAYS[month]
+
+
+class AgeFilter:
+    """
+    Selects persons whose age, as age_calculation counts it, lies in an inclusive range.
+
+    The range is turned into two birth-date cutoffs once per reference day, so a
+    well-formed YYYY-MM-DD birth date is matched by plain string comparison;
+    only malformed values are parsed by age_calculation.
+
+    Attributes:
+        min_age (int): Lowest matching age, unbounded when None
+        max_age (int): Highest matching age, unbounded when None
+        reference (date): Day ages are counted on; None means the current date,
+            looked up again on every filter() or matches() call
+    """
+
+    def __init__(
+        self, min_age: Optional[int] = None, max_age: Optional[int] = None, reference: Optional[date] = None
+    ) -> None:
+        if (min_age is not None and min_age < 0) or (max_age is not None and max_age < 0):
+            raise ValueError("Ages must not be negative")
+        if min_age is not None and max_age is not None and min_age > max_age:
+            raise ValueError("min_age must not be greater than max_age")
+        self.min_age = min_age
+        self.max_age = max_age
+        self.reference = reference
+
+    def cutoffs(self, reference: Optional[date] = None) -> Tuple[str, str]:
+        """
+        Birth-date bounds equivalent to the age range.
+        A person is max_age or younger if born after (ref.year - max_age - 1, ref.month, ref.day)
+        and min_age or older if born on or before (ref.year - min_age, ref.month, ref.day);
+        the bounds stay lexicographic, so Feb 29 needs no special case.
+        :param reference: Day ages are counted on, self.reference or today by default.
+        :return: Tuple (born_after, born_on_or_before) of ISO strings.
+        """
+        reference = reference or self.reference or date.today()
+        born_after, born_on_or_before = _NO_LOWER_BOUND, _NO_UPPER_BOUND
+        if self.max_age is not None and reference.year - self.max_age - 1 >= 1:
+            born_after = f"{reference.year - self.max_age - 1:04d}-{reference.month:02d}-{reference.day:02d}"
+        if self.min_age is not None:
+            year = reference.year - self.min_age
+            if year < 1:
+                born_on_or_before = _NO_LOWER_BOUND
+            else:
+                born_on_or_before = f"{year:04d}-{reference.month:02d}-{reference.day:02d}"
+        return born_after, born_on_or_before
+
+    def predicate(self, reference: Optional[date] = None, quiet: bool = False) -> Callable[[object], bool]:
+        """
+        Birth-date test with the cutoffs fixed for one reference day.
+        :param reference: Day ages are counted on, self.reference or today by default.
+        :param quiet: Do not print messages for invalid dates.
+        :return: Callable taking a birth_date value and returning whether it matches.
+        """
+        reference = reference or self.reference or date.today()
+        born_after, born_on_or_before = self.cutoffs(reference)
+        min_age, max_age = self.min_age, self.max_age
+
+        def matches(dob) -> bool:
+            if is_iso_date(dob):
+                return born_after < dob <= born_on_or_before
+            if not isinstance(dob, str):
+                return False
+            person_age = age_calculation(dob, reference, quiet)
+            return (
+                person_age is not None
+                and (min_age is None or person_age >= min_age)
+                and (max_age is None or person_age <= max_age)
+            )
+
+        return matches
+
+    def matches(self, dob) -> bool:
+        """Check one birth date"""
+        return self.predicate()(dob)
+
+    def filter(self, persons: Iterable[dict]) -> Iterator[dict]:
+        """
+        Lazily keep persons whose age is in the range.
+        :param persons: Iterable (or generator) of person dicts with birth_date.
+        :return: Generator of matching persons.
+        """
+        matches = self.predicate()
+        for person in persons:
+            if matches(person.get("birth_date", "")):
+                yield person
+
+
+def filter_minors(persons: Iterable[dict], today: Optional[date] = None) -> Iterator[dict]:
+    """
+    Lazily keep persons younger than 18.
+    :param persons: Iterable (or generator) of person dicts with birth_date.
+    :param today: Day ages are counted on, the current date by default.
+    :return: Generator of matching persons.
+    """
+    return AgeFilter(max_age=ADULT_AGE - 1, reference=today).filter(persons)
+
+
+def main():
+    """
+    Main program execution logic.
+    """
+    if os.path.exists(PERSON_DATA_FILE):
+        try:
+            with open(PERSON_DATA_FILE, "r", encoding="utf-8") as f:
+                for row in filter_minors(read_persons(f)):
+                    print(json.dumps(row, ensure_ascii=False, indent=2))
+        except FileNotFoundError:
+            print("File is not found")
+        except JSONDecodeError:
+            print("There are issues with JSON file")
+    else:
+        print("File does not exist")
+
+
+if __name__ == "__main__":
+    main()
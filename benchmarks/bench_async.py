@@ -0,0 +1,104 @@
+"""
+Compare the async repository with sync calls pushed into a thread pool.
+
+Both sides run the same number of concurrent tasks, each reading random films
+by id. aiosqlite still runs every connection on a helper thread, so the async
+path mostly removes the executor-size cap on concurrency rather than making
+single queries faster.
+
+Usage:
+    python -m benchmarks.bench_async --tasks 200 --reads 50 --threads 8
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import synthetic_films
+from database import Base, make_async_engine, make_engine
+from film_models import Films
+from repository_films import add_films_bulk
+
+
+async def run_async(url: str, rows: int, tasks: int, reads: int) -> float:
+    """Concurrent reads through AsyncSession"""
+    engine = make_async_engine("read_heavy", url, pool_size=tasks, max_overflow=0)
+    AsyncSession = async_sessionmaker(engine)
+
+    async def worker():
+        local_random = random.Random()
+        async with AsyncSession() as session:
+            for _ in range(reads):
+                await session.get(Films, local_random.randint(1, rows))
+                session.expunge_all()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(tasks)))
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return elapsed
+
+
+async def run_threaded(url: str, rows: int, tasks: int, reads: int, threads: int) -> float:
+    """Concurrent reads through the sync repository wrapped in a thread pool"""
+    engine = make_engine("read_heavy", url, pool_size=threads, max_overflow=0)
+    Session = sessionmaker(bind=engine)
+    loop = asyncio.get_running_loop()
+
+    def read_film(film_id):
+        with Session() as session:
+            session.get(Films, film_id)
+
+    async def worker(executor):
+        local_random = random.Random()
+        for _ in range(reads):
+            await loop.run_in_executor(executor, read_film, local_random.randint(1, rows))
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(executor) for _ in range(tasks)))
+        elapsed = time.perf_counter() - start
+    engine.dispose()
+    return elapsed
+
+
+def main():
+    """Load a catalog once and time both access paths"""
+    parser = argparse.ArgumentParser(description="Async repository benchmark")
+    parser.add_argument("--rows", type=int, default=50000, help="Catalog size")
+    parser.add_argument("--tasks", type=int, default=200, help="Concurrent asyncio tasks")
+    parser.add_argument("--reads", type=int, default=50, help="Reads per task")
+    parser.add_argument("--threads", type=int, default=8, help="Thread pool size for the sync path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'films_bench.sqlite3')}"
+        engine = make_engine("bulk_load", url)
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as session:
+            add_films_bulk(session, synthetic_films(args.rows), batch_size=10000)
+        engine.dispose()
+
+        total = args.tasks * args.reads
+        results = {
+            f"threaded ({args.threads} threads)": asyncio.run(
+                run_threaded(url, args.rows, args.tasks, args.reads, args.threads)
+            ),
+            "async": asyncio.run(run_async(url, args.rows, args.tasks, args.reads)),
+        }
+
+    print(f"{'Path':<24} {'Seconds':>9} {'Reads/sec':>12}")
+    print("-" * 47)
+    for name, seconds in results.items():
+        print(f"{name:<24} {seconds:>9.3f} {total / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Compare row-by-row add_film against add_films_bulk.
+
+Usage:
+    python -m benchmarks.bench_bulk_insert --rows 20000 --batch-size 1000
+"""
+
+import argparse
+
+from benchmarks.common import synthetic_films, temporary_database, timer
+from film_models import Films
+from repository_films import add_film, add_films_bulk
+
+
+def main():
+    """Run both insert paths on fresh databases and print rows/sec"""
+    parser = argparse.ArgumentParser(description="Bulk insert benchmark")
+    parser.add_argument("--rows", type=int, default=20000, help="Rows to insert")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per commit")
+    args = parser.parse_args()
+
+    results = {}
+    with temporary_database() as (_, Session):
+        with Session() as session, timer(results, "add_film loop"):
+            for row in synthetic_films(args.rows):
+                add_film(session, Films(**row))
+
+    with temporary_database() as (_, Session):
+        with Session() as session, timer(results, "add_films_bulk"):
+            add_films_bulk(session, synthetic_films(args.rows), batch_size=args.batch_size)
+
+    print(f"{'Path':<18} {'Seconds':>9} {'Rows/sec':>12}")
+    print("-" * 41)
+    for name, seconds in results.items():
+        print(f"{name:<18} {seconds:>9.3f} {args.rows / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Measure FilmsService read throughput as reader threads are added.
+
+A single writer keeps inserting small batches during every run; each read is a
+primary-key lookup plus an indexed year-range count.
+
+Usage:
+    python -m benchmarks.bench_concurrency --threads 1 2 4 8 16 --queries 4000
+"""
+
+import argparse
+import itertools
+import random
+import threading
+import time
+from typing import Iterator
+
+from sqlalchemy import func, select
+
+from benchmarks.common import synthetic_films, temporary_database
+from film_models import Films
+from films_service import FilmsService
+from repository_films import add_films_bulk
+
+
+def read_film(session, film_id: int) -> int:
+    """Point lookup followed by an indexed range count"""
+    film = session.get(Films, film_id)
+    return session.scalar(
+        select(func.count()).where(Films.release_year.between(film.release_year, film.release_year + 5))
+    )
+
+
+def run(engine, rows: int, threads: int, queries: int, offsets: Iterator[int]) -> float:
+    """Queries per second with the given number of reader threads"""
+    stop = threading.Event()
+    with FilmsService(engine, readers=threads) as service:
+
+        def keep_writing():
+            while not stop.is_set():
+                service.write(add_films_bulk, synthetic_films(20, next(offsets)), 20).result()
+
+        writer = threading.Thread(target=keep_writing)
+        writer.start()
+        film_ids = [random.randint(1, rows) for _ in range(queries)]
+        start = time.perf_counter()
+        service.read_many(read_film, [(film_id,) for film_id in film_ids])
+        elapsed = time.perf_counter() - start
+        stop.set()
+        writer.join()
+    return queries / elapsed
+
+
+def main():
+    """Load a catalog once and measure every thread count on it"""
+    parser = argparse.ArgumentParser(description="Concurrent read benchmark")
+    parser.add_argument("--rows", type=int, default=100000, help="Catalog size")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="Reader threads")
+    parser.add_argument("--queries", type=int, default=4000, help="Reads per run")
+    args = parser.parse_args()
+
+    with temporary_database("read_heavy") as (engine, Session):
+        with Session() as session:
+            add_films_bulk(session, synthetic_films(args.rows), batch_size=10000)
+        offsets = itertools.count(args.rows, 20)
+        print(f"{'Threads':>8} {'Queries/sec':>13}")
+        print("-" * 22)
+        for threads in args.threads:
+            print(f"{threads:>8} {run(engine, args.rows, threads, args.queries, offsets):>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
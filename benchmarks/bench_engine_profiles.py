@@ -0,0 +1,103 @@
+"""
+Compare engine profiles on a mixed read/write workload.
+
+One writer thread inserts small batches while reader threads fetch films by id.
+The "test" profile shares a single connection and is not meant for threads,
+"bulk_load" keeps one pooled connection, so both are left out by default.
+
+Usage:
+    python -m benchmarks.bench_engine_profiles --seconds 3 --readers 4
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from benchmarks.common import synthetic_films, temporary_database
+from film_models import Films
+from repository_films import add_films_bulk
+
+
+def run_workload(profile: str, seed_rows: int, seconds: float, readers: int) -> dict:
+    """Run writer and readers for a fixed time and count completed operations"""
+    counters = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    with temporary_database(profile) as (_, Session):
+        with Session() as session:
+            add_films_bulk(session, synthetic_films(seed_rows), batch_size=5000)
+
+        def writer():
+            offset = seed_rows
+            with Session() as session:
+                while not stop.is_set():
+                    try:
+                        add_films_bulk(session, synthetic_films(10, offset), batch_size=10)
+                    except OperationalError:
+                        session.rollback()
+                        with lock:
+                            counters["errors"] += 1
+                        continue
+                    offset += 10
+                    with lock:
+                        counters["writes"] += 10
+
+        def reader():
+            local_random = random.Random()
+            done = 0
+            with Session() as session:
+                while not stop.is_set():
+                    try:
+                        session.get(Films, local_random.randint(1, seed_rows))
+                        session.expunge_all()
+                        session.rollback()
+                    except OperationalError:
+                        session.rollback()
+                        with lock:
+                            counters["errors"] += 1
+                        continue
+                    done += 1
+            with lock:
+                counters["reads"] += done
+
+        threads = [threading.Thread(target=writer)]
+        threads += [threading.Thread(target=reader) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return counters
+
+
+def main():
+    """Run the workload for every profile and print operations per second"""
+    parser = argparse.ArgumentParser(description="Engine profile benchmark")
+    parser.add_argument("--rows", type=int, default=20000, help="Rows loaded before the run")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Duration per profile")
+    parser.add_argument("--readers", type=int, default=4, help="Reader threads")
+    parser.add_argument(
+        "--profiles",
+        nargs="*",
+        default=["plain", "default", "read_heavy"],
+        help="Profiles to compare",
+    )
+    args = parser.parse_args()
+
+    print(f"{'Profile':<12} {'Writes/sec':>12} {'Reads/sec':>12} {'Errors':>8}")
+    print("-" * 47)
+    for profile in args.profiles:
+        counters = run_workload(profile, args.rows, args.seconds, args.readers)
+        print(
+            f"{profile:<12} {counters['writes'] / args.seconds:>12,.0f}"
+            f" {counters['reads'] / args.seconds:>12,.0f} {counters['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compare get_all_films (ORM objects) with the Core FilmRecord read path.
+
+Each read runs after a fresh session so ORM runs do not benefit from a warm
+identity map; peak RSS is reset between runs.
+
+Usage:
+    python -m benchmarks.bench_fast_read --rows 1000000
+"""
+
+import argparse
+
+from benchmarks.common import measure, synthetic_films, temporary_database
+from repository_films import (add_films_bulk, get_all_films, get_film_records,
+                              iter_film_records)
+
+
+def main():
+    """Load a catalog and time each read path"""
+    parser = argparse.ArgumentParser(description="Fast read path benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Catalog size")
+    args = parser.parse_args()
+
+    with temporary_database("read_heavy") as (_, Session):
+        with Session() as session:
+            add_films_bulk(session, synthetic_films(args.rows), batch_size=10000)
+
+        reads = {
+            "get_all_films (ORM)": lambda session: len(get_all_films(session)),
+            "get_film_records": lambda session: len(get_film_records(session)),
+            "get_film_records (id, title)": lambda session: len(
+                get_film_records(session, ("id", "title"))
+            ),
+            "iter_film_records": lambda session: sum(1 for _ in iter_film_records(session)),
+        }
+        results = {}
+        for name, read in reads.items():
+            with Session() as session:
+                results[name] = measure(lambda: read(session))
+
+    print(f"{'Read path':<30} {'Seconds':>9} {'Rows/sec':>12} {'Peak RSS MiB':>13}")
+    print("-" * 67)
+    for name, result in results.items():
+        print(
+            f"{name:<30} {result['seconds']:>9.3f} {result['ops_per_sec']:>12,.0f}"
+            f" {result['peak_rss_mb']:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Compare ways of giving every test a populated database.
+
+A template with --rows films is built once; then each strategy prepares
+--tests fresh databases the way a per-test fixture would:
+
+* orm_rows - create the schema and add films one by one through the ORM
+* bulk_insert - create the schema and load films with add_films_bulk
+* backup_clone - copy the template into memory with the SQLite backup API
+
+Usage:
+    python -m benchmarks.bench_fixtures --rows 100000 --tests 5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import synthetic_films
+from database import Base, clone_database, make_engine
+from film_models import Films
+from repository_films import add_films_bulk
+
+
+def build_template(path: str, rows: int) -> None:
+    """Create the template file once, as the session-scoped fixture does"""
+    engine = make_engine("bulk_load", f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        add_films_bulk(session, synthetic_films(rows), batch_size=10000)
+    with engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        connection.exec_driver_sql("PRAGMA journal_mode=DELETE")
+    engine.dispose()
+
+
+def orm_rows(template: str, rows: int) -> None:
+    """Per-test setup by adding ORM objects, one commit at the end"""
+    engine = make_engine("test", "sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add_all(Films(**film) for film in synthetic_films(rows))
+        session.commit()
+    engine.dispose()
+
+
+def bulk_insert(template: str, rows: int) -> None:
+    """Per-test setup through batched Core inserts"""
+    engine = make_engine("test", "sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        add_films_bulk(session, synthetic_films(rows), batch_size=10000)
+    engine.dispose()
+
+
+def backup_clone(template: str, rows: int) -> None:
+    """Per-test setup by copying the template pages"""
+    clone_database(template).dispose()
+
+
+STRATEGIES = {"orm_rows": orm_rows, "bulk_insert": bulk_insert, "backup_clone": backup_clone}
+
+
+def main():
+    """Build the template and time each setup strategy"""
+    parser = argparse.ArgumentParser(description="Test fixture setup benchmark")
+    parser.add_argument("--rows", type=int, default=100000, help="Films in the template")
+    parser.add_argument("--tests", type=int, default=5, help="Simulated tests per strategy")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        template = os.path.join(directory, "films_template.sqlite3")
+        start = time.perf_counter()
+        build_template(template, args.rows)
+        build_seconds = time.perf_counter() - start
+
+        results = {}
+        for name, strategy in STRATEGIES.items():
+            start = time.perf_counter()
+            for _ in range(args.tests):
+                strategy(template, args.rows)
+            results[name] = (time.perf_counter() - start) / args.tests
+
+    print(f"Template build ({args.rows:,} films): {build_seconds:.3f} s, paid once per test session")
+    print(f"{'Strategy':<14} {'Per test, s':>12} {'Speedup':>9}")
+    print("-" * 37)
+    baseline = results["orm_rows"]
+    for name, seconds in results.items():
+        print(f"{name:<14} {seconds:>12.4f} {baseline / seconds:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
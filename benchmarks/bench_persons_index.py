@@ -0,0 +1,72 @@
+"""
+Compare age-bracket queries through the birth-date index with full scans.
+
+Usage:
+    python -m benchmarks.bench_persons_index --persons 1000000 --append 10000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import date
+
+from benchmarks.bench_persons_stream import write_persons
+from persons_index import BirthDateIndex, build_index, update_index
+from persons_io import read_persons
+from Task_Standard_Library import AgeFilter
+
+BRACKETS = ((None, 17), (18, 24), (65, None), (40, 40))
+
+
+def main():
+    """Build the index once, then time every bracket both ways"""
+    parser = argparse.ArgumentParser(description="Birth-date index benchmark")
+    parser.add_argument("--persons", type=int, default=1000000, help="Persons in the generated file")
+    parser.add_argument("--append", type=int, default=10000, help="Persons appended for the incremental update")
+    args = parser.parse_args()
+    reference = date.today()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "persons.json")
+        write_persons(path, args.persons)
+        start = time.perf_counter()
+        build_index(path)
+        build_seconds = time.perf_counter() - start
+        index_mb = os.path.getsize(path + ".bdidx") / 2 ** 20
+
+        rows = []
+        for min_age, max_age in BRACKETS:
+            start = time.perf_counter()
+            with open(path, "r", encoding="utf-8") as f:
+                scanned = sum(1 for _ in AgeFilter(min_age, max_age, reference).filter(read_persons(f)))
+            scan_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            with BirthDateIndex(path) as index:
+                indexed = sum(1 for _ in index.query(min_age, max_age, reference))
+            index_seconds = time.perf_counter() - start
+            assert scanned == indexed
+            rows.append((f"{min_age if min_age is not None else ''}..{max_age if max_age is not None else ''}", indexed, scan_seconds, index_seconds))
+
+        # Append records in array syntax: drop the closing bracket, add items, close again
+        with open(path, "r+b") as f:
+            f.seek(-2, os.SEEK_END)
+            f.truncate()
+            f.write("".join(
+                "," + json.dumps({"name": f"New {number}", "birth_date": "2012-06-01"}) + "\n" for number in range(args.append)
+            ).encode() + b"]\n")
+        start = time.perf_counter()
+        status, added = update_index(path)
+        update_seconds = time.perf_counter() - start
+
+    print(f"Index build: {build_seconds:.2f} s for {args.persons:,} persons, {index_mb:.1f} MiB")
+    print(f"Incremental update ({status}): {added:,} records in {update_seconds:.2f} s")
+    print(f"{'Ages':<8} {'Persons':>9} {'Scan, s':>9} {'Index, s':>9} {'Speedup':>9}")
+    print("-" * 48)
+    for name, persons, scan_seconds, index_seconds in rows:
+        print(f"{name:<8} {persons:>9,} {scan_seconds:>9.3f} {index_seconds:>9.3f} {scan_seconds / index_seconds:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
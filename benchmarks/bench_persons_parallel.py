@@ -0,0 +1,55 @@
+"""
+Measure how filtering many persons files scales with worker processes.
+
+Usage:
+    python -m benchmarks.bench_persons_parallel --files 16 --persons 100000 --jobs 1 2 4 8
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from persons_parallel import expand_inputs, plan_shards, process_files
+
+
+def write_region(path: str, count: int, seed: int) -> None:
+    """Write one NDJSON persons file"""
+    first = date(1945, 1, 1)
+    with open(path, "w", encoding="utf-8") as f:
+        for number in range(count):
+            birth_date = first + timedelta(days=(number * 7919 + seed) % 29220)
+            f.write(json.dumps({"name": f"Person {seed}-{number}", "birth_date": birth_date.isoformat()}) + "\n")
+
+
+def main():
+    """Generate per-region files and time the filter with each worker count"""
+    parser = argparse.ArgumentParser(description="Parallel persons filter benchmark")
+    parser.add_argument("--files", type=int, default=16, help="Number of region files")
+    parser.add_argument("--persons", type=int, default=100000, help="Persons per file")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    reference = date.today()
+    with tempfile.TemporaryDirectory() as directory:
+        for number in range(args.files):
+            write_region(os.path.join(directory, f"region_{number:03d}.ndjson"), args.persons, number)
+        shards = plan_shards(expand_inputs([directory]))
+
+        total = args.files * args.persons
+        print(f"{args.files} files x {args.persons:,} persons, {os.cpu_count()} CPUs")
+        print(f"{'Jobs':>5} {'Seconds':>9} {'Persons/sec':>13} {'Speedup':>9}")
+        print("-" * 39)
+        baseline = None
+        for jobs in sorted(set(args.jobs)):
+            start = time.perf_counter()
+            matches = sum(len(result.outputs[0]) for result in process_files(shards, ["age < 18"], reference, jobs))
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            print(f"{jobs:>5} {seconds:>9.3f} {total / seconds:>13,.0f} {baseline / seconds:>8.2f}x  ({matches:,} matches)")
+
+
+if __name__ == "__main__":
+    main()
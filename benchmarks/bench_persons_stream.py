@@ -0,0 +1,83 @@
+"""
+Compare peak memory of json.load with the streaming persons reader.
+
+Both modes filter minors from the same generated top-level JSON array; every
+mode runs in a fresh worker process so peak RSS of one does not leak into the
+other.
+
+Usage:
+    python -m benchmarks.bench_persons_stream --persons 1000000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+from benchmarks.common import measure
+from persons_io import read_persons
+from Task_Standard_Library import filter_minors
+
+
+def write_persons(path: str, count: int) -> None:
+    """Write a JSON array of persons with birth dates spread over 80 years"""
+    first = date(1945, 1, 1)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for number in range(count):
+            person = {
+                "name": f"Person {number}",
+                "country": ("PL", "BY", "DE", "FR")[number % 4],
+                "birth_date": (first + timedelta(days=number * 7 % 29220)).isoformat(),
+            }
+            f.write(("," if number else "") + json.dumps(person) + "\n")
+        f.write("]\n")
+
+
+def load_all(path: str) -> int:
+    """Original approach: parse the whole array, then filter"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return sum(1 for _ in filter_minors(data))
+
+
+def stream(path: str) -> int:
+    """Generator pipeline over the streaming reader"""
+    with open(path, "r", encoding="utf-8") as f:
+        return sum(1 for _ in filter_minors(read_persons(f)))
+
+
+MODES = {"json.load": load_all, "streaming": stream}
+
+
+def run_mode(name: str, path: str) -> dict:
+    """Measure one mode inside a worker process"""
+    return measure(lambda: MODES[name](path))
+
+
+def main():
+    """Generate a persons file and measure both readers"""
+    parser = argparse.ArgumentParser(description="Persons reader memory benchmark")
+    parser.add_argument("--persons", type=int, default=1000000, help="Persons in the generated file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "persons.json")
+        write_persons(path, args.persons)
+        size_mb = os.path.getsize(path) / 2 ** 20
+        results = {}
+        for name in MODES:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                results[name] = executor.submit(run_mode, name, path).result()
+
+    print(f"Input: {args.persons:,} persons, {size_mb:.1f} MiB")
+    print(f"{'Reader':<12} {'Seconds':>9} {'Minors':>10} {'Peak RSS, MiB':>15}")
+    print("-" * 49)
+    for name, result in results.items():
+        print(f"{name:<12} {result['seconds']:>9.3f} {result['ops']:>10,} {result['peak_rss_mb']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compare per-row age_calculation with the vectorized birth-date column.
+
+Usage:
+    python -m benchmarks.bench_persons_vectorized --persons 2000000 --invalid 0.01
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from persons_columns import minor_mask, parse_birth_dates
+import Task_Standard_Library
+
+
+def birth_dates(count: int, invalid_share: float) -> list:
+    """ISO birth dates over 80 years with a share of malformed values"""
+    generator = random.Random(42)
+    first = date(1945, 1, 1)
+    return [
+        "31-02-2001" if generator.random() < invalid_share else (first + timedelta(days=generator.randrange(29220))).isoformat()
+        for _ in range(count)
+    ]
+
+
+def main():
+    """Time both ways of building the minors mask"""
+    parser = argparse.ArgumentParser(description="Vectorized age benchmark")
+    parser.add_argument("--persons", type=int, default=2000000, help="Number of birth dates")
+    parser.add_argument("--invalid", type=float, default=0.01, help="Share of malformed dates")
+    args = parser.parse_args()
+
+    values = birth_dates(args.persons, args.invalid)
+    today = date.today()
+    # age_calculation prints every bad date, keep that out of the timing
+    Task_Standard_Library.print = lambda *args, **kwargs: None
+
+    start = time.perf_counter()
+    ages = [Task_Standard_Library.age_calculation(value, today) for value in values]
+    per_row = [age is not None and age < 18 for age in ages]
+    row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mask = minor_mask(parse_birth_dates(values), today)
+    vector_seconds = time.perf_counter() - start
+
+    assert mask.tolist() == per_row
+    print(f"{args.persons:,} birth dates, {args.invalid:.1%} invalid, {sum(per_row):,} minors")
+    print(f"{'Method':<16} {'Seconds':>9} {'Dates/sec':>13}")
+    print("-" * 40)
+    for name, seconds in (("age_calculation", row_seconds), ("vectorized", vector_seconds)):
+        print(f"{name:<16} {seconds:>9.3f} {args.persons / seconds:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Compare FTS5 search_films against a LIKE '%...%' scan.
+
+LIKE cannot rank, so it has to collect every matching row before results can
+be ordered; the scan is therefore timed without LIMIT.
+
+Usage:
+    python -m benchmarks.bench_search --rows 1000000
+"""
+
+import argparse
+
+from sqlalchemy import select
+
+from benchmarks.common import synthetic_films, temporary_database, timer
+from film_models import Films
+from repository_films import add_films_bulk, search_films
+
+QUERIES = ("crystal summer garden", "blade runner night", "stranger 4242", "kurosawa")
+
+
+def main():
+    """Load a synthetic catalog and time both search paths per query"""
+    parser = argparse.ArgumentParser(description="Title search benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Catalog size")
+    parser.add_argument("--limit", type=int, default=20, help="Results per query")
+    args = parser.parse_args()
+
+    with temporary_database("bulk_load") as (_, Session), Session() as session:
+        add_films_bulk(session, synthetic_films(args.rows), batch_size=10000)
+
+        print(f"{'Query':<22} {'LIKE sec':>10} {'FTS5 sec':>10} {'Speedup':>9}")
+        print("-" * 54)
+        for query in QUERIES:
+            results = {}
+            conditions = [
+                Films.title.ilike(f"%{term}%") | Films.director.ilike(f"%{term}%")
+                for term in query.split()
+            ]
+            with timer(results, "like"):
+                session.scalars(select(Films).where(*conditions)).all()
+            with timer(results, "fts"):
+                search_films(session, query, limit=args.limit)
+            session.expunge_all()
+            print(
+                f"{query:<22} {results['like']:>10.4f} {results['fts']:>10.4f}"
+                f" {results['like'] / results['fts']:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
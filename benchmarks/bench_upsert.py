@@ -0,0 +1,62 @@
+"""
+Replay a film feed with upsert_films and with a read-before-write loop.
+
+Usage:
+    python -m benchmarks.bench_upsert --rows 1000000 --naive-rows 20000
+"""
+
+import argparse
+
+from sqlalchemy import select
+
+from benchmarks.common import synthetic_films, temporary_database, timer
+from film_models import Films
+from repository_films import upsert_films
+
+
+def read_before_write(Session, rows: int) -> None:
+    """One lookup per row, insert only when the natural key is missing"""
+    with Session() as session:
+        for row in synthetic_films(rows):
+            exists = session.scalar(
+                select(Films.id).where(
+                    Films.title == row["title"],
+                    Films.director == row["director"],
+                    Films.release_year == row["release_year"],
+                )
+            )
+            if exists is None:
+                session.add(Films(**row))
+        session.commit()
+
+
+def main():
+    """Load the feed once, then time replays of it"""
+    parser = argparse.ArgumentParser(description="Upsert replay benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Feed size")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per upsert batch")
+    parser.add_argument(
+        "--naive-rows", type=int, default=20000, help="Rows replayed by the read-before-write loop"
+    )
+    args = parser.parse_args()
+
+    results = {}
+    with temporary_database("bulk_load") as (_, Session):
+        with Session() as session:
+            with timer(results, "initial load"):
+                loaded = upsert_films(session, synthetic_films(args.rows), args.batch_size)
+            with timer(results, "upsert replay"):
+                replayed = upsert_films(session, synthetic_films(args.rows), args.batch_size)
+        with timer(results, "read-before-write"):
+            read_before_write(Session, args.naive_rows)
+
+    print(f"Initial load: {loaded}; replay: {replayed}")
+    print(f"{'Path':<20} {'Rows':>10} {'Seconds':>9} {'Rows/sec':>12}")
+    print("-" * 54)
+    sizes = {"initial load": args.rows, "upsert replay": args.rows, "read-before-write": args.naive_rows}
+    for name, seconds in results.items():
+        print(f"{name:<20} {sizes[name]:>10} {seconds:>9.3f} {sizes[name] / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Shared helpers for benchmarks: temporary databases and synthetic film catalogs"""
+
+import os
+import resource
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, make_engine
+import film_models  # noqa: F401  (registers Films on Base.metadata)
+
+DIRECTORS = (
+    "Yorgos Lanthimos",
+    "Damien Chazelle",
+    "Denis Villeneuve",
+    "Darya Zhuk",
+    "Agnes Varda",
+    "Akira Kurosawa",
+    "Sofia Coppola",
+    "Bong Joon-ho",
+)
+
+TITLE_WORDS = (
+    "blade", "runner", "poor", "things", "land", "night", "river", "crystal",
+    "summer", "shadow", "city", "garden", "winter", "dream", "stranger", "house",
+    "silent", "golden", "last", "journey", "empire", "ocean", "mirror", "storm",
+)
+
+
+def synthetic_title(number: int) -> str:
+    """Deterministic three-word title so text search has realistic term frequencies"""
+    words = len(TITLE_WORDS)
+    return (
+        f"{TITLE_WORDS[number % words].title()} {TITLE_WORDS[number // words % words]} "
+        f"{TITLE_WORDS[number // words ** 2 % words]} {number}"
+    )
+
+
+def synthetic_films(count: int, start: int = 0) -> Iterator[dict]:
+    """Generate film rows lazily so large catalogs are never held in memory"""
+    for number in range(start, start + count):
+        yield {
+            "title": synthetic_title(number),
+            "director": DIRECTORS[number % len(DIRECTORS)],
+            "release_year": 1920 + number % 105,
+        }
+
+
+@contextmanager
+def temporary_database(profile: str = "plain"):
+    """
+    Create a fresh SQLite file in a temporary directory.
+    :param profile: Engine profile from database.PROFILES.
+    :return: Tuple of (engine, session factory) bound to the temporary file.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "films_bench.sqlite3")
+        engine = make_engine(profile, f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        try:
+            yield engine, sessionmaker(bind=engine)
+        finally:
+            engine.dispose()
+
+
+@contextmanager
+def timer(results: dict, name: str):
+    """Store elapsed seconds of the block in results[name]"""
+    start = time.perf_counter()
+    yield
+    results[name] = time.perf_counter() - start
+
+
+def reset_peak_rss() -> None:
+    """Reset the kernel's peak RSS counter of this process (Linux, ignored elsewhere)"""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size since the last reset, in MiB"""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(operation: Callable[[], int]) -> dict:
+    """
+    Run an operation and record its duration and peak memory.
+    :param operation: Callable returning the number of operations (rows or calls) it did.
+    :return: Dict with seconds, ops, ops_per_sec and peak_rss_mb.
+    """
+    reset_peak_rss()
+    start = time.perf_counter()
+    ops = operation()
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": round(seconds, 4),
+        "ops": ops,
+        "ops_per_sec": round(ops / seconds, 1) if seconds else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
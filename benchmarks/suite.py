@@ -0,0 +1,144 @@
+"""
+Benchmark suite for the films repository at realistic table sizes.
+
+Each tier loads a synthetic catalog into a temporary SQLite file, times the
+repository operations and records the peak RSS of each one. Results are written
+as JSON so runs from different commits can be compared.
+
+Usage:
+    python -m benchmarks.suite --tiers small
+    python -m benchmarks.suite --tiers small medium --output results.json
+    python -m benchmarks.suite --tiers small --compare benchmarks/results/<old>.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Optional
+
+import sqlalchemy
+
+from benchmarks.common import measure, synthetic_films, temporary_database
+from film_models import Films
+from repository_films import (add_film, add_films_bulk, delete_all_films,
+                              get_all_films, iter_films, update_film)
+
+TIERS = {"small": 10_000, "medium": 1_000_000, "large": 10_000_000}
+
+RESULTS_DIRECTORY = os.path.join(os.path.dirname(__file__), "results")
+
+
+def run_tier(rows: int, sample: int, max_get_all: int) -> dict:
+    """Time every repository operation on a catalog of the given size"""
+    results = {}
+    with temporary_database("default") as (_, Session), Session() as session:
+        results["load (add_films_bulk)"] = measure(
+            lambda: len(add_films_bulk(session, synthetic_films(rows), batch_size=10000))
+        )
+
+        def add_sample() -> int:
+            for row in synthetic_films(sample, start=rows):
+                add_film(session, Films(**row))
+            return sample
+
+        results["add_film"] = measure(add_sample)
+        session.expunge_all()
+
+        if rows <= max_get_all:
+            results["get_all_films"] = measure(lambda: len(get_all_films(session)))
+            session.expunge_all()
+        else:
+            results["get_all_films"] = {"skipped": f"more than {max_get_all} rows"}
+
+        results["iter_films"] = measure(lambda: sum(1 for _ in iter_films(session, page_size=5000)))
+
+        def update_sample() -> int:
+            film_ids = range(1, rows + 1, max(rows // sample, 1))[:sample]
+            for film_id in film_ids:
+                update_film(session, film_id, {"title": f"Updated {film_id}"})
+            return len(film_ids)
+
+        results["update_film"] = measure(update_sample)
+        session.expunge_all()
+
+        def delete_all() -> int:
+            delete_all_films(session)
+            return rows + sample
+
+        results["delete_all_films"] = measure(delete_all)
+    return results
+
+
+def current_commit() -> Optional[str]:
+    """Short hash of the checked out commit, None outside a git work tree"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(report: dict, baseline: Optional[dict] = None) -> None:
+    """Print a table per tier, with the speed ratio against a baseline report if given"""
+    for tier, operations in report["tiers"].items():
+        print()
+        print(f"{tier} ({TIERS[tier]:,} rows)".center(78, "*"))
+        print(f"{'Operation':<24} {'Seconds':>10} {'Ops/sec':>14} {'Peak RSS MiB':>13} {'vs base':>10}")
+        print("-" * 78)
+        for name, result in operations.items():
+            if "skipped" in result:
+                print(f"{name:<24} skipped: {result['skipped']}")
+                continue
+            ratio = ""
+            previous = (baseline or {}).get("tiers", {}).get(tier, {}).get(name, {})
+            if previous.get("seconds"):
+                ratio = f"{previous['seconds'] / result['seconds']:.2f}x"
+            print(
+                f"{name:<24} {result['seconds']:>10.3f} {result['ops_per_sec'] or 0:>14,.0f}"
+                f" {result['peak_rss_mb']:>13.1f} {ratio:>10}"
+            )
+
+
+def main():
+    """Run the selected tiers and store the report as JSON"""
+    parser = argparse.ArgumentParser(description="Films repository benchmark suite")
+    parser.add_argument("--tiers", nargs="+", choices=TIERS, default=["small"], help="Catalog sizes")
+    parser.add_argument("--sample", type=int, default=200, help="add_film/update_film calls per tier")
+    parser.add_argument(
+        "--max-get-all", type=int, default=1_000_000,
+        help="Largest table loaded with get_all_films before it is skipped",
+    )
+    parser.add_argument("--output", help="JSON file, benchmarks/results/<commit>.json by default")
+    parser.add_argument("--compare", help="Earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    commit = current_commit()
+    report = {
+        "commit": commit,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "sqlite": __import__("sqlite3").sqlite_version,
+        "tiers": {tier: run_tier(TIERS[tier], args.sample, args.max_get_all) for tier in args.tiers},
+    }
+
+    output = args.output or os.path.join(RESULTS_DIRECTORY, f"{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(report, baseline)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Container for fixtures and hooks"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, clone_database, make_engine
+import film_models  # noqa: F401
+from repository_films import add_films_bulk
+
+# Films in the shared template database
+TEMPLATE_FILMS = 1000
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine bound to a fresh SQLite file with the films schema"""
+    test_engine = create_engine(f"sqlite:///{tmp_path / 'films_test.sqlite3'}")
+    Base.metadata.create_all(bind=test_engine)
+    yield test_engine
+    test_engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    """Session on the test database"""
+    with sessionmaker(bind=engine)() as test_session:
+        yield test_session
+
+
+@pytest.fixture(scope="session")
+def template_database(tmp_path_factory):
+    """Path of an SQLite file with the schema and TEMPLATE_FILMS films, built once per run"""
+    path = tmp_path_factory.mktemp("template") / "films_template.sqlite3"
+    template_engine = make_engine("bulk_load", f"sqlite:///{path}")
+    Base.metadata.create_all(bind=template_engine)
+    with sessionmaker(bind=template_engine)() as template_session:
+        add_films_bulk(
+            template_session,
+            (
+                {"title": f"Film {number}", "director": f"Director {number % 10}", "release_year": 1950 + number % 70}
+                for number in range(TEMPLATE_FILMS)
+            ),
+        )
+    # Fold the WAL back into the main file so the backup sees every page
+    with template_engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        connection.exec_driver_sql("PRAGMA journal_mode=DELETE")
+    template_engine.dispose()
+    return str(path)
+
+
+@pytest.fixture
+def populated_engine(template_database):
+    """Private in-memory copy of the template database"""
+    test_engine = clone_database(template_database)
+    yield test_engine
+    test_engine.dispose()
+
+
+@pytest.fixture
+def populated_session(populated_engine):
+    """Session on a populated copy of the template database"""
+    with sessionmaker(bind=populated_engine)() as test_session:
+        yield test_session
@@ -1,10 +1,268 @@
 """Database configuration: connection setup and metadata creation"""
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Type, Union
 
-engine = create_engine("sqlite:///films_db.sqlite3", echo=False, future=True)
-Session = sessionmaker(bind=engine, future=True)
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, scoped_session, sessionmaker
+from sqlalchemy.pool import NullPool, Pool, QueuePool, StaticPool
+
+DATABASE_URL = os.environ.get("FILMS_DATABASE_URL", "sqlite:///films_db.sqlite3")
+DATABASE_PROFILE = os.environ.get("FILMS_DATABASE_PROFILE", "default")
+MEMORY_URL = "sqlite://"
+
+# Execution option making a connection begin its transactions explicitly
+SNAPSHOT_READS = "snapshot_reads"
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """
+    Named set of SQLite pragmas and pooling options
+
+    Attributes:
+        pragmas (dict): PRAGMA name to value, applied to every new DBAPI connection
+        poolclass (Pool): SQLAlchemy pool class used by the engine
+        pool_options (dict): Extra keyword arguments for the pool (size, overflow)
+    """
+
+    pragmas: Dict[str, Union[str, int]]
+    poolclass: Type[Pool] = QueuePool
+    pool_options: Dict[str, int] = field(default_factory=dict)
+
+
+PROFILES = {
+    # Balanced settings for the service: readers do not block the writer
+    "default": EngineProfile(
+        pragmas={
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -16384,
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,
+        },
+        pool_options={"pool_size": 5, "max_overflow": 10},
+    ),
+    # One writer loading large batches; durability is traded for speed
+    "bulk_load": EngineProfile(
+        pragmas={
+            "journal_mode": "WAL",
+            "synchronous": "OFF",
+            "cache_size": -262144,
+            "mmap_size": 268435456,
+            "temp_store": "MEMORY",
+            "busy_timeout": 30000,
+        },
+        pool_options={"pool_size": 1, "max_overflow": 0},
+    ),
+    # Many concurrent readers served from the page cache and memory map
+    "read_heavy": EngineProfile(
+        pragmas={
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -65536,
+            "mmap_size": 1073741824,
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,
+        },
+        pool_options={"pool_size": 16, "max_overflow": 16},
+    ),
+    # Throwaway databases: no journal on disk and a single shared connection
+    "test": EngineProfile(
+        pragmas={
+            "journal_mode": "MEMORY",
+            "synchronous": "OFF",
+            "temp_store": "MEMORY",
+            "busy_timeout": 1000,
+        },
+        poolclass=StaticPool,
+    ),
+    # No pooling and SQLite defaults, the way the engine was built originally
+    "plain": EngineProfile(pragmas={}, poolclass=NullPool),
+}
+
+
+def _apply_pragmas(engine: Engine, pragmas: Dict[str, Union[str, int]]) -> None:
+    """Register a connect event that sets pragmas on every new connection"""
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def _begin_transaction(connection) -> None:
+    """Begin explicitly on connections with the snapshot_reads option, leave the rest to the driver"""
+    dbapi_connection = connection.connection.dbapi_connection
+    if connection.get_execution_options().get(SNAPSHOT_READS):
+        dbapi_connection.isolation_level = None
+        connection.exec_driver_sql("BEGIN")
+    elif dbapi_connection.isolation_level is None:
+        # A pooled connection last used by a snapshot reader
+        dbapi_connection.isolation_level = ""
+
+
+def _listen_for_begin(engine: Engine) -> None:
+    """Register _begin_transaction once per engine"""
+    if not event.contains(engine, "begin", _begin_transaction):
+        event.listen(engine, "begin", _begin_transaction)
+
+
+def snapshot_engine(engine: Engine) -> Engine:
+    """
+    Engine sharing the pool of engine whose transactions start with BEGIN, so
+    consecutive SELECTs of one session see the same WAL snapshot (the sqlite3
+    driver otherwise runs SELECTs outside any transaction).
+    Use it for reads only: a deferred transaction that reads and then writes
+    fails with "database is locked" without waiting on busy_timeout when
+    another connection commits in between.
+    :param engine: Engine from make_engine.
+    :return: Engine with the snapshot_reads execution option.
+    """
+    _listen_for_begin(engine)
+    return engine.execution_options(**{SNAPSHOT_READS: True})
+
+
+def _get_profile(profile: str) -> EngineProfile:
+    """Look up a profile by name"""
+    try:
+        return PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown engine profile: {profile!r}") from None
+
+
+def _engine_options(settings: EngineProfile, poolclass: Type[Pool], kwargs: dict) -> dict:
+    """Build create_engine arguments from a profile and caller overrides"""
+    options = {"echo": False, "poolclass": poolclass}
+    # Size options only suit a queue pool, not the StaticPool forced for in-memory URLs
+    if settings.poolclass is QueuePool and issubclass(poolclass, QueuePool):
+        options.update(settings.pool_options)
+    if poolclass is StaticPool:
+        options["connect_args"] = {"check_same_thread": False}
+    options.update(kwargs)
+    return options
+
+
+def make_engine(profile: str = "default", url: Optional[str] = None, **kwargs) -> Engine:
+    """
+    Create an SQLite engine tuned by a named profile.
+    :param profile: Key of PROFILES.
+    :param url: Database URL, DATABASE_URL by default.
+    :param kwargs: Extra create_engine arguments, they override profile options.
+    :return: Engine with pragmas applied on connect.
+    """
+    settings = _get_profile(profile)
+    url = url or DATABASE_URL
+    # Every connection to an in-memory database is a new empty database, so share one
+    poolclass = StaticPool if url in (MEMORY_URL, "sqlite:///:memory:") else settings.poolclass
+    new_engine = create_engine(url, **_engine_options(settings, poolclass, kwargs))
+    _apply_pragmas(new_engine, settings.pragmas)
+    return new_engine
+
+
+def make_async_engine(profile: str = "default", url: Optional[str] = None, **kwargs):
+    """
+    Create an aiosqlite engine tuned by a named profile.
+    Requires the optional aiosqlite and greenlet packages.
+    :param profile: Key of PROFILES.
+    :param url: Database URL; a plain sqlite:// URL is switched to the aiosqlite driver.
+    :param kwargs: Extra create_async_engine arguments, they override profile options.
+    :return: AsyncEngine with pragmas applied on connect.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    settings = _get_profile(profile)
+    url = url or DATABASE_URL
+    if url.startswith("sqlite://"):
+        url = "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    poolclass = AsyncAdaptedQueuePool if settings.poolclass is QueuePool else settings.poolclass
+    new_engine = create_async_engine(url, **_engine_options(settings, poolclass, kwargs))
+    _apply_pragmas(new_engine.sync_engine, settings.pragmas)
+    return new_engine
+
+
+_engine: Optional[Engine] = None
+_engine_settings = {"url": DATABASE_URL, "profile": DATABASE_PROFILE}
+_engine_lock = threading.Lock()
+
+
+def configure(url: Optional[str] = None, profile: Optional[str] = None, in_memory: bool = False) -> None:
+    """
+    Set the database the lazily created engine points to.
+    An engine created earlier is disposed; the next session gets a new one.
+    :param url: Database URL, FILMS_DATABASE_URL or films_db.sqlite3 by default.
+    :param profile: Engine profile, FILMS_DATABASE_PROFILE or "default" by default.
+    :param in_memory: Use a private in-memory database (overrides url and profile).
+    """
+    global _engine
+    with _engine_lock:
+        if in_memory:
+            url, profile = MEMORY_URL, "test"
+        if url is not None:
+            _engine_settings["url"] = url
+        if profile is not None:
+            _get_profile(profile)
+            _engine_settings["profile"] = profile
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+
+
+def get_engine() -> Engine:
+    """Return the configured engine, creating it on first use"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = make_engine(_engine_settings["profile"], _engine_settings["url"])
+        return _engine
+
+
+def __getattr__(name: str):
+    """Keep database.engine working while the engine itself is created lazily"""
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazySessionmaker(sessionmaker):
+    """sessionmaker bound to get_engine() when a session is created rather than at import"""
+
+    def __call__(self, **local_kw):
+        local_kw.setdefault("bind", get_engine())
+        return super().__call__(**local_kw)
+
+
+Session = LazySessionmaker(future=True)
+# One session per thread; call ScopedSession.remove() when a thread's unit of work ends
+ScopedSession = scoped_session(Session)
+
+
+def clone_database(source_path: str, url: str = MEMORY_URL, profile: str = "test") -> Engine:
+    """
+    Copy an SQLite file into a new database with the SQLite online backup API.
+    :param source_path: Path of the template database file.
+    :param url: Target database, a private in-memory database by default.
+    :param profile: Engine profile of the returned engine.
+    :return: Engine bound to the copy.
+    """
+    new_engine = make_engine(profile, url)
+    source = sqlite3.connect(source_path)
+    try:
+        target = new_engine.raw_connection()
+        try:
+            source.backup(target.driver_connection)
+        finally:
+            target.close()
+    finally:
+        source.close()
+    return new_engine
 
 
 class Base(DeclarativeBase):
@@ -15,4 +273,4 @@ class Base(DeclarativeBase):
 
 def create_tables():
     """Tables creation"""
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
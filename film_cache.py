@@ -0,0 +1,124 @@
+"""Process-level read-through cache of films keyed by id"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from film_models import Films
+
+
+@dataclass(frozen=True, slots=True)
+class FilmSnapshot:
+    """
+    Immutable copy of a film row, safe to share across sessions and threads
+
+    Attributes:
+        id (int): Film id
+        title (str): Film title
+        director (str): Film director
+        release_year (int): Year of release
+    """
+
+    id: int
+    title: str
+    director: str
+    release_year: int
+
+    @classmethod
+    def from_film(cls, film: Films) -> "FilmSnapshot":
+        """Copy column values out of an ORM instance"""
+        return cls(film.id, film.title, film.director, film.release_year)
+
+
+class FilmCache:
+    """
+    Bounded LRU cache in front of session.get(Films, id)
+
+    Attributes:
+        maxsize (int): Maximum number of cached films
+        ttl (float): Seconds an entry stays valid, None keeps entries until evicted
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups that went to the database
+
+    Methods:
+        get(session, film_id): Return a snapshot, loading it on a miss
+        invalidate(film_id): Drop one film
+        clear(): Drop every film
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation so loads that raced with a write are not stored
+        self._generation = 0
+
+    def get(self, session: Session, film_id: int) -> Optional[FilmSnapshot]:
+        """
+        Return the cached film or read it through the given session.
+        :param session: Session used only on a cache miss.
+        :param film_id: Film id.
+        :return: FilmSnapshot or None if the film does not exist.
+        """
+        with self._lock:
+            entry = self._entries.get(film_id)
+            if entry is not None:
+                snapshot, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(film_id)
+                    self.hits += 1
+                    return snapshot
+                del self._entries[film_id]
+            self.misses += 1
+            generation = self._generation
+
+        # Core read: session.get would return the identity-map instance with unflushed edits
+        row = session.connection().execute(
+            select(Films.id, Films.title, Films.director, Films.release_year).where(Films.id == film_id)
+        ).one_or_none()
+        if row is None:
+            return None
+        snapshot = FilmSnapshot(*row)
+
+        with self._lock:
+            if generation == self._generation:
+                expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+                self._entries[film_id] = (snapshot, expires_at)
+                self._entries.move_to_end(film_id)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, film_id: int) -> None:
+        """Drop one film from the cache"""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(film_id, None)
+
+    def clear(self) -> None:
+        """Drop every film from the cache"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    @property
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+film_cache = FilmCache()
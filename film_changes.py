@@ -0,0 +1,100 @@
+"""Consumer API and retention for the film_changes change-data-capture log"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence
+
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.orm import Session, aliased
+
+from film_models import FILM_CHANGES_DDL, FilmChange
+
+ALL_COLUMNS = "title,director,release_year"
+
+
+def enable_film_changes(session: Session) -> None:
+    """Create the change log and its triggers on a database that lacks them; existing ones are kept"""
+    FilmChange.__table__.create(bind=session.connection(), checkfirst=True)
+    for statement in FILM_CHANGES_DDL:
+        session.execute(text(statement))
+    session.commit()
+
+
+def latest_seq(session: Session) -> int:
+    """Sequence number of the newest change, 0 when the log is empty"""
+    return session.scalar(select(func.max(FilmChange.seq))) or 0
+
+
+def changes_since(session: Session, seq: int = 0, limit: int = 1000) -> Sequence[FilmChange]:
+    """
+    Read the next page of changes for an incremental consumer.
+    Cost depends on the number of changes returned, not on the size of films.
+    :param session: Active session.
+    :param seq: Last sequence number the consumer has processed.
+    :param limit: Maximum number of changes returned.
+    :return: Changes with seq greater than the given one, oldest first; the last seq is the next cursor.
+    """
+    statement = (
+        select(FilmChange)
+        .where(FilmChange.seq > seq)
+        .order_by(FilmChange.seq)
+        .limit(limit)
+    )
+    return session.scalars(statement).all()
+
+
+def prune_changes(
+    session: Session,
+    before_seq: Optional[int] = None,
+    older_than: Optional[timedelta] = None,
+) -> int:
+    """
+    Apply retention to the change log.
+    Consumers that fall further behind than the retention window need a full resync.
+    :param session: Active session.
+    :param before_seq: Delete changes with seq lower than this (e.g. the slowest consumer's cursor).
+    :param older_than: Delete changes older than this age.
+    :return: Number of deleted changes.
+    """
+    conditions = []
+    if before_seq is not None:
+        conditions.append(FilmChange.seq < before_seq)
+    if older_than is not None:
+        cutoff = datetime.now(timezone.utc) - older_than
+        conditions.append(FilmChange.changed_at < cutoff.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z")
+    if not conditions:
+        raise ValueError("Give before_seq, older_than or both")
+    deleted = session.execute(delete(FilmChange).where(*conditions)).rowcount
+    session.commit()
+    return deleted
+
+
+def compact_changes(session: Session, up_to_seq: Optional[int] = None) -> int:
+    """
+    Keep only the newest change per film among changes with seq <= up_to_seq.
+    A surviving entry that replaced older ones lists every column as changed, so
+    consumers treat it as "re-read this film" (or "drop it" for a delete).
+    :param session: Active session.
+    :param up_to_seq: Last sequence number to compact, the whole log when None.
+    :return: Number of deleted changes.
+    """
+    up_to_seq = latest_seq(session) if up_to_seq is None else up_to_seq
+    newer = aliased(FilmChange)
+    superseded = (
+        select(FilmChange.seq)
+        .where(FilmChange.seq <= up_to_seq)
+        .where(
+            select(newer.seq)
+            .where(newer.film_id == FilmChange.film_id, newer.seq > FilmChange.seq, newer.seq <= up_to_seq)
+            .exists()
+        )
+    )
+    survivors = select(FilmChange.film_id).where(FilmChange.seq.in_(superseded)).distinct()
+    session.execute(
+        update(FilmChange)
+        .where(FilmChange.seq <= up_to_seq)
+        .where(FilmChange.film_id.in_(survivors))
+        .values(changed_columns=ALL_COLUMNS)
+    )
+    deleted = session.execute(delete(FilmChange).where(FilmChange.seq.in_(superseded))).rowcount
+    session.commit()
+    return deleted
@@ -1,17 +1,32 @@
 """Database schema for the Films table."""
 
-from typing import Optional
+from typing import List, Optional
 
-from sqlalchemy import Integer, String
+from sqlalchemy import DDL, Boolean, Index, Integer, String, event
 from sqlalchemy.orm import Mapped, mapped_column
 
 from database import Base
 
+# Columns that identify the same film across feeds
+NATURAL_KEY = ("title", "director", "release_year")
+
+# Adds the natural key to a films table created before it existed
+NATURAL_KEY_DDL = (
+    f"CREATE UNIQUE INDEX IF NOT EXISTS uq_films_natural_key ON films ({', '.join(NATURAL_KEY)})"
+)
+
 
 class Films(Base):
     """ORM model representing a film record in the database."""
 
     __tablename__ = "films"
+    __table_args__ = (
+        Index("ix_films_director", "director"),
+        Index("ix_films_release_year", "release_year"),
+        Index("ix_films_director_release_year", "director", "release_year"),
+        # A unique index rather than a constraint, so existing tables can get it later
+        Index("uq_films_natural_key", *NATURAL_KEY, unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -20,3 +35,91 @@ class Films(Base):
 
     def __repr__(self) -> str:
         return f"Film(id={self.id}, title={self.title!r}, director={self.director!r}, year={self.release_year}"
+
+
+class ImportProgress(Base):
+    """Number of source records committed by a chunked import, used to resume it."""
+
+    __tablename__ = "import_progress"
+
+    source: Mapped[str] = mapped_column(String(1024), primary_key=True)
+    rows_committed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+
+class FilmChange(Base):
+    """Append-only change log entry written by triggers on films."""
+
+    __tablename__ = "film_changes"
+    # AUTOINCREMENT keeps seq monotonic even after old entries are pruned
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True)
+    film_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    operation: Mapped[str] = mapped_column(String(6), nullable=False)
+    changed_columns: Mapped[str] = mapped_column(String(200), nullable=False)
+    changed_at: Mapped[str] = mapped_column(String(24), nullable=False)
+
+    @property
+    def columns(self) -> List[str]:
+        """Changed column names as a list"""
+        return self.changed_columns.split(",") if self.changed_columns else []
+
+    def __repr__(self) -> str:
+        return f"FilmChange(seq={self.seq}, film_id={self.film_id}, operation={self.operation!r}, columns={self.changed_columns!r})"
+
+
+_NOW = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+_ALL_COLUMNS = "'title,director,release_year'"
+
+# Change-data-capture triggers filling film_changes
+FILM_CHANGES_DDL = (
+    "CREATE TRIGGER IF NOT EXISTS film_changes_insert AFTER INSERT ON films BEGIN "
+    "INSERT INTO film_changes(film_id, operation, changed_columns, changed_at) "
+    f"VALUES (new.id, 'insert', {_ALL_COLUMNS}, {_NOW}); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS film_changes_update AFTER UPDATE ON films BEGIN "
+    "INSERT INTO film_changes(film_id, operation, changed_columns, changed_at) "
+    "SELECT new.id, 'update', columns, " + _NOW + " FROM (SELECT rtrim("
+    "CASE WHEN old.title IS NOT new.title THEN 'title,' ELSE '' END || "
+    "CASE WHEN old.director IS NOT new.director THEN 'director,' ELSE '' END || "
+    "CASE WHEN old.release_year IS NOT new.release_year THEN 'release_year,' ELSE '' END, "
+    "',') AS columns) WHERE columns != ''; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS film_changes_delete AFTER DELETE ON films BEGIN "
+    "INSERT INTO film_changes(film_id, operation, changed_columns, changed_at) "
+    f"VALUES (old.id, 'delete', {_ALL_COLUMNS}, {_NOW}); "
+    "END",
+)
+
+
+# External-content FTS5 index over title and director, kept in sync by triggers
+FILMS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS films_fts USING fts5("
+    "title, director, content='films', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS films_fts_insert AFTER INSERT ON films BEGIN "
+    "INSERT INTO films_fts(rowid, title, director) VALUES (new.id, new.title, new.director); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS films_fts_delete AFTER DELETE ON films BEGIN "
+    "INSERT INTO films_fts(films_fts, rowid, title, director) "
+    "VALUES ('delete', old.id, old.title, old.director); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS films_fts_update AFTER UPDATE OF id, title, director ON films BEGIN "
+    "INSERT INTO films_fts(films_fts, rowid, title, director) "
+    "VALUES ('delete', old.id, old.title, old.director); "
+    "INSERT INTO films_fts(rowid, title, director) VALUES (new.id, new.title, new.director); "
+    "END",
+)
+
+for _statement in FILMS_FTS_DDL:
+    event.listen(Films.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in FILM_CHANGES_DDL:
+    # DDL() applies %-formatting, strftime patterns need escaping
+    _ddl = DDL(_statement.replace("%", "%%"))
+    event.listen(Films.__table__, "after_create", _ddl.execute_if(dialect="sqlite"))
+event.listen(
+    Films.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS films_fts").execute_if(dialect="sqlite"),
+)
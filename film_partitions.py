@@ -0,0 +1,200 @@
+"""Optional storage mode that keeps films in one SQLite file per release decade"""
+
+import glob
+import heapq
+import os
+import re
+import threading
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from database import Base, make_engine
+from film_models import Films
+from repository_films import (FILM_COLUMNS, FilmRow, batched, count_by_year,
+                              delete_all_films, film_to_row,
+                              find_by_year_range, iter_films, update_film)
+
+# Ids of a partition start at decade * ID_SPAN, so an id alone tells where the film lives
+ID_SPAN = 10**12
+
+_PARTITION_FILE = re.compile(r"films_(\d{4})s\.sqlite3$")
+
+
+def decade_of(release_year: int) -> int:
+    """First year of the decade, e.g. 2017 -> 2010"""
+    return release_year - release_year % 10
+
+
+class PartitionedFilmStore:
+    """
+    Routes films to per-decade SQLite files and merges results across them
+
+    Attributes:
+        directory (str): Folder holding films_<decade>s.sqlite3 files
+        profile (str): Engine profile used for every partition
+
+    Methods:
+        add_films(films): Insert films into their decade partitions, returns ids
+        get_all_films(): All films, partition by partition
+        iter_films(page_size): Stream all films with keyset pagination per partition
+        find_by_year_range(start_year, end_year): Query only overlapping partitions
+        count_by_year(): Films per year across partitions
+        update_film(film_id, new_data): Update a film, moving it if its decade changes
+        delete_all_films(): Empty every partition
+        close(): Dispose partition engines
+    """
+
+    def __init__(self, directory: str, profile: str = "default") -> None:
+        self.directory = directory
+        self.profile = profile
+        self._engines: Dict[int, Engine] = {}
+        self._sessions: Dict[int, sessionmaker] = {}
+        self._next_ids: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, "films_*s.sqlite3")):
+            match = _PARTITION_FILE.search(os.path.basename(path))
+            if match:
+                self._open(int(match.group(1)))
+
+    @property
+    def decades(self) -> List[int]:
+        """Decades that have a partition, oldest first"""
+        return sorted(self._engines)
+
+    def _open(self, decade: int) -> sessionmaker:
+        """Return the session factory of a partition, creating the file when needed"""
+        with self._lock:
+            if decade not in self._sessions:
+                path = os.path.join(self.directory, f"films_{decade}s.sqlite3")
+                engine = make_engine(self.profile, f"sqlite:///{path}")
+                Base.metadata.create_all(bind=engine)
+                self._engines[decade] = engine
+                self._sessions[decade] = sessionmaker(bind=engine)
+            return self._sessions[decade]
+
+    def _allocate_ids(self, session: Session, decade: int, count: int) -> range:
+        """Reserve a block of ids inside the decade's id range"""
+        with self._lock:
+            if decade not in self._next_ids:
+                current = session.scalar(select(func.max(Films.id)))
+                self._next_ids[decade] = max(current or 0, decade * ID_SPAN) + 1
+            start = self._next_ids[decade]
+            self._next_ids[decade] += count
+        return range(start, start + count)
+
+    def _insert(self, decade: int, rows: List[dict]) -> List[int]:
+        """Insert rows with pre-assigned ids into one partition in a single commit"""
+        with self._open(decade)() as session:
+            ids = self._allocate_ids(session, decade, len(rows))
+            session.execute(insert(Films), [dict(row, id=film_id) for row, film_id in zip(rows, ids)])
+            session.commit()
+        return list(ids)
+
+    def add_films(self, films: Iterable[FilmRow], batch_size: int = 1000) -> List[int]:
+        """
+        Insert films into their decade partitions.
+        :param films: Iterable of Films instances or dicts with film columns.
+        :param batch_size: Rows read from the input before they are routed and committed.
+        :return: Ids of inserted films in input order.
+        """
+        inserted_ids: List[int] = []
+        for batch in batched(map(film_to_row, films), batch_size):
+            groups: Dict[int, List[int]] = {}
+            for position, row in enumerate(batch):
+                groups.setdefault(decade_of(row["release_year"]), []).append(position)
+            batch_ids = [0] * len(batch)
+            for decade, positions in groups.items():
+                ids = self._insert(decade, [batch[position] for position in positions])
+                for position, film_id in zip(positions, ids):
+                    batch_ids[position] = film_id
+            inserted_ids.extend(batch_ids)
+        return inserted_ids
+
+    def _partitions_for(self, start_year: int, end_year: int) -> List[int]:
+        """Decades overlapping [start_year, end_year]"""
+        return [
+            decade for decade in self.decades
+            if decade <= end_year and decade + 9 >= start_year
+        ]
+
+    def get_all_films(self) -> List[Films]:
+        """All films as detached objects, partition by partition"""
+        films: List[Films] = []
+        for decade in self.decades:
+            with self._sessions[decade]() as session:
+                films.extend(iter_films(session, page_size=5000))
+        return films
+
+    def iter_films(self, page_size: int = 1000) -> Iterator[Films]:
+        """Stream films ordered by id; partitions are ordered the same way as their id ranges"""
+
+        def partition(decade):
+            with self._sessions[decade]() as session:
+                yield from iter_films(session, page_size)
+
+        return chain.from_iterable(partition(decade) for decade in self.decades)
+
+    def find_by_year_range(self, start_year: int, end_year: int) -> List[Films]:
+        """Query only the partitions overlapping the range and merge them by year"""
+        results = []
+        for decade in self._partitions_for(start_year, end_year):
+            with self._sessions[decade]() as session:
+                films = find_by_year_range(session, start_year, end_year)
+                session.expunge_all()
+            results.append(films)
+        return list(heapq.merge(*results, key=lambda film: (film.release_year, film.id)))
+
+    def count_by_year(self) -> Dict[int, int]:
+        """Films per release year across all partitions"""
+        counts: Dict[int, int] = {}
+        for decade in self.decades:
+            with self._sessions[decade]() as session:
+                counts.update(count_by_year(session))
+        return dict(sorted(counts.items()))
+
+    def update_film(self, film_id: int, new_data: dict) -> Optional[int]:
+        """
+        Update a film in its partition.
+        A new release year in another decade moves the film, which gives it a new id.
+        :return: Id of the film after the update, None if it does not exist.
+        """
+        decade = film_id // ID_SPAN
+        if decade not in self._sessions:
+            return None
+        with self._sessions[decade]() as session:
+            film = session.get(Films, film_id)
+            if film is None:
+                return None
+            target = decade_of(new_data.get("release_year", film.release_year))
+            if target == decade:
+                update_film(session, film_id, new_data)
+                return film_id
+            row = {column: new_data.get(column, getattr(film, column)) for column in FILM_COLUMNS}
+            # Partitions are separate files: commit the copy first so a crash between the
+            # two commits leaves a duplicate rather than a lost film
+            new_id = self._insert(target, [row])[0]
+            session.delete(film)
+            session.commit()
+            return new_id
+
+    def delete_all_films(self) -> None:
+        """Delete films from every partition"""
+        for decade in self.decades:
+            with self._sessions[decade]() as session:
+                delete_all_films(session)
+
+    def close(self) -> None:
+        """Dispose every partition engine"""
+        for engine in self._engines.values():
+            engine.dispose()
+
+    def __enter__(self) -> "PartitionedFilmStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,95 @@
+"""Optional film_stats summary table with films per release year, maintained by triggers"""
+
+from typing import Dict, Tuple
+
+from sqlalchemy import column, inspect, select, table, text
+from sqlalchemy.orm import Session
+
+from repository_films import count_by_year
+
+FILM_STATS_DDL = (
+    "CREATE TABLE IF NOT EXISTS film_stats ("
+    "release_year INTEGER PRIMARY KEY, film_count INTEGER NOT NULL)",
+    "CREATE TRIGGER IF NOT EXISTS film_stats_insert AFTER INSERT ON films BEGIN "
+    "INSERT INTO film_stats(release_year, film_count) VALUES (new.release_year, 1) "
+    "ON CONFLICT(release_year) DO UPDATE SET film_count = film_count + 1; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS film_stats_delete AFTER DELETE ON films BEGIN "
+    "UPDATE film_stats SET film_count = film_count - 1 WHERE release_year = old.release_year; "
+    "DELETE FROM film_stats WHERE release_year = old.release_year AND film_count <= 0; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS film_stats_update AFTER UPDATE OF release_year ON films "
+    "WHEN old.release_year IS NOT new.release_year BEGIN "
+    "UPDATE film_stats SET film_count = film_count - 1 WHERE release_year = old.release_year; "
+    "DELETE FROM film_stats WHERE release_year = old.release_year AND film_count <= 0; "
+    "INSERT INTO film_stats(release_year, film_count) VALUES (new.release_year, 1) "
+    "ON CONFLICT(release_year) DO UPDATE SET film_count = film_count + 1; "
+    "END",
+)
+
+FILM_STATS_DROP = (
+    "DROP TRIGGER IF EXISTS film_stats_insert",
+    "DROP TRIGGER IF EXISTS film_stats_delete",
+    "DROP TRIGGER IF EXISTS film_stats_update",
+    "DROP TABLE IF EXISTS film_stats",
+)
+
+film_stats = table("film_stats", column("release_year"), column("film_count"))
+
+
+def enable_film_stats(session: Session) -> None:
+    """Create the summary table and its triggers, then fill it from films"""
+    for statement in FILM_STATS_DDL:
+        session.execute(text(statement))
+    rebuild_film_stats(session)
+
+
+def film_stats_enabled(session: Session) -> bool:
+    """Whether enable_film_stats has created the summary table"""
+    return inspect(session.connection()).has_table("film_stats")
+
+
+def disable_film_stats(session: Session) -> None:
+    """Drop the summary table and its triggers"""
+    for statement in FILM_STATS_DROP:
+        session.execute(text(statement))
+    session.commit()
+
+
+def rebuild_film_stats(session: Session) -> None:
+    """Recompute every summary row from the films table"""
+    session.execute(text("DELETE FROM film_stats"))
+    session.execute(
+        text(
+            "INSERT INTO film_stats(release_year, film_count) "
+            "SELECT release_year, count(*) FROM films GROUP BY release_year"
+        )
+    )
+    session.commit()
+
+
+def films_per_year(session: Session) -> Dict[int, int]:
+    """Read films per release year from the summary table"""
+    statement = select(film_stats.c.release_year, film_stats.c.film_count).order_by(
+        film_stats.c.release_year
+    )
+    return dict(session.execute(statement).all())
+
+
+def check_film_stats(session: Session, repair: bool = True) -> Dict[int, Tuple[int, int]]:
+    """
+    Compare the summary table with a live GROUP BY over films.
+    :param session: Active session.
+    :param repair: Rebuild the summary when differences are found.
+    :return: Mapping of year to (summary count, live count) for every mismatch.
+    """
+    summary = films_per_year(session)
+    live = count_by_year(session)
+    differences = {
+        year: (summary.get(year, 0), live.get(year, 0))
+        for year in summary.keys() | live.keys()
+        if summary.get(year, 0) != live.get(year, 0)
+    }
+    if differences and repair:
+        rebuild_film_stats(session)
+    return dict(sorted(differences.items()))
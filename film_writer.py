@@ -0,0 +1,189 @@
+"""Background group-commit writer for high-rate film inserts"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+from sqlalchemy.orm import sessionmaker
+
+import database
+from repository_films import FilmRow, add_films_bulk
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """
+    Collects films from any thread or coroutine and inserts them in group commits
+
+    A single background thread owns the only writing session, so producers never
+    compete for SQLite's write lock. A batch is flushed when it reaches max_batch
+    rows or when max_delay_ms has passed since its first row arrived.
+
+    Attributes:
+        max_batch (int): Rows per group commit
+        max_delay_ms (float): Longest time a row waits for its batch to fill
+
+    Methods:
+        submit(film): Queue a film, returns a Future resolved with its id
+        submit_async(film): Awaitable version of submit
+        close(): Flush queued films and stop the background thread
+        metrics: Queue depth and flush statistics
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[sessionmaker] = None,
+        max_batch: int = 500,
+        max_delay_ms: float = 20.0,
+        max_queue: int = 10000,
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be a positive integer")
+        self.max_batch = max_batch
+        self.max_delay_ms = max_delay_ms
+        self._session_factory = session_factory or database.Session
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._flushes = 0
+        self._rows = 0
+        self._failed = 0
+        self._flush_ms_total = 0.0
+        self._flush_ms_max = 0.0
+        self._closed = False
+        # Held across the closed check and the put, so nothing is queued after _STOP
+        self._submit_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="films-group-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, film: FilmRow, timeout: Optional[float] = None) -> Future:
+        """
+        Queue a film for the next group commit.
+        Blocks while the queue is full, which pushes back on producers.
+        :param film: Films instance or dict with film columns.
+        :param timeout: Seconds to wait for room in the queue, None waits forever.
+        :return: Future resolved with the film id, or with the insert error.
+        """
+        future: Future = Future()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # The lock is held while put blocks, so waiting for it counts against the same timeout
+        if not self._submit_lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise queue.Full
+        try:
+            if self._closed:
+                raise RuntimeError("GroupCommitWriter is closed")
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            self._queue.put((film, future), timeout=remaining)
+        finally:
+            self._submit_lock.release()
+        return future
+
+    async def submit_async(self, film: FilmRow) -> int:
+        """Queue a film from a coroutine and wait for its id"""
+        loop = asyncio.get_running_loop()
+        future = await loop.run_in_executor(None, self.submit, film)
+        return await asyncio.wrap_future(future)
+
+    def _next_batch(self) -> Tuple[List[tuple], bool]:
+        """Block for the first item, then gather more until the batch is full or the delay expires"""
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first] if first[1].set_running_or_notify_cancel() else []
+        deadline = time.monotonic() + self.max_delay_ms / 1000
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            # Running futures can no longer be cancelled; cancelled ones are skipped
+            if item[1].set_running_or_notify_cancel():
+                batch.append(item)
+        return batch, False
+
+    def _flush(self, session, batch: List[tuple]) -> None:
+        """Insert a batch in one commit; on failure retry row by row so only bad rows fail"""
+        started = time.perf_counter()
+        failed = 0
+        outcomes: List[tuple] = []
+        try:
+            ids = add_films_bulk(session, [film for film, _ in batch], batch_size=len(batch))
+            outcomes = [(film_id, None) for film_id in ids]
+        except Exception:
+            session.rollback()
+            for film, _ in batch:
+                try:
+                    outcomes.append((add_films_bulk(session, [film])[0], None))
+                except Exception as error:
+                    session.rollback()
+                    outcomes.append((None, error))
+                    failed += 1
+        finally:
+            session.expunge_all()
+        # Futures are resolved only after the commit, outside the retry
+        for (_, future), (film_id, error) in zip(batch, outcomes):
+            if error is None:
+                future.set_result(film_id)
+            else:
+                future.set_exception(error)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._flushes += 1
+            self._rows += len(batch) - failed
+            self._failed += failed
+            self._flush_ms_total += elapsed_ms
+            self._flush_ms_max = max(self._flush_ms_max, elapsed_ms)
+
+    def _run(self) -> None:
+        with self._session_factory() as session:
+            stopping = False
+            while not stopping:
+                batch, stopping = self._next_batch()
+                if batch:
+                    self._flush(session, batch)
+        self._fail_pending()
+
+    def _fail_pending(self) -> None:
+        """Fail futures of anything still queued after _STOP instead of leaving them unresolved"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(RuntimeError("GroupCommitWriter is closed"))
+
+    def close(self) -> None:
+        """Flush everything queued so far and stop the background thread"""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    @property
+    def metrics(self) -> dict:
+        """Queue depth, flush count, rows written and flush latency"""
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "flushes": self._flushes,
+                "rows": self._rows,
+                "failed": self._failed,
+                "mean_batch": round(self._rows / self._flushes, 1) if self._flushes else 0.0,
+                "flush_ms_mean": round(self._flush_ms_total / self._flushes, 3) if self._flushes else 0.0,
+                "flush_ms_max": round(self._flush_ms_max, 3),
+            }
+
+    def __enter__(self) -> "GroupCommitWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
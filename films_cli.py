@@ -0,0 +1,167 @@
+"""
+Command-line maintenance tool for the films database.
+
+Usage:
+    python films_cli.py rebuild-search
+    python films_cli.py ensure-natural-key
+    python films_cli.py ensure-indexes
+    python films_cli.py import films.csv [--chunk-size 10000] [--resume]
+    python films_cli.py export films.ndjson
+    python films_cli.py stats-enable
+    python films_cli.py changes-enable
+    python films_cli.py stats-check [--no-repair]
+"""
+
+import argparse
+import sys
+
+from database import Session, create_tables
+from film_changes import enable_film_changes
+from film_stats import check_film_stats, enable_film_stats, film_stats_enabled
+from films_io import FORMATS, Progress, detect_format, export_films, import_films
+from repository_films import (ensure_indexes, ensure_natural_key,
+                              rebuild_search_index)
+
+
+def rebuild_search(args: argparse.Namespace) -> None:
+    """Rebuild the full-text search index from the films table"""
+    with Session() as session:
+        rebuild_search_index(session)
+    print("Search index rebuilt")
+
+
+def natural_key(args: argparse.Namespace) -> None:
+    """Remove duplicate films and add the unique natural key index"""
+    with Session() as session:
+        deleted = ensure_natural_key(session)
+    print(f"Natural key in place, {deleted} duplicate films deleted")
+
+
+def indexes_command(args: argparse.Namespace) -> None:
+    """Create the lookup indexes missing from the films table"""
+    with Session() as session:
+        created = ensure_indexes(session)
+    print(f"Created {', '.join(created)}" if created else "All indexes in place")
+
+
+def import_command(args: argparse.Namespace) -> None:
+    """Stream a CSV/NDJSON file into the films table"""
+    progress = Progress("import")
+    # New files lack every table, older databases lack import_progress
+    create_tables()
+    with Session() as session:
+        # Upserts need the unique index, which older databases lack
+        ensure_natural_key(session)
+        import_films(
+            session,
+            args.path,
+            file_format=args.format,
+            chunk_size=args.chunk_size,
+            resume=args.resume,
+            progress=progress,
+        )
+    progress.report()
+
+
+def export_command(args: argparse.Namespace) -> None:
+    """Stream the films table into a CSV/NDJSON file or stdout"""
+    progress = Progress("export")
+    if args.path == "-":
+        file_format = args.format or "ndjson"
+        with Session() as session:
+            export_films(session, sys.stdout, file_format, args.chunk_size, progress)
+    else:
+        file_format = args.format or detect_format(args.path)
+        with Session() as session, open(args.path, "w", encoding="utf-8", newline="") as stream:
+            export_films(session, stream, file_format, args.chunk_size, progress)
+    progress.report()
+
+
+def stats_enable(args: argparse.Namespace) -> None:
+    """Create and fill the film_stats summary table"""
+    with Session() as session:
+        enable_film_stats(session)
+    print("film_stats enabled")
+
+
+def changes_enable(args: argparse.Namespace) -> None:
+    """Create the film_changes log and its triggers"""
+    with Session() as session:
+        enable_film_changes(session)
+    print("film_changes enabled")
+
+
+def stats_check(args: argparse.Namespace) -> None:
+    """Diff film_stats against live data and rebuild it unless told not to"""
+    with Session() as session:
+        if not film_stats_enabled(session):
+            sys.exit("film_stats does not exist, run stats-enable first")
+        differences = check_film_stats(session, repair=not args.no_repair)
+    if not differences:
+        print("film_stats is consistent")
+        return
+    print(f"{'Year':<6} {'Summary':>8} {'Live':>8}")
+    for year, (summary_count, live_count) in differences.items():
+        print(f"{year:<6} {summary_count:>8} {live_count:>8}")
+    print("film_stats left unchanged" if args.no_repair else "film_stats rebuilt")
+
+
+def main(argv=None):
+    """Parse arguments and run the requested command"""
+    parser = argparse.ArgumentParser(description="Films database maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild_parser = commands.add_parser(
+        "rebuild-search", help="Create or repopulate the full-text search index"
+    )
+    rebuild_parser.set_defaults(handler=rebuild_search)
+
+    natural_key_parser = commands.add_parser(
+        "ensure-natural-key", help="Delete duplicate films and add the unique natural key"
+    )
+    natural_key_parser.set_defaults(handler=natural_key)
+
+    indexes_parser = commands.add_parser(
+        "ensure-indexes", help="Create the lookup indexes missing from the films table"
+    )
+    indexes_parser.set_defaults(handler=indexes_command)
+
+    import_parser = commands.add_parser("import", help="Load films from a CSV or NDJSON file")
+    import_parser.add_argument("path", help="Source file")
+    import_parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension")
+    import_parser.add_argument("--chunk-size", type=int, default=10000, help="Rows per transaction")
+    import_parser.add_argument(
+        "--resume", action="store_true", help="Continue after the last committed chunk"
+    )
+    import_parser.set_defaults(handler=import_command)
+
+    export_parser = commands.add_parser("export", help="Dump films to a CSV or NDJSON file")
+    export_parser.add_argument("path", help="Destination file, - for stdout")
+    export_parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension")
+    export_parser.add_argument("--chunk-size", type=int, default=10000, help="Rows per fetch")
+    export_parser.set_defaults(handler=export_command)
+
+    stats_enable_parser = commands.add_parser(
+        "stats-enable", help="Create the film_stats summary table and its triggers"
+    )
+    stats_enable_parser.set_defaults(handler=stats_enable)
+
+    stats_check_parser = commands.add_parser(
+        "stats-check", help="Diff film_stats against live data and rebuild it"
+    )
+    stats_check_parser.add_argument(
+        "--no-repair", action="store_true", help="Only report differences"
+    )
+    stats_check_parser.set_defaults(handler=stats_check)
+
+    changes_enable_parser = commands.add_parser(
+        "changes-enable", help="Create the film_changes log and its triggers"
+    )
+    changes_enable_parser.set_defaults(handler=changes_enable)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
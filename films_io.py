@@ -0,0 +1,175 @@
+"""Streaming CSV/NDJSON import and export of the films table"""
+
+import csv
+import json
+import os
+import sys
+import time
+from typing import IO, Iterable, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from film_models import Films, ImportProgress
+from repository_films import FILM_COLUMNS, batched, upsert_statement
+
+FORMATS = ("csv", "ndjson")
+
+
+def detect_format(path: str) -> str:
+    """Guess the file format from its extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".ndjson", ".jsonl"):
+        return "ndjson"
+    raise ValueError(f"Cannot detect format of {path}, use csv or ndjson")
+
+
+def _clean_row(record: dict, number: int) -> dict:
+    """Keep film columns only and coerce release_year to int"""
+    try:
+        row = {column: record[column] for column in FILM_COLUMNS}
+        row["release_year"] = int(row["release_year"])
+    except (KeyError, TypeError, ValueError) as error:
+        raise ValueError(f"Invalid film record #{number}: {record!r}") from error
+    return row
+
+
+def read_films(stream: IO[str], file_format: str) -> Iterator[dict]:
+    """
+    Lazily parse film records from an open text stream.
+    :param stream: File opened in text mode.
+    :param file_format: csv (with a header row) or ndjson (one JSON object per line).
+    :return: Generator of film column dicts.
+    """
+    if file_format == "csv":
+        records = csv.DictReader(stream)
+    elif file_format == "ndjson":
+        records = (json.loads(line) for line in stream if line.strip())
+    else:
+        raise ValueError(f"Unknown format: {file_format}")
+    for number, record in enumerate(records, start=1):
+        yield _clean_row(record, number)
+
+
+class Progress:
+    """Prints processed rows and rows/sec at most once per interval"""
+
+    def __init__(self, label: str, interval: float = 1.0, output: IO[str] = sys.stderr) -> None:
+        self.label = label
+        self.interval = interval
+        self.output = output
+        self.rows = 0
+        self.started = time.perf_counter()
+        self._last_report = self.started
+
+    def advance(self, rows: int) -> None:
+        """Count processed rows and report when the interval has passed"""
+        self.rows += rows
+        now = time.perf_counter()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self.report()
+
+    def report(self) -> None:
+        """Print the current totals"""
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        print(f"{self.label}: {self.rows} rows, {self.rows / elapsed:,.0f} rows/sec", file=self.output)
+
+
+def import_films(
+    session: Session,
+    path: str,
+    file_format: Optional[str] = None,
+    chunk_size: int = 10000,
+    resume: bool = False,
+    progress: Optional[Progress] = None,
+) -> int:
+    """
+    Stream a CSV/NDJSON file into the films table, one transaction per chunk.
+    Each chunk and the import_progress checkpoint are committed together, so an
+    interrupted import resumes exactly after the last committed chunk. Rows are
+    upserted on the natural key, so importing the same file twice adds nothing.
+    :param session: Active session.
+    :param path: Source file.
+    :param file_format: csv or ndjson, detected from the extension when None.
+    :param chunk_size: Records per transaction.
+    :param resume: Skip records already committed by a previous run of the same file.
+    :param progress: Optional progress reporter.
+    :return: Number of source records processed by this run.
+    """
+    file_format = file_format or detect_format(path)
+    source = os.path.abspath(path)
+    checkpoint = session.get(ImportProgress, source)
+    if checkpoint is None or not resume:
+        checkpoint = session.merge(ImportProgress(source=source, rows_committed=0, completed=False))
+        session.commit()
+    if checkpoint.completed:
+        return 0
+
+    statement = upsert_statement()
+    processed = 0
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as stream:
+            rows = read_films(stream, file_format)
+            for _ in range(checkpoint.rows_committed):
+                next(rows, None)
+            for chunk in batched(rows, chunk_size):
+                session.execute(statement, chunk)
+                checkpoint.rows_committed += len(chunk)
+                session.commit()
+                processed += len(chunk)
+                if progress:
+                    progress.advance(len(chunk))
+    except Exception:
+        session.rollback()
+        raise
+    checkpoint.completed = True
+    session.commit()
+    return processed
+
+
+def export_films(
+    session: Session,
+    stream: IO[str],
+    file_format: str,
+    chunk_size: int = 10000,
+    progress: Optional[Progress] = None,
+) -> int:
+    """
+    Write the films table to a stream without loading it into memory.
+    Rows are fetched in chunks through a streaming result (yield_per).
+    :param session: Active session.
+    :param stream: Text stream to write to.
+    :param file_format: csv or ndjson.
+    :param chunk_size: Rows fetched per round trip.
+    :param progress: Optional progress reporter.
+    :return: Number of exported rows.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown format: {file_format}")
+    columns = ("id",) + FILM_COLUMNS
+    table = Films.__table__
+    result = session.connection().execute(
+        select(*(table.c[column] for column in columns))
+        .order_by(table.c.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    if file_format == "csv":
+        writer = csv.writer(stream)
+        writer.writerow(columns)
+        write_rows = writer.writerows
+    else:
+        def write_rows(rows: Iterable[tuple]) -> None:
+            stream.writelines(
+                json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows
+            )
+
+    exported = 0
+    for partition in result.partitions():
+        write_rows(partition)
+        exported += len(partition)
+        if progress:
+            progress.advance(len(partition))
+    return exported
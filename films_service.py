@@ -0,0 +1,83 @@
+"""Thread-safe films service: parallel readers and a single writer over scoped sessions"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+import database
+
+DEFAULT_READERS = 4
+
+
+class FilmsService:
+    """
+    Runs repository calls on thread-local sessions
+
+    Reads go to a pool of threads sized to the engine's connection pool, writes
+    go to one dedicated thread, so on a WAL-mode SQLite file readers never wait
+    for each other and writers never fight for the write lock. Reader sessions
+    begin explicitly and see one snapshot per call; writer sessions keep the
+    driver's transactions, so they wait on busy_timeout for the write lock.
+
+    Attributes:
+        engine (Engine): Engine all sessions are bound to
+        readers (int): Number of reader threads
+
+    Methods:
+        read(call, *args): Run call(session, *args) on a reader thread
+        write(call, *args): Run call(session, *args) on the writer thread
+        read_many(call, arguments): Run one read per argument tuple and collect the results
+        close(): Stop the thread pools
+    """
+
+    def __init__(self, engine: Optional[Engine] = None, readers: Optional[int] = None) -> None:
+        self.engine = engine or database.get_engine()
+        if readers is None:
+            pool_size = getattr(self.engine.pool, "size", None)
+            readers = pool_size() if callable(pool_size) else DEFAULT_READERS
+        self.readers = readers
+        self._read_sessions = scoped_session(sessionmaker(bind=database.snapshot_engine(self.engine)))
+        self._write_sessions = scoped_session(sessionmaker(bind=self.engine))
+        self._reader_pool = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="films-reader")
+        self._writer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="films-writer")
+
+    @staticmethod
+    def _run(sessions: scoped_session, call: Callable, args: tuple):
+        """Call with this thread's session, then detach results and end the transaction"""
+        session = sessions()
+        try:
+            return call(session, *args)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            # Loaded objects stay usable detached; ending the read transaction
+            # releases the connection and the WAL snapshot it pins
+            session.expunge_all()
+            session.rollback()
+
+    def read(self, call: Callable, *args) -> Future:
+        """Run call(session, *args) on a reader thread"""
+        return self._reader_pool.submit(self._run, self._read_sessions, call, args)
+
+    def write(self, call: Callable, *args) -> Future:
+        """Run call(session, *args) on the single writer thread"""
+        return self._writer_pool.submit(self._run, self._write_sessions, call, args)
+
+    def read_many(self, call: Callable, arguments: Iterable[tuple]) -> List:
+        """Run call(session, *args) for every argument tuple in parallel, keeping input order"""
+        futures = [self.read(call, *args) for args in arguments]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        """Wait for submitted calls and stop the thread pools"""
+        self._writer_pool.shutdown(wait=True)
+        self._reader_pool.shutdown(wait=True)
+
+    def __enter__(self) -> "FilmsService":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
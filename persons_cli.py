@@ -0,0 +1,171 @@
+"""
+Command-line tool for persons files.
+
+Usage:
+    python persons_cli.py filter "exports/*.json" [--jobs 8] [--max-age 17] [--output minors.ndjson]
+    python persons_cli.py filter exports/ --order completion --reference-date 2025-01-01
+    python persons_cli.py filter exports/ --where 'age >= 65 and country == "PL"' --output seniors_pl.ndjson \
+        --where "age < 18" --output minors.ndjson
+    python persons_cli.py index persons.json
+    python persons_cli.py bracket persons.json --min-age 18 --max-age 30 [--count]
+"""
+
+import argparse
+import json
+import sys
+import time
+from contextlib import ExitStack
+from datetime import date
+from typing import Optional
+
+from persons_index import BirthDateIndex, update_index
+from persons_parallel import (DEFAULT_SHARD_SIZE, expand_inputs, group_by_file,
+                              plan_shards, process_files)
+from persons_query import QueryError, compile_query
+from Task_Standard_Library import ADULT_AGE
+
+
+def age_query(min_age: Optional[int], max_age: Optional[int]) -> str:
+    """--where expression equivalent to --min-age/--max-age, minors when neither is given"""
+    if min_age is None and max_age is None:
+        max_age = ADULT_AGE - 1
+    bounds = []
+    if min_age is not None:
+        bounds.append(f"age >= {min_age}")
+    if max_age is not None:
+        bounds.append(f"age <= {max_age}")
+    return " and ".join(bounds)
+
+
+def filter_command(args: argparse.Namespace) -> int:
+    """Answer one or more queries over many files in parallel, one NDJSON stream per query"""
+    queries = args.where or [age_query(args.min_age, args.max_age)]
+    destinations = args.output or ["-"]
+    if len(destinations) != len(queries):
+        print("Give one --output per --where", file=sys.stderr)
+        return 2
+    # Resolved once so every worker counts ages on the same day
+    reference = args.reference_date or date.today()
+    try:
+        for query in queries:
+            compile_query(query, reference)
+    except QueryError as error:
+        print(error, file=sys.stderr)
+        return 2
+    shards = plan_shards(expand_inputs(args.inputs), args.shard_size)
+    if not shards:
+        print("No input files found", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    persons = 0
+    matches = [0] * len(queries)
+    failed = []
+    with ExitStack() as stack:
+        sinks = [
+            sys.stdout if path == "-" else stack.enter_context(open(path, "w", encoding="utf-8"))
+            for path in destinations
+        ]
+        results = process_files(shards, queries, reference, args.jobs, ordered=args.order == "input")
+        for file_results in group_by_file(results, shards):
+            persons += sum(result.persons for result in file_results)
+            errors = [result for result in file_results if result.error]
+            if errors:
+                # A file is written completely or not at all, whichever shard failed
+                failed.append(errors[0].shard.path)
+                for result in errors:
+                    print(f"{result.shard.path}: {result.error}", file=sys.stderr)
+                continue
+            for result in file_results:
+                for index, lines in enumerate(result.outputs):
+                    matches[index] += len(lines)
+                    sinks[index].writelines(line + "\n" for line in lines)
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    files = len({shard.path for shard in shards})
+    print(
+        f"{files} files, {len(shards)} shards, {persons} persons, "
+        f"{len(failed)} failed files, {persons / elapsed:,.0f} persons/sec",
+        file=sys.stderr,
+    )
+    for query, destination, count in zip(queries, destinations, matches):
+        print(f"{count} matches for {query!r} -> {destination}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def index_command(args: argparse.Namespace) -> int:
+    """Build or refresh birth-date indexes"""
+    for path in args.paths:
+        status, added = update_index(path)
+        action = "up to date" if status == "fresh" else f"{added} records indexed"
+        print(f"{path}: index {status}, {action}")
+    return 0
+
+
+def bracket_command(args: argparse.Namespace) -> int:
+    """Answer an age bracket from the birth-date index, refreshing it first when needed"""
+    update_index(args.path)
+    reference = args.reference_date or date.today()
+    with BirthDateIndex(args.path) as index:
+        if args.count:
+            print(index.count(args.min_age, args.max_age, reference))
+            return 0
+        with ExitStack() as stack:
+            output = stack.enter_context(open(args.output, "w", encoding="utf-8")) if args.output else sys.stdout
+            for person in index.query(args.min_age, args.max_age, reference):
+                output.write(json.dumps(person, ensure_ascii=False) + "\n")
+    return 0
+
+
+def main(argv=None):
+    """Parse arguments and run the requested command"""
+    parser = argparse.ArgumentParser(description="Persons files processing")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    filter_parser = commands.add_parser("filter", help="Select persons from many files in parallel")
+    filter_parser.add_argument("inputs", nargs="+", help="Files, glob patterns or directories")
+    filter_parser.add_argument(
+        "--where",
+        action="append",
+        help="Query over person fields and age, e.g. 'age >= 65 and country == \"PL\"'; repeat to answer several in one pass",
+    )
+    filter_parser.add_argument("--min-age", type=int, help="Lowest matching age when no --where is given")
+    filter_parser.add_argument("--max-age", type=int, help="Highest matching age, 17 when no bound is given")
+    filter_parser.add_argument(
+        "--reference-date", type=date.fromisoformat, help="Day ages are counted on, today by default"
+    )
+    filter_parser.add_argument("--jobs", type=int, help="Worker processes, the number of CPUs by default")
+    filter_parser.add_argument(
+        "--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="Bytes per NDJSON shard"
+    )
+    filter_parser.add_argument(
+        "--order",
+        choices=("input", "completion"),
+        default="input",
+        help="input: deterministic file/byte order; completion: write files as their shards finish",
+    )
+    filter_parser.add_argument(
+        "--output", action="append", help="Destination NDJSON file per --where in the same order, - for stdout"
+    )
+    filter_parser.set_defaults(handler=filter_command)
+
+    index_parser = commands.add_parser("index", help="Build or refresh the sorted birth-date index of files")
+    index_parser.add_argument("paths", nargs="+", help="Persons files")
+    index_parser.set_defaults(handler=index_command)
+
+    bracket_parser = commands.add_parser("bracket", help="Select an age bracket through the birth-date index")
+    bracket_parser.add_argument("path", help="Persons file")
+    bracket_parser.add_argument("--min-age", type=int, help="Lowest matching age")
+    bracket_parser.add_argument("--max-age", type=int, help="Highest matching age")
+    bracket_parser.add_argument(
+        "--reference-date", type=date.fromisoformat, help="Day ages are counted on, today by default"
+    )
+    bracket_parser.add_argument("--count", action="store_true", help="Only print the number of persons")
+    bracket_parser.add_argument("--output", help="Destination NDJSON file, stdout by default")
+    bracket_parser.set_defaults(handler=bracket_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
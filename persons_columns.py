@@ -0,0 +1,110 @@
+"""Vectorized age computation over a NumPy column of birth dates"""
+
+from datetime import date, datetime
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+DATE_LENGTH = len("YYYY-MM-DD")
+_DIGIT_POSITIONS = [0, 1, 2, 3, 5, 6, 8, 9]
+_DASH = ord("-")
+
+
+class BirthDates(NamedTuple):
+    """Parsed birth_date column"""
+
+    dates: np.ndarray  # datetime64[D], NaT where the value is invalid
+    invalid: np.ndarray  # bool, True where age_calculation would return None
+
+
+def _strptime_fallback(value) -> Optional[np.datetime64]:
+    """Parse a value the fast path did not recognise exactly like age_calculation does"""
+    try:
+        return np.datetime64(datetime.strptime(value, "%Y-%m-%d").date(), "D")
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_birth_dates(values: Iterable) -> BirthDates:
+    """
+    Load birth dates into a datetime64[D] column.
+    Zero-padded YYYY-MM-DD strings are decoded with array arithmetic; anything
+    else (unpadded or space-padded fields, non-ASCII digits, non-strings) goes
+    through datetime.strptime, so validity matches age_calculation.
+    :param values: Iterable of birth_date values.
+    :return: BirthDates with the date column and the invalid mask.
+    """
+    values = list(values)
+    candidates = [
+        value if isinstance(value, str) and len(value) == DATE_LENGTH and value.isascii() else ""
+        for value in values
+    ]
+    raw = np.array(candidates, dtype=f"S{DATE_LENGTH}").view(np.uint8).reshape(-1, DATE_LENGTH)
+    digits = raw[:, _DIGIT_POSITIONS].astype(np.int64) - ord("0")
+    shaped = ((digits >= 0) & (digits <= 9)).all(axis=1) & (raw[:, 4] == _DASH) & (raw[:, 7] == _DASH)
+
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 4] * 10 + digits[:, 5]
+    day = digits[:, 6] * 10 + digits[:, 7]
+    in_range = shaped & (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1)
+    month_start = np.where(in_range, (year - 1970) * 12 + month - 1, 0).astype("datetime64[M]")
+    month_days = ((month_start + 1).astype("datetime64[D]") - month_start.astype("datetime64[D]")).astype(np.int64)
+    fast_valid = in_range & (day <= month_days)
+
+    dates = np.where(
+        fast_valid,
+        month_start.astype("datetime64[D]") + np.where(fast_valid, day - 1, 0),
+        np.datetime64("NaT", "D"),
+    )
+    # Only rows that do not look like YYYY-MM-DD need a second opinion; calendar errors stay invalid
+    for index in np.flatnonzero(~shaped):
+        parsed = _strptime_fallback(values[index])
+        if parsed is not None:
+            dates[index] = parsed
+    return BirthDates(dates, np.isnat(dates))
+
+
+def compute_ages(birth_dates: BirthDates, today: Optional[date] = None) -> np.ndarray:
+    """
+    Ages in full years on a given day, the same rule as age_calculation.
+    :param birth_dates: Result of parse_birth_dates.
+    :param today: Reference day, date.today() by default.
+    :return: int64 array of ages, -1 where the birth date is invalid.
+    """
+    today = today or date.today()
+    dates = np.where(birth_dates.invalid, np.datetime64("1970-01-01", "D"), birth_dates.dates)
+    months = dates.astype("datetime64[M]")
+    years = months.astype("datetime64[Y]").astype(np.int64) + 1970
+    month_numbers = months.astype(np.int64) % 12 + 1
+    days = (dates - months.astype("datetime64[D]")).astype(np.int64) + 1
+    # Birthday not reached yet this year, a Feb 29 birthday counts as reached on Mar 1
+    not_yet = month_numbers * 100 + days > today.month * 100 + today.day
+    ages = today.year - years - not_yet
+    return np.where(birth_dates.invalid, -1, ages)
+
+
+def minor_mask(birth_dates: BirthDates, today: Optional[date] = None, adult_age: int = 18) -> np.ndarray:
+    """Boolean mask of valid birth dates belonging to persons younger than adult_age"""
+    return ~birth_dates.invalid & (compute_ages(birth_dates, today) < adult_age)
+
+
+def filter_minors_batched(
+    persons: Iterable[dict], today: Optional[date] = None, batch_size: int = 100000
+) -> Iterator[dict]:
+    """
+    Keep persons younger than 18, deciding a whole batch with one vectorized pass.
+    Persons with invalid birth dates are skipped silently.
+    :param persons: Iterable (or generator) of person dicts with birth_date.
+    :param today: Reference day, date.today() by default.
+    :param batch_size: Number of persons held and evaluated together.
+    :return: Generator of matching persons in input order.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    today = today or date.today()
+    iterator = iter(persons)
+    while batch := list(islice(iterator, batch_size)):
+        mask = minor_mask(parse_birth_dates(person.get("birth_date", "") for person in batch), today)
+        for index in np.flatnonzero(mask):
+            yield batch[index]
@@ -0,0 +1,263 @@
+"""
+Sorted on-disk index of birth dates for instant age-bracket queries.
+
+The index lives next to the data file (persons.json -> persons.json.bdidx)::
+
+    header    HEADER struct, see below
+    offsets   uint64[count]  byte offset of every record in the data file
+    keys      uint32[count]  birth date as YYYYMMDD, ascending
+    lengths   uint32[count]  byte length of every record
+
+Arrays are little-endian and 8-byte aligned, so they are used straight from
+mmap. An age bracket becomes two binary searches over keys; the matching
+records are then read in file order.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_right
+from datetime import date, datetime
+from typing import Iterator, Optional, Tuple
+
+from persons_io import iter_record_spans, sniff_format
+from Task_Standard_Library import AgeFilter, is_iso_date
+
+INDEX_SUFFIX = ".bdidx"
+
+MAGIC = b"PBDX"
+VERSION = 1
+_FORMATS = ("ndjson", "array")
+
+# magic, version, format, source size, source mtime_ns, indexed until, count, skipped, tail crc
+HEADER = struct.Struct("<4sBBxxQqQQQI4x")
+
+# Bytes before the indexed end whose checksum tells an append from a rewrite
+TAIL_CHECK = 4096
+
+
+def index_path_for(data_path: str) -> str:
+    """Index file of a data file"""
+    return data_path + INDEX_SUFFIX
+
+
+def birth_date_key(dob) -> Optional[int]:
+    """Birth date as YYYYMMDD integer, None when age_calculation would reject it"""
+    if is_iso_date(dob):
+        return int(dob[:4] + dob[5:7] + dob[8:])
+    if not isinstance(dob, str):
+        return None
+    try:
+        parsed = datetime.strptime(dob, "%Y-%m-%d")
+    except ValueError:
+        return None
+    return parsed.year * 10000 + parsed.month * 100 + parsed.day
+
+
+def _cutoff_key(cutoff: str) -> int:
+    """Cutoff string from AgeFilter.cutoffs as a key, the sentinels included"""
+    return int(cutoff.replace("-", "")) if cutoff else -1
+
+
+def _tail_crc(path: str, end: int) -> int:
+    """Checksum of the TAIL_CHECK bytes before end"""
+    with open(path, "rb") as f:
+        start = max(0, end - TAIL_CHECK)
+        f.seek(start)
+        return zlib.crc32(f.read(end - start))
+
+
+def _little_endian(values: array) -> bytes:
+    """Array bytes in the on-disk byte order"""
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def index_status(data_path: str, index_path: Optional[str] = None) -> str:
+    """
+    Compare an index with its data file.
+    :return: missing, fresh, appended (only new bytes at the end) or stale.
+    """
+    index_path = index_path or index_path_for(data_path)
+    try:
+        with open(index_path, "rb") as f:
+            header = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return "missing"
+    magic, version, _, size, mtime_ns, indexed_until, _, _, tail_crc = header
+    if magic != MAGIC or version != VERSION:
+        return "stale"
+    stat = os.stat(data_path)
+    if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+        return "fresh"
+    if stat.st_size > size and _tail_crc(data_path, indexed_until) == tail_crc:
+        return "appended"
+    return "stale"
+
+
+def _write_index(
+    index_path: str, data_path: str, stat: os.stat_result, file_format: str, indexed_until: int,
+    skipped: int, keys: array, offsets: array, lengths: array,
+) -> None:
+    """
+    Sort entries by key (file order within a key) and atomically replace the index file.
+    stat is taken before the scan, so records appended during it make the index stale, not fresh.
+    """
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    header = HEADER.pack(
+        MAGIC, VERSION, _FORMATS.index(file_format), stat.st_size, stat.st_mtime_ns,
+        indexed_until, len(keys), skipped, _tail_crc(data_path, indexed_until),
+    )
+    temporary = index_path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(header)
+        f.write(_little_endian(array("Q", (offsets[i] for i in order))))
+        f.write(_little_endian(array("I", (keys[i] for i in order))))
+        f.write(_little_endian(array("I", (lengths[i] for i in order))))
+    os.replace(temporary, index_path)
+
+
+def _scan(data_path: str, file_format: str, start: int, keys: array, offsets: array, lengths: array) -> Tuple[int, int]:
+    """Append entries of records from byte start on; return (indexed until, skipped records)"""
+    indexed_until, skipped = start, 0
+    for offset, length, record in iter_record_spans(data_path, start, file_format):
+        indexed_until = offset + length
+        key = birth_date_key(record.get("birth_date")) if isinstance(record, dict) else None
+        if key is None:
+            skipped += 1
+            continue
+        keys.append(key)
+        offsets.append(offset)
+        lengths.append(length)
+    return indexed_until, skipped
+
+
+def build_index(data_path: str, index_path: Optional[str] = None) -> int:
+    """
+    Index every record of a persons file from scratch.
+    :param data_path: JSON array or NDJSON persons file.
+    :param index_path: Destination, data_path + INDEX_SUFFIX by default.
+    :return: Number of indexed records; records without a valid birth date are skipped.
+    """
+    index_path = index_path or index_path_for(data_path)
+    file_format = sniff_format(data_path)
+    stat = os.stat(data_path)
+    keys, offsets, lengths = array("I"), array("Q"), array("I")
+    indexed_until, skipped = _scan(data_path, file_format, 0, keys, offsets, lengths)
+    _write_index(index_path, data_path, stat, file_format, indexed_until, skipped, keys, offsets, lengths)
+    return len(keys)
+
+
+def update_index(data_path: str, index_path: Optional[str] = None) -> Tuple[str, int]:
+    """
+    Bring an index up to date: nothing for a fresh one, only the new records
+    after an append, a full rebuild when the file was rewritten.
+    :return: Tuple of (status found, records added to the index).
+    """
+    index_path = index_path or index_path_for(data_path)
+    status = index_status(data_path, index_path)
+    if status == "fresh":
+        return status, 0
+    if status != "appended":
+        return status, build_index(data_path, index_path)
+    with BirthDateIndex(data_path, index_path, check=False) as index:
+        file_format = index.file_format
+        keys, offsets, lengths = array("I", index.keys), array("Q", index.offsets), array("I", index.lengths)
+        indexed_until, skipped = index.indexed_until, index.skipped
+    before = len(keys)
+    stat = os.stat(data_path)
+    indexed_until, new_skipped = _scan(data_path, file_format, indexed_until, keys, offsets, lengths)
+    _write_index(
+        index_path, data_path, stat, file_format, indexed_until, skipped + new_skipped, keys, offsets, lengths
+    )
+    return status, len(keys) - before
+
+
+class BirthDateIndex:
+    """
+    Read-only view of an index file over mmap.
+
+    Attributes:
+        data_path (str): Indexed persons file
+        file_format (str): ndjson or array
+        indexed_until (int): Byte after the last indexed record
+        skipped (int): Records left out for a missing or invalid birth date
+        keys (memoryview): Sorted YYYYMMDD birth dates
+        offsets (memoryview): Record byte offsets, parallel to keys
+        lengths (memoryview): Record byte lengths, parallel to keys
+    """
+
+    def __init__(self, data_path: str, index_path: Optional[str] = None, check: bool = True) -> None:
+        """
+        :param check: Raise ValueError unless the index is fresh for the data file.
+        """
+        index_path = index_path or index_path_for(data_path)
+        if check and (status := index_status(data_path, index_path)) != "fresh":
+            raise ValueError(f"Index of {data_path} is {status}, run update_index first")
+        self.data_path = data_path
+        with open(index_path, "rb") as f:
+            self._index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, file_format, _, _, self.indexed_until, count, self.skipped, _ = HEADER.unpack_from(self._index_map)
+        self.file_format = _FORMATS[file_format]
+        self._views = []
+        position = HEADER.size
+        for name, typecode, width in (("offsets", "Q", 8), ("keys", "I", 4), ("lengths", "I", 4)):
+            data = memoryview(self._index_map)[position:position + count * width]
+            if sys.byteorder != "little":
+                values = array(typecode, data)
+                values.byteswap()
+                data = memoryview(values)
+            else:
+                data = data.cast(typecode)
+            self._views.append(data)
+            setattr(self, name, data)
+            position += count * width
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def bounds(self, min_age: Optional[int] = None, max_age: Optional[int] = None, reference: Optional[date] = None) -> Tuple[int, int]:
+        """Index positions [start, stop) of persons in the age bracket, two binary searches"""
+        born_after, born_on_or_before = AgeFilter(min_age, max_age).cutoffs(reference or date.today())
+        return bisect_right(self.keys, _cutoff_key(born_after)), bisect_right(self.keys, _cutoff_key(born_on_or_before))
+
+    def count(self, min_age: Optional[int] = None, max_age: Optional[int] = None, reference: Optional[date] = None) -> int:
+        """Number of persons in the age bracket without reading the data file"""
+        start, stop = self.bounds(min_age, max_age, reference)
+        return stop - start
+
+    def query(self, min_age: Optional[int] = None, max_age: Optional[int] = None, reference: Optional[date] = None) -> Iterator[dict]:
+        """
+        Persons in an inclusive age bracket, in file order.
+        :param min_age: Lowest age, unbounded when None.
+        :param max_age: Highest age, unbounded when None.
+        :param reference: Day ages are counted on, today by default.
+        :return: Generator of person dicts.
+        """
+        start, stop = self.bounds(min_age, max_age, reference)
+        if start >= stop:
+            return
+        # Sorting the matching offsets turns random reads into one forward sweep
+        spans = sorted(zip(self.offsets[start:stop], self.lengths[start:stop]))
+        with open(self.data_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for offset, length in spans:
+                yield json.loads(data[offset:offset + length])
+
+    def close(self) -> None:
+        """Release the memory map"""
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._index_map.close()
+
+    def __enter__(self) -> "BirthDateIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
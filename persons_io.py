@@ -0,0 +1,196 @@
+"""Streaming reader for persons files: a top-level JSON array or NDJSON"""
+
+import io
+import json
+from itertools import chain
+from json import JSONDecodeError
+from typing import IO, Iterator, Optional, Tuple
+
+FORMATS = ("auto", "array", "ndjson")
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\r\n"
+_decoder = json.JSONDecoder()
+
+# Longest token the decoder reports before its end when cut off (-Infinity)
+_TOKEN_TAIL = 9
+
+
+def _truncated(buffer: str, error: JSONDecodeError) -> bool:
+    """Whether a decode error may come from a value cut off at the buffer end rather than bad syntax"""
+    return error.msg.startswith("Unterminated string") or len(buffer) - error.pos <= _TOKEN_TAIL
+
+
+def _iter_array(
+    stream: IO[str], buffer: str, base: int = 0, after_value: bool = False, spans: bool = False
+) -> Iterator:
+    """
+    Decode the items of a JSON array one by one.
+    Only the current item and one chunk of look-ahead are held in memory.
+    :param stream: Text stream positioned after the first chunk.
+    :param buffer: Text already read, starting right after the opening bracket
+        (or right after an item when resuming).
+    :param base: Stream position of buffer[0], errors report positions from it.
+    :param after_value: Resume after an item, expecting a comma or the closing bracket.
+    :param spans: Yield (start, end, item, item text) with stream positions instead of bare items.
+    :return: Generator of decoded items.
+    """
+    pos = 0
+    eof = False
+    empty = not after_value
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        if pos < len(buffer):
+            char = buffer[pos]
+            if char == "]" and (after_value or empty):
+                return
+            if after_value:
+                if char != ",":
+                    raise JSONDecodeError(f"Expecting ',' delimiter at char {base + pos}", buffer, pos)
+                pos += 1
+                after_value = False
+                continue
+            try:
+                item, end = _decoder.raw_decode(buffer, pos)
+            except JSONDecodeError as error:
+                # More input only helps a truncated value; a syntax error would grow the buffer to EOF
+                if eof or not _truncated(buffer, error):
+                    raise JSONDecodeError(f"{error.msg} at char {base + error.pos}", buffer, error.pos) from None
+                end = None
+            # A value ending exactly at the buffer end may be a truncated number
+            if end is not None and (end < len(buffer) or eof):
+                yield (base + pos, base + end, item, buffer[pos:end]) if spans else item
+                pos = end
+                after_value = True
+                empty = False
+                continue
+        elif eof:
+            raise JSONDecodeError(f"Unterminated array at char {base + pos}", buffer, pos)
+        # Grow reads with the pending text so a huge item is not re-decoded once per chunk
+        base += pos
+        buffer = buffer[pos:]
+        chunk = stream.read(max(CHUNK_SIZE, len(buffer)))
+        eof = not chunk
+        buffer += chunk
+        pos = 0
+
+
+def _iter_ndjson(lines: Iterator[str]) -> Iterator:
+    """Decode one JSON value per non-blank line"""
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _skip_whitespace(stream: IO[str]) -> Tuple[str, int]:
+    """Read up to the first non-blank character: text from it and its stream position; empty text at EOF"""
+    position = 0
+    while chunk := stream.read(CHUNK_SIZE):
+        start = len(chunk) - len(chunk.lstrip(_WHITESPACE))
+        if start < len(chunk):
+            return chunk[start:], position + start
+        position += len(chunk)
+    return "", position
+
+
+def read_persons(stream: IO[str], file_format: str = "auto") -> Iterator[dict]:
+    """
+    Lazily parse person records, so memory stays bounded whatever the file size.
+    :param stream: File opened in text mode.
+    :param file_format: array (top-level JSON array), ndjson (one object per line)
+        or auto to decide by the first non-blank character.
+    :return: Generator of person dicts.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown format: {file_format}")
+    buffer, _ = _skip_whitespace(stream)
+    if not buffer:
+        return
+    if file_format == "auto":
+        file_format = "array" if buffer[0] == "[" else "ndjson"
+    if file_format == "array":
+        if buffer[0] != "[":
+            raise JSONDecodeError("Expecting '['", buffer, 0)
+        yield from _iter_array(stream, buffer[1:])
+    else:
+        # Complete the last line of the first chunk before reading line by line
+        buffer += stream.readline()
+        yield from _iter_ndjson(chain(io.StringIO(buffer), stream))
+
+
+def sniff_format(path: str) -> str:
+    """Tell a JSON array file from NDJSON by its first non-blank byte"""
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            stripped = chunk.lstrip(_WHITESPACE.encode())
+            if stripped:
+                return "array" if stripped.startswith(b"[") else "ndjson"
+    return "ndjson"
+
+
+def read_ndjson_range(path: str, start: int = 0, end: Optional[int] = None) -> Iterator[dict]:
+    """
+    Lazily parse the NDJSON lines that begin inside a byte range of a file.
+    Adjacent ranges together read every line exactly once, which lets
+    workers split one large file between them.
+    :param path: NDJSON file.
+    :param start: First byte of the range.
+    :param end: Byte after the range, end of file when None.
+    :return: Generator of person dicts.
+    """
+    with open(path, "rb") as f:
+        position = start
+        if start:
+            # The line running through start belongs to the previous range
+            f.seek(start - 1)
+            position += len(f.readline()) - 1
+        while end is None or position < end:
+            line = f.readline()
+            if not line:
+                return
+            position += len(line)
+            if line.strip():
+                try:
+                    person = json.loads(line)
+                except JSONDecodeError as error:
+                    # Positions of the error are relative to the line, give the one in the file too
+                    offset = position - len(line) + len(error.doc[:error.pos].encode("utf-8"))
+                    raise JSONDecodeError(f"{error.msg} at byte {offset}", error.doc, error.pos) from None
+                yield person
+
+
+def iter_record_spans(path: str, start: int = 0, file_format: Optional[str] = None) -> Iterator[Tuple[int, int, object]]:
+    """
+    Lazily parse records together with their exact byte ranges in the file.
+    Array files are scanned as Latin-1, where every byte is one character, so
+    decoder positions are byte offsets; records with non-ASCII bytes are then
+    decoded again from their exact UTF-8 bytes.
+    :param path: Persons file.
+    :param start: Byte to resume from: 0, or the end of the last record already read.
+    :param file_format: array or ndjson, sniffed from the file when None.
+    :return: Generator of (byte offset, byte length, record).
+    """
+    file_format = file_format or sniff_format(path)
+    with open(path, "rb") as f:
+        f.seek(start)
+        if file_format == "ndjson":
+            position = start
+            for line in f:
+                if line.strip():
+                    yield position, len(line), json.loads(line)
+                position += len(line)
+            return
+        stream = io.TextIOWrapper(f, encoding="latin-1", newline="")
+        if start:
+            records = _iter_array(stream, "", start, after_value=True, spans=True)
+        else:
+            buffer, position = _skip_whitespace(stream)
+            if not buffer:
+                return
+            if buffer[0] != "[":
+                raise JSONDecodeError("Expecting '['", buffer, 0)
+            records = _iter_array(stream, buffer[1:], position + 1, spans=True)
+        for offset, end, item, text in records:
+            yield offset, end - offset, item if text.isascii() else json.loads(text.encode("latin-1"))
@@ -0,0 +1,193 @@
+"""Filter many persons files in parallel and merge the matches into one stream"""
+
+import glob
+import json
+import os
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from persons_io import read_ndjson_range, read_persons, sniff_format
+from persons_query import compile_query, route
+
+# Extensions picked up when a directory is given as input
+PERSON_FILE_EXTENSIONS = (".json", ".ndjson", ".jsonl")
+
+DEFAULT_SHARD_SIZE = 64 * 2 ** 20
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    Unit of work for one worker process
+
+    Attributes:
+        path (str): Persons file
+        start (int): First byte of an NDJSON range
+        end (int): Byte after the range; None for the rest of the file (any format)
+    """
+
+    path: str
+    start: int = 0
+    end: Optional[int] = None
+
+
+@dataclass
+class ShardResult:
+    """
+    Matches of one shard, already serialized as NDJSON lines
+
+    Attributes:
+        shard (Shard): Processed shard
+        outputs (list): One list per query of matching persons as JSON strings, in file order
+        persons (int): Number of persons read
+        error (str): Why the shard failed; its matches are dropped then
+    """
+
+    shard: Shard
+    outputs: List[List[str]] = field(default_factory=list)
+    persons: int = 0
+    error: Optional[str] = None
+
+
+def expand_inputs(patterns: Iterable[str]) -> List[str]:
+    """
+    Resolve glob patterns and directories into a sorted list of files.
+    :param patterns: Paths, glob patterns (** is recursive) or directories.
+    :return: Unique file paths in sorted order; unmatched plain paths are kept so they are reported.
+    """
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.update(
+                os.path.join(pattern, name)
+                for name in os.listdir(pattern)
+                if name.endswith(PERSON_FILE_EXTENSIONS) and os.path.isfile(os.path.join(pattern, name))
+            )
+        elif glob.has_magic(pattern):
+            paths.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+        else:
+            paths.add(pattern)
+    return sorted(paths)
+
+
+def plan_shards(paths: Iterable[str], shard_size: int = DEFAULT_SHARD_SIZE) -> List[Shard]:
+    """
+    Split files into shards: NDJSON files larger than shard_size into byte ranges,
+    everything else (JSON arrays, small or unreadable files) into one shard per file.
+    :param paths: Persons files.
+    :param shard_size: Maximum bytes of an NDJSON range.
+    :return: Shards in file order, then byte order.
+    """
+    if shard_size < 1:
+        raise ValueError("shard_size must be a positive integer")
+    shards = []
+    for path in paths:
+        try:
+            size = os.path.getsize(path)
+            splittable = size > shard_size and sniff_format(path) == "ndjson"
+        except OSError:
+            splittable = False
+        if splittable:
+            shards.extend(Shard(path, start, min(start + shard_size, size)) for start in range(0, size, shard_size))
+        else:
+            shards.append(Shard(path))
+    return shards
+
+
+def _read_shard(shard: Shard) -> Iterator[dict]:
+    """Persons of one shard"""
+    if shard.end is not None:
+        return read_ndjson_range(shard.path, shard.start, shard.end)
+
+    def read_file():
+        with open(shard.path, "r", encoding="utf-8") as f:
+            yield from read_persons(f)
+
+    return read_file()
+
+
+def process_shard(shard: Shard, queries: Sequence[str], reference: date) -> ShardResult:
+    """
+    Answer several queries over one shard in a single pass, inside a worker.
+    Queries travel as text and are compiled in the worker, closures cannot be pickled.
+    :param shard: Shard to read.
+    :param queries: --where expressions.
+    :param reference: Day ages are counted on, shared by all workers.
+    :return: ShardResult with serialized matches per query or the error.
+    """
+    result = ShardResult(shard)
+    predicates = [compile_query(query, reference) for query in queries]
+
+    def counted(persons):
+        for person in persons:
+            result.persons += 1
+            yield person
+
+    outputs: List[List[str]] = [[] for _ in predicates]
+    last_person, line = None, ""
+    try:
+        for index, person in route(counted(_read_shard(shard)), predicates):
+            # A person matching several queries is serialized once
+            if person is not last_person:
+                last_person, line = person, json.dumps(person, ensure_ascii=False)
+            outputs[index].append(line)
+    except (AttributeError, OSError, ValueError) as error:
+        result.error = f"{type(error).__name__}: {error}"
+    else:
+        result.outputs = outputs
+    return result
+
+
+def process_files(
+    shards: List[Shard],
+    queries: Sequence[str],
+    reference: Optional[date] = None,
+    jobs: Optional[int] = None,
+    ordered: bool = True,
+) -> Iterator[ShardResult]:
+    """
+    Answer queries over shards across a process pool.
+    :param shards: Shards from plan_shards.
+    :param queries: --where expressions, all answered in one pass over each shard.
+    :param reference: Day ages are counted on, today by default.
+    :param jobs: Worker processes, os.cpu_count() by default; 1 runs in this process.
+    :param ordered: Yield results in shard order (deterministic output) rather than as they finish.
+    :return: Generator of ShardResult.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError("jobs must be a positive integer")
+    reference = reference or date.today()
+    queries = list(queries)
+    for query in queries:
+        # Fail before any worker starts
+        compile_query(query, reference)
+    if jobs == 1:
+        for shard in shards:
+            yield process_shard(shard, queries, reference)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(process_shard, shard, queries, reference) for shard in shards]
+        for future in futures if ordered else as_completed(futures):
+            yield future.result()
+
+
+def group_by_file(results: Iterable[ShardResult], shards: Sequence[Shard]) -> Iterator[List[ShardResult]]:
+    """
+    Hold shard results until every shard of their file has finished, so a file
+    with one failed shard can be dropped as a whole.
+    :param results: ShardResults from process_files, in any order.
+    :param shards: Shards the results belong to.
+    :return: Generator of the results of one file in byte order, files in the order they complete.
+    """
+    remaining = Counter(shard.path for shard in shards)
+    pending: Dict[str, List[ShardResult]] = defaultdict(list)
+    for result in results:
+        path = result.shard.path
+        pending[path].append(result)
+        remaining[path] -= 1
+        if not remaining[path]:
+            yield sorted(pending.pop(path), key=lambda file_result: file_result.shard.start)
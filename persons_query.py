@@ -0,0 +1,248 @@
+"""
+Small expression language for selecting persons, compiled into Python closures.
+
+Expressions use Python syntax restricted to field names, constants and
+comparisons, for example::
+
+    age >= 65 and country == "PL"
+    18 <= age < 30 or address.city in ("Minsk", "Warsaw")
+    not name
+
+Names are person fields (dotted names reach into nested objects) and ``age``,
+derived from birth_date as age_calculation counts it. A comparison involving
+a missing field, an invalid birth date or incompatible types is false, ``!=``
+included; compare with None (``name == None``, ``name != None``) to test
+whether a field is missing.
+"""
+
+import ast
+import operator
+from datetime import date
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from Task_Standard_Library import AgeFilter, age_calculation, is_iso_date
+
+Predicate = Callable[[dict], bool]
+Getter = Callable[[dict], object]
+
+AGE = "age"
+
+_COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda value, container: value in container,
+    ast.NotIn: lambda value, container: value not in container,
+}
+
+# age <op> N turned into an AgeFilter range, ages being whole numbers
+_AGE_RANGES = {
+    ast.Eq: lambda n: (n, n),
+    ast.Lt: lambda n: (None, n - 1),
+    ast.LtE: lambda n: (None, n),
+    ast.Gt: lambda n: (n + 1, None),
+    ast.GtE: lambda n: (n, None),
+}
+
+# Operator with sides swapped: N < age is age > N
+_MIRRORED = {ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt, ast.GtE: ast.LtE, ast.Eq: ast.Eq, ast.NotEq: ast.NotEq}
+
+
+class QueryError(ValueError):
+    """Expression cannot be parsed or uses unsupported syntax"""
+
+
+def _age_getter(reference: date) -> Getter:
+    """Derived age field, None for missing or invalid birth dates"""
+    year, month_day = reference.year, (reference.month, reference.day)
+
+    def get_age(person: dict):
+        dob = person.get("birth_date")
+        if is_iso_date(dob):
+            return year - int(dob[:4]) - (month_day < (int(dob[5:7]), int(dob[8:10])))
+        return age_calculation(dob, reference, quiet=True) if isinstance(dob, str) else None
+
+    return get_age
+
+
+def _field_path(node: ast.AST) -> Optional[Tuple[str, ...]]:
+    """Names of a plain or dotted field reference"""
+    if isinstance(node, ast.Name):
+        return (node.id,)
+    if isinstance(node, ast.Attribute):
+        parent = _field_path(node.value)
+        return parent + (node.attr,) if parent else None
+    return None
+
+
+def _field_getter(path: Tuple[str, ...]) -> Getter:
+    """Read a possibly nested field, None when any level is missing"""
+    if len(path) == 1:
+        name = path[0]
+        return lambda person: person.get(name)
+
+    def get_nested(person: dict):
+        value = person
+        for name in path:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(name)
+        return value
+
+    return get_nested
+
+
+def _constant(node: ast.AST):
+    """Literal value of a constant, a negated number or a list/tuple/set of them"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, (str, int, float, bool, type(None))):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        value = _constant(node.operand)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return -value
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        values = tuple(_constant(element) for element in node.elts)
+        try:
+            return frozenset(values)
+        except TypeError:
+            return values
+    raise QueryError(f"Unsupported syntax: {ast.unparse(node)}")
+
+
+class _Compiler:
+    """Turns a parsed expression into nested closures"""
+
+    def __init__(self, reference: date) -> None:
+        self.reference = reference
+        self.get_age = _age_getter(reference)
+
+    def value(self, node: ast.AST) -> Getter:
+        """Getter for an operand"""
+        path = _field_path(node)
+        if path == (AGE,):
+            return self.get_age
+        if path:
+            return _field_getter(path)
+        constant = _constant(node)
+        return lambda person: constant
+
+    def age_bounds(self, left: ast.AST, op: ast.cmpop, right: ast.AST) -> Optional[Tuple[Optional[int], Optional[int]]]:
+        """(min_age, max_age) of age compared with a whole number, None when not applicable"""
+        if _field_path(right) == (AGE,) and type(op) in _MIRRORED:
+            left, op, right = right, _MIRRORED[type(op)](), left
+        if _field_path(left) != (AGE,) or type(op) not in _AGE_RANGES:
+            return None
+        try:
+            bound = _constant(right)
+        except QueryError:
+            return None
+        if isinstance(bound, bool) or not isinstance(bound, int):
+            return None
+        min_age, max_age = _AGE_RANGES[type(op)](bound)
+        if (min_age is not None and min_age < 0) or (max_age is not None and max_age < 0):
+            # Future birth dates give negative ages, left to the generic comparison
+            return None
+        return min_age, max_age
+
+    def age_range(self, min_age: Optional[int], max_age: Optional[int]) -> Predicate:
+        """Cutoff-string predicate for an inclusive age range"""
+        if min_age is not None and max_age is not None and min_age > max_age:
+            return lambda person: False
+        matches = AgeFilter(min_age, max_age).predicate(self.reference, quiet=True)
+        return lambda person: matches(person.get("birth_date"))
+
+    def comparison(self, left: ast.AST, op: ast.cmpop, right: ast.AST) -> Predicate:
+        """Predicate for one comparison"""
+        bounds = self.age_bounds(left, ast.Eq() if isinstance(op, ast.NotEq) else op, right)
+        if bounds:
+            equal_or_in_range = self.age_range(*bounds)
+            if isinstance(op, ast.NotEq):
+                get_age = self.get_age
+                return lambda person: get_age(person) is not None and not equal_or_in_range(person)
+            return equal_or_in_range
+        compare = _COMPARISONS.get(type(op))
+        if compare is None:
+            raise QueryError(f"Unsupported operator: {type(op).__name__}")
+        get_left, get_right = self.value(left), self.value(right)
+        # Only an explicit None operand compares with missing values
+        none_allowed = any(isinstance(node, ast.Constant) and node.value is None for node in (left, right))
+
+        def compare_values(person: dict) -> bool:
+            left_value, right_value = get_left(person), get_right(person)
+            if not none_allowed and (left_value is None or right_value is None):
+                return False
+            try:
+                return bool(compare(left_value, right_value))
+            except TypeError:
+                return False
+
+        return compare_values
+
+    def predicate(self, node: ast.AST) -> Predicate:
+        """Predicate for a boolean expression"""
+        if isinstance(node, ast.BoolOp):
+            parts = [self.predicate(value) for value in node.values]
+            if len(parts) == 2:
+                first, second = parts
+                if isinstance(node.op, ast.And):
+                    return lambda person: first(person) and second(person)
+                return lambda person: first(person) or second(person)
+            if isinstance(node.op, ast.And):
+                return lambda person: all(part(person) for part in parts)
+            return lambda person: any(part(person) for part in parts)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            inner = self.predicate(node.operand)
+            return lambda person: not inner(person)
+        if isinstance(node, ast.Compare):
+            operands = [node.left] + node.comparators
+            pairs = [(operands[i], op, operands[i + 1]) for i, op in enumerate(node.ops)]
+            bounds = [self.age_bounds(*pair) for pair in pairs]
+            if len(pairs) > 1 and all(bounds):
+                # 18 <= age < 30 becomes one range, one birth-date test
+                lows = [low for low, _ in bounds if low is not None]
+                highs = [high for _, high in bounds if high is not None]
+                return self.age_range(max(lows) if lows else None, min(highs) if highs else None)
+            parts = [self.comparison(*pair) for pair in pairs]
+            if len(parts) == 1:
+                return parts[0]
+            return lambda person: all(part(person) for part in parts)
+        get_value = self.value(node)
+        return lambda person: bool(get_value(person))
+
+
+def compile_query(expression: str, reference: Optional[date] = None) -> Predicate:
+    """
+    Compile a --where expression once into a predicate over person dicts.
+    :param expression: Expression text, see the module docstring.
+    :param reference: Day ages are counted on, today by default.
+    :return: Callable taking a person dict and returning bool.
+    """
+    return _compile(expression, reference or date.today())
+
+
+@lru_cache(maxsize=256)
+def _compile(expression: str, reference: date) -> Predicate:
+    """Cached compilation, so worker processes build each query once per reference day"""
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as error:
+        raise QueryError(f"Invalid expression {expression!r}: {error.msg}") from None
+    return _Compiler(reference).predicate(tree.body)
+
+
+def route(persons: Iterable[dict], predicates: Sequence[Predicate]) -> Iterator[Tuple[int, dict]]:
+    """
+    Evaluate several queries in a single pass.
+    :param persons: Iterable (or generator) of person dicts.
+    :param predicates: Compiled queries.
+    :return: Generator of (query index, person) for every query a person matches.
+    """
+    indexed: List[Tuple[int, Predicate]] = list(enumerate(predicates))
+    for person in persons:
+        for index, matches in indexed:
+            if matches(person):
+                yield index, person
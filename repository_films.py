@@ -1,11 +1,44 @@
 """CRUD operations"""
 
-from typing import Sequence
+from collections import defaultdict, namedtuple
+from functools import lru_cache
+from itertools import islice
+from typing import (Dict, Iterable, Iterator, List, NamedTuple, Optional,
+                    Sequence, Union)
 
-from sqlalchemy import delete, select
+from sqlalchemy import (bindparam, column, delete, func, insert, inspect, or_,
+                        select, table, text, update)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 
-from film_models import Films
+from film_cache import film_cache
+from film_models import FILMS_FTS_DDL, NATURAL_KEY, NATURAL_KEY_DDL, Films
+
+FilmRow = Union[Films, dict]
+
+FILM_COLUMNS = ("title", "director", "release_year")
+FILM_RECORD_FIELDS = ("id",) + FILM_COLUMNS
+
+# Columns an upsert may change on an existing film; empty while every column is in the key
+UPSERT_COLUMNS = tuple(column for column in FILM_COLUMNS if column not in NATURAL_KEY)
+
+films_fts = table("films_fts", column("rowid"), column("rank"), column("films_fts"))
+
+
+def film_to_row(film: FilmRow) -> dict:
+    """Convert a Films instance or a mapping into insertable column values"""
+    if isinstance(film, Films):
+        return {column: getattr(film, column) for column in FILM_COLUMNS}
+    return {column: film[column] for column in FILM_COLUMNS}
+
+
+def batched(rows: Iterable, size: int) -> Iterator[list]:
+    """Split an iterable into lists of at most `size` items without materializing it"""
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
 
 
 def add_film(session: Session, film: Films) -> None:
@@ -14,11 +47,268 @@ def add_film(session: Session, film: Films) -> None:
     session.commit()
 
 
+def add_films_bulk(
+    session: Session, films: Iterable[FilmRow], batch_size: int = 1000
+) -> List[int]:
+    """
+    Insert films in batches, committing once per batch.
+    :param session: Active session.
+    :param films: Iterable (or generator) of Films instances or dicts with film columns.
+    :param batch_size: Number of rows sent in one executemany and committed together.
+    :return: Ids of inserted films in input order.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    statement = insert(Films).returning(Films.id, sort_by_parameter_order=True)
+    inserted_ids: List[int] = []
+    for batch in batched(map(film_to_row, films), batch_size):
+        inserted_ids.extend(session.scalars(statement, batch))
+        session.commit()
+    return inserted_ids
+
+
+class UpsertResult(NamedTuple):
+    """Counts reported by upsert_films"""
+
+    inserted: int
+    updated: int
+
+
+def upsert_statement():
+    """INSERT ... ON CONFLICT on the natural key, returning ids of inserted or changed rows"""
+    films = Films.__table__
+    statement = sqlite_insert(films)
+    if UPSERT_COLUMNS:
+        statement = statement.on_conflict_do_update(
+            index_elements=NATURAL_KEY,
+            set_={column: statement.excluded[column] for column in UPSERT_COLUMNS},
+            where=or_(
+                *(films.c[column].is_not(statement.excluded[column]) for column in UPSERT_COLUMNS)
+            ),
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=NATURAL_KEY)
+    return statement.returning(films.c.id)
+
+
+def upsert_films(
+    session: Session, films: Iterable[FilmRow], batch_size: int = 1000
+) -> UpsertResult:
+    """
+    Insert films or update existing ones matched by (title, director, release_year).
+    Replaying the same feed adds no duplicates and needs no read-before-write.
+    :param session: Active session.
+    :param films: Iterable (or generator) of Films instances or dicts with film columns.
+    :param batch_size: Number of rows sent in one statement batch and committed together.
+    :return: UpsertResult with numbers of inserted and actually changed rows.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    statement = upsert_statement()
+    inserted = updated = 0
+    for batch in batched(map(film_to_row, films), batch_size):
+        # New rows always get ids above the current maximum, existing ones keep theirs
+        max_id = session.scalar(select(func.max(Films.id))) or 0
+        ids = session.scalars(statement, batch).all()
+        session.commit()
+        batch_inserted = sum(1 for film_id in ids if film_id > max_id)
+        inserted += batch_inserted
+        updated += len(ids) - batch_inserted
+    return UpsertResult(inserted, updated)
+
+
 def get_all_films(session: Session) -> Sequence[Films]:
     """Find all films in the table"""
     return session.execute(select(Films)).scalars().all()
 
 
+def iter_films(
+    session: Session, page_size: int = 1000, after_id: Optional[int] = None
+) -> Iterator[Films]:
+    """
+    Stream films ordered by id using keyset pagination.
+    Every yielded film is expunged from the session once the caller moves on,
+    so the identity map never holds more than one page.
+    :param session: Active session.
+    :param page_size: Number of rows fetched per query.
+    :param after_id: Cursor token - id of the last film already processed; None starts from the beginning.
+    :return: Generator of detached Films; the id of the last film seen is the token to resume from.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be a positive integer")
+    last_id = after_id
+    while True:
+        statement = select(Films).order_by(Films.id).limit(page_size)
+        if last_id is not None:
+            statement = statement.where(Films.id > last_id)
+        page = session.scalars(statement).all()
+        for film in page:
+            yield film
+            session.expunge(film)
+        if len(page) < page_size:
+            return
+        last_id = page[-1].id
+
+
+@lru_cache(maxsize=None)
+def film_record_type(columns: Sequence[str] = FILM_RECORD_FIELDS) -> type:
+    """Named tuple class for a projection of film columns, one class per column set"""
+    unknown = set(columns) - set(FILM_RECORD_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown film columns: {sorted(unknown)}")
+    return namedtuple("FilmRecord", columns)
+
+
+def iter_film_records(
+    session: Session, columns: Sequence[str] = FILM_RECORD_FIELDS, chunk_size: int = 10000
+) -> Iterator[tuple]:
+    """
+    Stream films as plain named tuples through Core, bypassing ORM objects and the identity map.
+    :param session: Active session, only its connection is used.
+    :param columns: Columns to fetch, in the order the tuple fields should have.
+    :param chunk_size: Rows fetched per round trip.
+    :return: Generator of FilmRecord named tuples ordered by id.
+    """
+    columns = tuple(columns)
+    record = film_record_type(columns)
+    films = Films.__table__
+    # Option set on the statement; Connection.execution_options would change the connection for good
+    result = session.connection().execute(
+        select(*(films.c[column] for column in columns))
+        .order_by(films.c.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    for partition in result.partitions():
+        yield from map(record._make, partition)
+
+
+def get_film_records(session: Session, columns: Sequence[str] = FILM_RECORD_FIELDS) -> List[tuple]:
+    """Find all films as FilmRecord named tuples"""
+    return list(iter_film_records(session, columns))
+
+
+def find_by_director(session: Session, director: str) -> Sequence[Films]:
+    """Find films of a director ordered by release year (ix_films_director_release_year)"""
+    statement = (
+        select(Films)
+        .where(Films.director == director)
+        .order_by(Films.release_year, Films.id)
+    )
+    return session.scalars(statement).all()
+
+
+def find_by_year_range(session: Session, start_year: int, end_year: int) -> Sequence[Films]:
+    """Find films released between start_year and end_year inclusive (ix_films_release_year)"""
+    statement = (
+        select(Films)
+        .where(Films.release_year.between(start_year, end_year))
+        .order_by(Films.release_year, Films.id)
+    )
+    return session.scalars(statement).all()
+
+
+def count_by_year(
+    session: Session, start_year: Optional[int] = None, end_year: Optional[int] = None
+) -> Dict[int, int]:
+    """
+    Count films per release year using the covering ix_films_release_year index.
+    :param session: Active session.
+    :param start_year: Lowest year to count, unbounded when None.
+    :param end_year: Highest year to count, unbounded when None.
+    :return: Mapping of release year to number of films, in year order.
+    """
+    statement = (
+        select(Films.release_year, func.count())
+        .group_by(Films.release_year)
+        .order_by(Films.release_year)
+    )
+    if start_year is not None:
+        statement = statement.where(Films.release_year >= start_year)
+    if end_year is not None:
+        statement = statement.where(Films.release_year <= end_year)
+    return dict(session.execute(statement).all())
+
+
+def count_by_director(session: Session) -> Dict[str, int]:
+    """Count films per director using the covering ix_films_director index"""
+    statement = (
+        select(Films.director, func.count())
+        .group_by(Films.director)
+        .order_by(Films.director)
+    )
+    return dict(session.execute(statement).all())
+
+
+def _fts_query(query: str) -> str:
+    """Quote every term so user input is matched literally instead of as FTS5 syntax"""
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+
+
+def search_films(session: Session, query: str, limit: int = 20) -> Sequence[Films]:
+    """
+    Full-text search over film titles and directors.
+    :param session: Active session.
+    :param query: Words to look for; every word must match.
+    :param limit: Maximum number of films returned.
+    :return: Films ordered by relevance (FTS5 bm25 rank), best match first.
+    """
+    terms = _fts_query(query)
+    if not terms:
+        return []
+    statement = (
+        select(Films)
+        .join(films_fts, films_fts.c.rowid == Films.id)
+        .where(films_fts.c.films_fts.op("MATCH")(terms))
+        .order_by(films_fts.c.rank)
+        .limit(limit)
+    )
+    return session.scalars(statement).all()
+
+
+def rebuild_search_index(session: Session) -> None:
+    """Create the FTS5 table and triggers if missing and repopulate them from films"""
+    for statement in FILMS_FTS_DDL:
+        session.execute(text(statement))
+    session.execute(text("INSERT INTO films_fts(films_fts) VALUES ('rebuild')"))
+    session.commit()
+
+
+def ensure_natural_key(session: Session) -> int:
+    """
+    Add the unique natural key index to a films table created without it.
+    Duplicates left by earlier plain inserts are deleted first, keeping the
+    oldest row of each; running it again changes nothing.
+    :param session: Active session.
+    :return: Number of duplicate rows deleted.
+    """
+    films = Films.__table__
+    kept = select(func.min(films.c.id)).group_by(*(films.c[column] for column in NATURAL_KEY))
+    deleted = session.execute(delete(films).where(films.c.id.not_in(kept))).rowcount
+    session.execute(text(NATURAL_KEY_DDL))
+    session.commit()
+    if deleted:
+        film_cache.clear()
+    return deleted
+
+
+def ensure_indexes(session: Session) -> List[str]:
+    """
+    Create the lookup indexes of films on a table created before they existed.
+    The unique natural key is left to ensure_natural_key, which removes duplicates first.
+    :param session: Active session.
+    :return: Names of the indexes created, empty when all were in place.
+    """
+    connection = session.connection()
+    existing = {index["name"] for index in inspect(connection).get_indexes(Films.__tablename__)}
+    created = []
+    for index in sorted(Films.__table__.indexes, key=lambda index: index.name):
+        if not index.unique and index.name not in existing:
+            index.create(bind=connection)
+            created.append(index.name)
+    session.commit()
+    return created
+
+
 def update_film(session: Session, film_id: int, new_data: dict) -> None:
     """Update film"""
     film = session.get(Films, film_id)
@@ -26,9 +316,65 @@ def update_film(session: Session, film_id: int, new_data: dict) -> None:
         for key, value in new_data.items():
             setattr(film, key, value)
         session.commit()
+        film_cache.invalidate(film_id)
+
+
+def update_films(session: Session, updates: Dict[int, dict]) -> int:
+    """
+    Update many films in one transaction.
+    Rows are grouped by the set of changed columns and each group is sent as a
+    single executemany UPDATE. Films already loaded in the session receive the
+    new values directly, so they are not reloaded after the commit.
+    :param session: Active session.
+    :param updates: Mapping of film id to new column values.
+    :return: Number of rows matched by the updates.
+    """
+    groups = defaultdict(list)
+    for film_id, new_data in updates.items():
+        unknown = set(new_data) - set(FILM_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown film columns: {sorted(unknown)}")
+        if new_data:
+            groups[tuple(sorted(new_data))].append({"film_id": film_id, **new_data})
+
+    table = Films.__table__
+    matched = 0
+    try:
+        # Pending ORM changes go first, otherwise the flush in commit() would overwrite the batch
+        session.flush()
+        for columns, rows in groups.items():
+            statement = (
+                update(table)
+                .where(table.c.id == bindparam("film_id"))
+                .values({column: bindparam(column) for column in columns})
+            )
+            matched += session.connection().execute(statement, rows).rowcount
+
+        loaded = {}
+        for film_id, new_data in updates.items():
+            film = session.identity_map.get(identity_key(Films, film_id))
+            if film is not None:
+                values = {
+                    key: film.__dict__[key]
+                    for key in ("id",) + FILM_COLUMNS
+                    if key in film.__dict__
+                }
+                loaded[film] = {**values, **new_data}
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    for film_id in updates:
+        film_cache.invalidate(film_id)
+
+    for film, values in loaded.items():
+        for key, value in values.items():
+            set_committed_value(film, key, value)
+    return matched
 
 
 def delete_all_films(session: Session) -> None:
     """Delete all records in table"""
     session.execute(delete(Films))
     session.commit()
+    film_cache.clear()
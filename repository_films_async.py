@@ -0,0 +1,65 @@
+"""CRUD operations for asyncio code, mirroring repository_films on an AsyncSession"""
+
+from typing import AsyncIterator, Optional, Sequence
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from film_cache import film_cache
+from film_models import Films
+
+
+async def add_film(session: AsyncSession, film: Films) -> None:
+    """Add film into the table"""
+    session.add(film)
+    await session.commit()
+
+
+async def get_all_films(session: AsyncSession) -> Sequence[Films]:
+    """Find all films in the table"""
+    return (await session.scalars(select(Films))).all()
+
+
+async def iter_films(
+    session: AsyncSession, page_size: int = 1000, after_id: Optional[int] = None
+) -> AsyncIterator[Films]:
+    """
+    Stream films ordered by id using keyset pagination.
+    Same contract as repository_films.iter_films: yielded films are expunged
+    once the caller moves on, and after_id is the resume token.
+    :param session: Active async session.
+    :param page_size: Number of rows fetched per query.
+    :param after_id: Id of the last film already processed; None starts from the beginning.
+    :return: Async generator of detached Films.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be a positive integer")
+    last_id = after_id
+    while True:
+        statement = select(Films).order_by(Films.id).limit(page_size)
+        if last_id is not None:
+            statement = statement.where(Films.id > last_id)
+        page = (await session.scalars(statement)).all()
+        for film in page:
+            yield film
+            session.expunge(film)
+        if len(page) < page_size:
+            return
+        last_id = page[-1].id
+
+
+async def update_film(session: AsyncSession, film_id: int, new_data: dict) -> None:
+    """Update film"""
+    film = await session.get(Films, film_id)
+    if film:
+        for key, value in new_data.items():
+            setattr(film, key, value)
+        await session.commit()
+        film_cache.invalidate(film_id)
+
+
+async def delete_all_films(session: AsyncSession) -> None:
+    """Delete all records in table"""
+    await session.execute(delete(Films))
+    await session.commit()
+    film_cache.clear()
@@ -1,9 +1,11 @@
 """Coordinates repository operations"""
 
+from itertools import chain
+
 from database import Session
 from film_models import Films
-from repository_films import (add_film, delete_all_films, get_all_films,
-                              update_film)
+from repository_films import (delete_all_films, ensure_natural_key,
+                              iter_film_records, update_film, upsert_films)
 
 
 def main():
@@ -20,17 +22,16 @@ def main():
                 release_year=2017,
             ),
         ]
-        for film in films:
-            add_film(session, film)
+        ensure_natural_key(session)
+        upsert_films(session, films)
 
     with Session() as session:
         populate_films(session)
-        films_before_update = get_all_films(session)
 
         print("Films before update".center(60, "*"))
         print(f"{'ID':<2} {'Title':<24} {'Director':<18} {'Year'}")
         print("-" * 60)
-        for film in films_before_update:
+        for film in iter_film_records(session):
             print(f"{film.id:<3}{film.title:<25}{film.director:<19}{film.release_year}")
 
         update_film(
@@ -46,16 +47,17 @@ def main():
         print("Films after update".center(60, "*"))
         print(f"{'ID':<2} {'Title':<24} {'Director':<18} {'Year'}")
         print("-" * 60)
-        for film in films_before_update:
+        for film in iter_film_records(session):
             print(f"{film.id:<3}{film.title:<25}{film.director:<19}{film.release_year}")
 
         delete_all_films(session)
 
-        films_after_deletion = get_all_films(session)
-        if not films_after_deletion:
+        films_after_deletion = iter_film_records(session)
+        first_film = next(films_after_deletion, None)
+        if first_film is None:
             print("\nAll records were deleted")
         else:
-            for film in films_after_deletion:
+            for film in chain([first_film], films_after_deletion):
                 print(
                     f"{film.id}, Title: {film.title}, Director: {film.director}, Release year: {film.release_year}"
                 )
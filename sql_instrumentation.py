@@ -0,0 +1,220 @@
+"""Opt-in per-statement SQL instrumentation built on engine cursor events"""
+
+import json
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+# Upper bounds of latency buckets in milliseconds, the last bucket is open-ended
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so calls differing only in IN-list length share one shape"""
+    return _PLACEHOLDER_LIST.sub("(?, ...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class StatementStats:
+    """Latency histogram and row counts of one statement shape"""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, elapsed_ms: float, rows: int) -> None:
+        """Record one execution"""
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += max(rows, 0)
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    def as_dict(self) -> dict:
+        """JSON-ready representation"""
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "rows": self.rows,
+            "histogram": dict(zip(labels, self.buckets)),
+        }
+
+
+class SQLStats:
+    """
+    Collects statement timings from an engine and statement counts per session transaction
+
+    Row counts come from cursor.rowcount, which SQLite reports for INSERT/UPDATE/DELETE
+    but not for SELECT.
+
+    Attributes:
+        n_plus_one_threshold (int): Repetitions of one SELECT shape inside a session
+            transaction that are reported as a likely N+1 pattern
+
+    Methods:
+        attach(engine): Start listening to an engine and to ORM sessions
+        detach(): Stop listening
+        snapshot(): Collected data as a dict
+        reset(): Drop collected data
+    """
+
+    def __init__(self, n_plus_one_threshold: int = 10) -> None:
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._lock = threading.Lock()
+        self._engine: Optional[Engine] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop collected data"""
+        with self._lock:
+            self.statements = {}
+            self.sessions = 0
+            self.session_statements_total = 0
+            self.session_statements_max = 0
+            self.n_plus_one = Counter()
+
+    def attach(self, engine: Engine) -> "SQLStats":
+        """Register event listeners on the engine and on the Session class"""
+        if self._engine is not None:
+            raise RuntimeError("SQLStats is already attached to an engine")
+        self._engine = engine
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(Session, "after_begin", self._after_begin)
+        event.listen(Session, "after_transaction_end", self._after_transaction_end)
+        return self
+
+    def detach(self) -> None:
+        """Remove every listener registered by attach"""
+        if self._engine is None:
+            return
+        event.remove(self._engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(self._engine, "after_cursor_execute", self._after_cursor_execute)
+        event.remove(Session, "after_begin", self._after_begin)
+        event.remove(Session, "after_transaction_end", self._after_transaction_end)
+        self._engine = None
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Kept on the execution context, which a failed statement simply leaves behind
+        context.sql_stats_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = context.sql_stats_started
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        shape = statement_shape(statement)
+        with self._lock:
+            stats = self.statements.get(shape)
+            if stats is None:
+                stats = self.statements[shape] = StatementStats()
+            stats.add(elapsed_ms, cursor.rowcount)
+        session_counter = conn.info.get("sql_stats_session")
+        if session_counter is not None:
+            session_counter[shape] += 1
+
+    def _after_begin(self, session, transaction, connection):
+        # Session listeners are global; engines from execution_options share the pool
+        if connection.engine.pool is not self._engine.pool:
+            return
+        counter = session.info.setdefault("sql_stats_counter", Counter())
+        connection.info["sql_stats_session"] = counter
+        # Keep the pooled connection's info dict: the Connection is closed by the time
+        # the transaction ends
+        session.info.setdefault("sql_stats_connections", []).append(connection.info)
+
+    def _after_transaction_end(self, session, transaction):
+        if transaction.parent is not None:
+            return
+        for connection_info in session.info.pop("sql_stats_connections", []):
+            connection_info.pop("sql_stats_session", None)
+        counter = session.info.pop("sql_stats_counter", None)
+        if counter is None:
+            return
+        total = sum(counter.values())
+        with self._lock:
+            self.sessions += 1
+            self.session_statements_total += total
+            self.session_statements_max = max(self.session_statements_max, total)
+            for shape, count in counter.items():
+                if count >= self.n_plus_one_threshold and shape.upper().startswith("SELECT"):
+                    self.n_plus_one[shape] += 1
+
+    def snapshot(self) -> dict:
+        """Collected data as a JSON-ready dict"""
+        with self._lock:
+            return {
+                "statements": {shape: stats.as_dict() for shape, stats in self.statements.items()},
+                "sessions": {
+                    "count": self.sessions,
+                    "statements_total": self.session_statements_total,
+                    "statements_mean": (
+                        round(self.session_statements_total / self.sessions, 2) if self.sessions else 0.0
+                    ),
+                    "statements_max": self.session_statements_max,
+                },
+                "n_plus_one": dict(self.n_plus_one),
+            }
+
+    def dump(self, path: str) -> None:
+        """Atomically write the snapshot to a JSON file"""
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(temporary_path, path)
+
+
+@contextmanager
+def instrument(engine: Engine, n_plus_one_threshold: int = 10):
+    """
+    Collect statement statistics for the duration of the block.
+    :param engine: Engine to observe.
+    :param n_plus_one_threshold: Repetitions that flag an N+1 pattern.
+    :return: SQLStats with the collected data.
+    """
+    stats = SQLStats(n_plus_one_threshold).attach(engine)
+    try:
+        yield stats
+    finally:
+        stats.detach()
+
+
+class PeriodicDump(threading.Thread):
+    """
+    Background thread writing SQLStats snapshots to a JSON file
+
+    Methods:
+        stop(): Write a final snapshot and end the thread
+    """
+
+    def __init__(self, stats: SQLStats, path: str, interval: float = 60.0) -> None:
+        super().__init__(name="sql-stats-dump", daemon=True)
+        self.stats = stats
+        self.path = path
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.stats.dump(self.path)
+
+    def stop(self) -> None:
+        """Write a final snapshot and end the thread"""
+        self._stopped.set()
+        self.join()
+        self.stats.dump(self.path)
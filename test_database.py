@@ -0,0 +1,106 @@
+"""Tests that cover database configuration"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from database import (MEMORY_URL, PROFILES, Base, clone_database, make_engine,
+                      snapshot_engine)
+from film_models import Films
+from repository_films import (add_films_bulk, delete_all_films, get_all_films,
+                              update_film)
+
+
+def test_make_engine_applies_profile_pragmas(tmp_path):
+    """Pragmas of the profile are set on every new connection"""
+    engine = make_engine("read_heavy", f"sqlite:///{tmp_path / 'films.sqlite3'}")
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA cache_size")).scalar() == -65536
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+    engine.dispose()
+
+
+@pytest.mark.parametrize("profile", ["default", "read_heavy"])
+def test_read_then_write_after_concurrent_commit(tmp_path, profile):
+    """A session that read before another connection committed can still write"""
+    engine = make_engine(profile, f"sqlite:///{tmp_path / 'films.sqlite3'}")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session, Session(engine) as other:
+        ids = add_films_bulk(session, [{"title": "La la land", "director": "Damien Chazelle", "release_year": 2016}])
+        session.get(Films, ids[0])
+        add_films_bulk(other, [{"title": "Dune", "director": "Denis Villeneuve", "release_year": 2021}])
+        update_film(session, ids[0], {"title": "Kryshtal"})
+        assert session.get(Films, ids[0]).title == "Kryshtal"
+    engine.dispose()
+
+
+def test_snapshot_engine_shares_pool_with_writers(tmp_path):
+    """Snapshot readers keep one snapshot, and writers reusing their connection keep transactions"""
+    engine = make_engine("default", f"sqlite:///{tmp_path / 'films.sqlite3'}", pool_size=1, max_overflow=0)
+    Base.metadata.create_all(bind=engine)
+    with Session(snapshot_engine(engine)) as reader, Session(engine) as writer:
+        before = len(get_all_films(reader))
+        reader_connection = reader.connection().connection.dbapi_connection
+        reader.rollback()
+        writer.add(Films(title="Dune", director="Denis Villeneuve", release_year=2021))
+        writer.flush()
+        assert writer.connection().connection.dbapi_connection is reader_connection
+        writer.rollback()
+        assert len(get_all_films(writer)) == before
+    engine.dispose()
+
+
+@pytest.mark.parametrize("profile", sorted(PROFILES))
+def test_make_engine_in_memory_with_every_profile(profile):
+    """In-memory URLs work with every profile and all sessions share one database"""
+    engine = make_engine(profile, MEMORY_URL)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        add_films_bulk(session, [{"title": "Dune", "director": "Denis Villeneuve", "release_year": 2021}])
+    with Session(engine) as session:
+        assert len(get_all_films(session)) == 1
+    engine.dispose()
+
+
+def test_make_engine_unknown_profile():
+    """Negative test to verify that unknown profile names are rejected"""
+    with pytest.raises(ValueError):
+        make_engine("turbo")
+
+
+def test_configure_in_memory_creates_engine_lazily(monkeypatch):
+    """Engine is built on first use and in-memory mode keeps data between sessions"""
+    import database
+
+    monkeypatch.setattr(database, "_engine", None)
+    monkeypatch.setattr(database, "_engine_settings", dict(database._engine_settings))
+    database.configure(in_memory=True)
+    assert database._engine is None
+    database.create_tables()
+    with database.Session() as session:
+        add_films_bulk(session, [{"title": "Poor Things", "director": "Yorgos Lanthimos", "release_year": 2023}])
+    with database.Session() as session:
+        assert len(get_all_films(session)) == 1
+    assert database.engine.url.database is None
+    database.configure(in_memory=True)
+    assert database._engine is None
+
+
+def test_configure_unknown_profile():
+    """Negative test to verify that configure rejects unknown profile names"""
+    import database
+
+    with pytest.raises(ValueError):
+        database.configure(profile="turbo")
+
+
+def test_populated_session_is_a_private_copy(populated_session, template_database):
+    """Every test gets its own clone of the template, changes do not leak back"""
+    films = len(get_all_films(populated_session))
+    assert films > 0
+    delete_all_films(populated_session)
+    assert get_all_films(populated_session) == []
+    clone = clone_database(template_database)
+    with clone.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM films")).scalar() == films
+    clone.dispose()
@@ -0,0 +1,86 @@
+"""Tests that cover the read-through film cache"""
+import dataclasses
+
+import pytest
+
+from film_cache import FilmCache, FilmSnapshot, film_cache
+from film_models import Films
+from repository_films import (add_films_bulk, delete_all_films, update_film,
+                              update_films)
+
+
+@pytest.fixture
+def film_ids(session):
+    """Three films in the test database and an empty process cache"""
+    film_cache.clear()
+    yield add_films_bulk(session, (
+        {"title": f"Film {number}", "director": "Director", "release_year": 2000 + number}
+        for number in range(3)
+    ))
+    film_cache.clear()
+
+
+def test_cache_hits_after_first_read(session, film_ids):
+    """Second lookup is served from the cache as an immutable snapshot"""
+    cache = FilmCache(maxsize=10)
+    first = cache.get(session, film_ids[0])
+    second = cache.get(session, film_ids[0])
+    assert first is second
+    assert isinstance(first, FilmSnapshot)
+    assert cache.stats == {"hits": 1, "misses": 1, "size": 1}
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.title = "Changed"
+
+
+def test_cache_ignores_unflushed_changes(session, film_ids):
+    """Negative test to verify that edits a session has not committed never reach the cache"""
+    cache = FilmCache(maxsize=10)
+    film = session.get(Films, film_ids[0])
+    film.title = "UNCOMMITTED"
+    assert cache.get(session, film_ids[0]).title == "Film 0"
+    session.rollback()
+    assert cache.get(session, film_ids[0]).title == "Film 0"
+
+
+def test_cache_evicts_least_recently_used(session, film_ids):
+    """Oldest unused entry is evicted when the cache is full"""
+    cache = FilmCache(maxsize=2)
+    cache.get(session, film_ids[0])
+    cache.get(session, film_ids[1])
+    cache.get(session, film_ids[0])
+    cache.get(session, film_ids[2])
+    cache.get(session, film_ids[0])
+    assert len(cache) == 2
+    assert cache.hits == 2
+    cache.get(session, film_ids[1])
+    assert cache.misses == 4
+
+
+def test_cache_entries_expire(session, film_ids, monkeypatch):
+    """Entries older than ttl are reloaded"""
+    clock = [100.0]
+    monkeypatch.setattr("film_cache.time.monotonic", lambda: clock[0])
+    cache = FilmCache(ttl=5)
+    cache.get(session, film_ids[0])
+    clock[0] += 6
+    cache.get(session, film_ids[0])
+    assert cache.stats["misses"] == 2
+
+
+def test_cache_missing_film_is_not_stored(session, film_ids):
+    """Negative test to verify that unknown ids return None and are not cached"""
+    cache = FilmCache()
+    assert cache.get(session, 10_000) is None
+    assert len(cache) == 0
+
+
+def test_repository_writes_invalidate_cache(session, film_ids):
+    """update_film, update_films and delete_all_films invalidate the process cache"""
+    film_cache.get(session, film_ids[0])
+    film_cache.get(session, film_ids[1])
+    update_film(session, film_ids[0], {"title": "Kryshtal"})
+    update_films(session, {film_ids[1]: {"title": "La la land"}})
+    assert film_cache.get(session, film_ids[0]).title == "Kryshtal"
+    assert film_cache.get(session, film_ids[1]).title == "La la land"
+    delete_all_films(session)
+    assert film_cache.get(session, film_ids[0]) is None
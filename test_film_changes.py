@@ -0,0 +1,83 @@
+"""Tests that cover the film change-data-capture log"""
+from datetime import timedelta
+
+from sqlalchemy import text
+
+from film_changes import (changes_since, compact_changes, enable_film_changes,
+                          latest_seq, prune_changes)
+from repository_films import (add_films_bulk, delete_all_films, update_film,
+                              update_films, upsert_films)
+
+
+def add_films(session, count):
+    """Insert films with unique titles"""
+    return add_films_bulk(session, (
+        {"title": f"Film {number}", "director": "Director", "release_year": 2000}
+        for number in range(count)
+    ))
+
+
+def test_mutations_are_logged_in_order(session):
+    """Inserts, updates with changed columns only and deletes are logged with increasing seq"""
+    ids = add_films(session, 2)
+    update_film(session, ids[0], {"title": "Kryshtal", "release_year": 2000})
+    update_films(session, {ids[1]: {"release_year": 2018}})
+    upsert_films(session, [{"title": "Kryshtal", "director": "Director", "release_year": 2000}])
+    delete_all_films(session)
+
+    changes = changes_since(session, 0)
+    assert [(change.operation, change.film_id) for change in changes] == [
+        ("insert", ids[0]), ("insert", ids[1]), ("update", ids[0]), ("update", ids[1]),
+        ("delete", ids[0]), ("delete", ids[1]),
+    ]
+    assert changes[2].columns == ["title"]
+    assert changes[3].columns == ["release_year"]
+    assert [change.seq for change in changes] == sorted(change.seq for change in changes)
+
+
+def test_enable_film_changes_on_old_database(session):
+    """Installer adds the log and triggers to a database created without them and can run again"""
+    for name in ("insert", "update", "delete"):
+        session.execute(text(f"DROP TRIGGER film_changes_{name}"))
+    session.execute(text("DROP TABLE film_changes"))
+    session.commit()
+    ids = add_films(session, 1)
+    enable_film_changes(session)
+    update_film(session, ids[0], {"title": "Kryshtal"})
+    enable_film_changes(session)
+    delete_all_films(session)
+    assert [change.operation for change in changes_since(session, 0)] == ["update", "delete"]
+
+
+def test_changes_since_pages_from_cursor(session):
+    """Consumers page through the log with the last seen seq"""
+    add_films(session, 5)
+    first_page = changes_since(session, 0, limit=2)
+    second_page = changes_since(session, first_page[-1].seq, limit=10)
+    assert len(first_page) == 2
+    assert len(second_page) == 3
+    assert changes_since(session, latest_seq(session)) == []
+
+
+def test_prune_keeps_seq_monotonic(session):
+    """Pruned entries are gone and new entries continue after the old maximum"""
+    add_films(session, 3)
+    last = latest_seq(session)
+    assert prune_changes(session, before_seq=last + 1) == 3
+    assert prune_changes(session, older_than=timedelta(days=1)) == 0
+    add_films_bulk(session, [{"title": "New", "director": "Director", "release_year": 2000}])
+    assert [change.seq for change in changes_since(session, 0)] == [last + 1]
+
+
+def test_compact_keeps_newest_change_per_film(session):
+    """Compaction leaves one entry per film that tells consumers to re-read it"""
+    ids = add_films(session, 2)
+    for year in (2001, 2002, 2003):
+        update_film(session, ids[0], {"release_year": year})
+    assert compact_changes(session) == 3
+    changes = changes_since(session, 0)
+    assert [(change.operation, change.film_id) for change in changes] == [
+        ("insert", ids[1]), ("update", ids[0]),
+    ]
+    assert changes[1].columns == ["title", "director", "release_year"]
+    assert changes[0].columns == ["title", "director", "release_year"]
@@ -0,0 +1,59 @@
+"""Tests that cover decade-partitioned film storage"""
+from sqlalchemy import event
+
+from film_partitions import ID_SPAN, PartitionedFilmStore
+
+
+def films():
+    """Films spread over three decades"""
+    return [
+        {"title": "Blade Runner", "director": "Ridley Scott", "release_year": 1982},
+        {"title": "La la land", "director": "Damien Chazelle", "release_year": 2016},
+        {"title": "Poor things", "director": "Yorgos Lanthimos", "release_year": 2023},
+        {"title": "Blade Runner 2049", "director": "Denis Villeneuve", "release_year": 2017},
+    ]
+
+
+def test_films_are_routed_by_decade(tmp_path):
+    """Each film lands in its decade file and its id encodes the partition"""
+    with PartitionedFilmStore(str(tmp_path)) as store:
+        ids = store.add_films(films())
+        assert store.decades == [1980, 2010, 2020]
+        assert [film_id // ID_SPAN for film_id in ids] == [1980, 2010, 2020, 2010]
+        assert [film.title for film in store.get_all_films()] == [
+            "Blade Runner", "La la land", "Blade Runner 2049", "Poor things",
+        ]
+        assert [film.id for film in store.iter_films(page_size=1)] == sorted(ids)
+    with PartitionedFilmStore(str(tmp_path)) as reopened:
+        assert reopened.decades == [1980, 2010, 2020]
+        assert reopened.add_films([{"title": "Arrival", "director": "Denis Villeneuve", "release_year": 2016}])[0] > ids[3]
+
+
+def test_year_range_touches_only_overlapping_partitions(tmp_path):
+    """Router queries only the decades in range and merges results by year"""
+    with PartitionedFilmStore(str(tmp_path)) as store:
+        store.add_films(films())
+        touched = []
+        for decade in store.decades:
+            event.listen(
+                store._engines[decade], "before_cursor_execute",
+                lambda *args, decade=decade: touched.append(decade),
+            )
+        in_range = store.find_by_year_range(2015, 2025)
+        assert [film.release_year for film in in_range] == [2016, 2017, 2023]
+        assert set(touched) == {2010, 2020}
+        assert store.count_by_year() == {1982: 1, 2016: 1, 2017: 1, 2023: 1}
+
+
+def test_update_moves_film_between_partitions(tmp_path):
+    """Changing the decade moves the film and returns its new id"""
+    with PartitionedFilmStore(str(tmp_path)) as store:
+        ids = store.add_films(films())
+        assert store.update_film(ids[1], {"title": "Whiplash"}) == ids[1]
+        new_id = store.update_film(ids[1], {"release_year": 2024})
+        assert new_id // ID_SPAN == 2020
+        assert [film.title for film in store.find_by_year_range(2020, 2029)] == ["Poor things", "Whiplash"]
+        assert store.update_film(12345, {"title": "Missing"}) is None
+
+        store.delete_all_films()
+        assert store.get_all_films() == []
@@ -0,0 +1,63 @@
+"""Tests that cover SQL-side aggregates and the film_stats summary table"""
+import pytest
+from sqlalchemy import text
+
+import database
+from film_stats import check_film_stats, enable_film_stats, films_per_year
+from films_cli import main
+from repository_films import (add_films_bulk, count_by_director, count_by_year,
+                              delete_all_films, update_films)
+
+
+def add_films(session, count):
+    """Films spread over two directors and three years"""
+    return add_films_bulk(session, (
+        {"title": f"Film {number}", "director": f"Director {number % 2}", "release_year": 2000 + number % 3}
+        for number in range(count)
+    ))
+
+
+def test_count_by_director(session):
+    """Films per director are aggregated in SQL"""
+    add_films(session, 5)
+    assert count_by_director(session) == {"Director 0": 3, "Director 1": 2}
+
+
+def test_film_stats_follows_inserts_updates_and_deletes(session):
+    """Triggers keep the summary equal to live counts"""
+    ids = add_films(session, 6)
+    enable_film_stats(session)
+    assert films_per_year(session) == {2000: 2, 2001: 2, 2002: 2}
+
+    add_films_bulk(session, [{"title": "New", "director": "Director", "release_year": 2024}])
+    update_films(session, {ids[0]: {"release_year": 2002}})
+    assert films_per_year(session) == count_by_year(session) == {2000: 1, 2001: 2, 2002: 3, 2024: 1}
+
+    delete_all_films(session)
+    assert films_per_year(session) == {}
+
+
+def test_check_film_stats_reports_and_repairs(session):
+    """Consistency check finds drift and rebuilds the summary"""
+    add_films(session, 3)
+    enable_film_stats(session)
+    session.execute(text("UPDATE film_stats SET film_count = 10 WHERE release_year = 2001"))
+    session.commit()
+    assert check_film_stats(session, repair=False) == {2001: (10, 1)}
+    assert check_film_stats(session) == {2001: (10, 1)}
+    assert check_film_stats(session) == {}
+
+
+def test_cli_stats_check_before_enable(monkeypatch, tmp_path, capsys):
+    """Negative test to verify that stats-check asks for stats-enable instead of failing on a missing table"""
+    monkeypatch.setattr(database, "_engine", None)
+    monkeypatch.setattr(database, "_engine_settings", dict(database._engine_settings))
+    database.configure(url=f"sqlite:///{tmp_path / 'films.sqlite3'}")
+    database.create_tables()
+    with pytest.raises(SystemExit) as exit_info:
+        main(["stats-check"])
+    assert "run stats-enable first" in str(exit_info.value.code)
+    main(["stats-enable"])
+    main(["stats-check"])
+    assert "film_stats is consistent" in capsys.readouterr().out
+    database.configure()
@@ -0,0 +1,141 @@
+"""Tests that cover the group-commit film writer"""
+import asyncio
+import queue
+import threading
+import time
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from film_writer import GroupCommitWriter
+from repository_films import get_all_films
+
+
+def film(number):
+    """Film row with a unique natural key"""
+    return {"title": f"Film {number}", "director": "Director", "release_year": 2000}
+
+
+def test_concurrent_producers_get_their_ids(engine, session):
+    """Films from many threads are grouped into few commits and every future gets its own id"""
+    futures = {}
+    lock = threading.Lock()
+    with GroupCommitWriter(sessionmaker(bind=engine), max_batch=50, max_delay_ms=50) as writer:
+
+        def produce(start):
+            for number in range(start, start + 100):
+                submitted = writer.submit(film(number))
+                with lock:
+                    futures[number] = submitted
+
+        producers = [threading.Thread(target=produce, args=(start,)) for start in range(0, 400, 100)]
+        for producer in producers:
+            producer.start()
+        for producer in producers:
+            producer.join()
+        ids = {number: future.result(timeout=10) for number, future in futures.items()}
+
+    metrics = writer.metrics
+    titles = {stored.id: stored.title for stored in get_all_films(session)}
+    assert len(set(ids.values())) == 400
+    assert all(titles[film_id] == f"Film {number}" for number, film_id in ids.items())
+    assert metrics["rows"] == 400
+    assert metrics["flushes"] < 400
+    assert metrics["queue_depth"] == 0
+
+
+def test_failed_row_does_not_fail_its_batch(engine):
+    """Negative test to verify that a duplicate natural key only fails its own future"""
+    with GroupCommitWriter(sessionmaker(bind=engine), max_batch=10, max_delay_ms=200) as writer:
+        futures = [writer.submit(film(number)) for number in (1, 2, 1, 3)]
+        results = [future.exception(timeout=10) for future in futures]
+    assert isinstance(results[2], IntegrityError)
+    assert [result is None for result in results] == [True, True, False, True]
+    assert writer.metrics["failed"] == 1
+
+
+def test_submit_async(engine):
+    """Coroutines can await the id of a queued film"""
+    with GroupCommitWriter(sessionmaker(bind=engine), max_delay_ms=5) as writer:
+
+        async def produce():
+            return await asyncio.gather(*(writer.submit_async(film(number)) for number in range(5)))
+
+        assert sorted(asyncio.run(produce())) == [1, 2, 3, 4, 5]
+
+
+def test_submit_after_close(engine):
+    """Negative test to verify that a closed writer rejects films"""
+    writer = GroupCommitWriter(sessionmaker(bind=engine))
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.submit(film(1))
+
+
+def test_close_races_with_producers(engine):
+    """Every accepted film is resolved when close runs while producers keep submitting"""
+    writer = GroupCommitWriter(sessionmaker(bind=engine), max_batch=5, max_queue=3)
+    futures, lock = [], threading.Lock()
+
+    def produce(offset):
+        for number in range(offset, offset + 50):
+            try:
+                future = writer.submit(film(number))
+            except RuntimeError:
+                return
+            with lock:
+                futures.append(future)
+
+    producers = [threading.Thread(target=produce, args=(offset,)) for offset in range(0, 200, 50)]
+    for producer in producers:
+        producer.start()
+    writer.close()
+    for producer in producers:
+        producer.join()
+    assert all(future.done() for future in futures)
+    with sessionmaker(bind=engine)() as session:
+        assert len(get_all_films(session)) == len(futures)
+
+
+def gated_factory(engine, gate):
+    """Session factory that holds the writer thread until gate is set, so films pile up in the queue"""
+    factory = sessionmaker(bind=engine)
+
+    def open_session():
+        gate.wait()
+        return factory()
+
+    return open_session
+
+
+def test_cancelled_future_is_skipped(engine):
+    """A film cancelled while queued is not written and does not stop the writer"""
+    gate = threading.Event()
+    writer = GroupCommitWriter(gated_factory(engine, gate), max_batch=10)
+    futures = [writer.submit(film(number)) for number in range(3)]
+    assert futures[1].cancel()
+    gate.set()
+    assert [futures[0].result(timeout=5), futures[2].result(timeout=5)] == [1, 2]
+    assert writer.submit(film(3)).result(timeout=5) == 3
+    writer.close()
+    with sessionmaker(bind=engine)() as session:
+        assert [row.title for row in get_all_films(session)] == ["Film 0", "Film 2", "Film 3"]
+
+
+def test_submit_timeout_while_another_producer_blocks(engine):
+    """Negative test to verify that a full queue fails submit after its own timeout"""
+    gate = threading.Event()
+    writer = GroupCommitWriter(gated_factory(engine, gate), max_queue=1)
+    writer.submit(film(0))
+    blocked = threading.Thread(target=writer.submit, args=(film(1),))
+    blocked.start()
+    time.sleep(0.05)
+    started = time.monotonic()
+    with pytest.raises(queue.Full):
+        writer.submit(film(2), timeout=0.05)
+    assert time.monotonic() - started < 0.5
+    gate.set()
+    blocked.join()
+    writer.close()
+    assert writer.metrics["rows"] == 2
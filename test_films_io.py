@@ -0,0 +1,111 @@
+"""Tests that cover streaming import and export of films"""
+import io
+import json
+
+import pytest
+from sqlalchemy import text
+
+import database
+from film_models import Films
+from films_cli import main
+from films_io import export_films, import_films
+from repository_films import delete_all_films, get_all_films
+
+
+def write_ndjson(path, records):
+    """Write records as one JSON object per line"""
+    path.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+
+
+def film_records(count):
+    """Film records as they appear in source files"""
+    return [
+        {"title": f"Film {number}", "director": "Director", "release_year": 2000 + number}
+        for number in range(count)
+    ]
+
+
+def test_csv_export_and_import_round_trip(session, tmp_path):
+    """Exported CSV can be imported back with the same rows"""
+    session.add_all(Films(**record) for record in film_records(5))
+    session.commit()
+    buffer = io.StringIO()
+    assert export_films(session, buffer, "csv", chunk_size=2) == 5
+
+    delete_all_films(session)
+    source = tmp_path / "films.csv"
+    source.write_text(buffer.getvalue(), encoding="utf-8")
+    assert import_films(session, str(source), chunk_size=2) == 5
+    titles = [film.title for film in get_all_films(session)]
+    assert titles == [f"Film {number}" for number in range(5)]
+
+
+def test_import_twice_adds_no_duplicates(session, tmp_path):
+    """Replaying the same file is idempotent thanks to the natural-key upsert"""
+    source = tmp_path / "films.ndjson"
+    write_ndjson(source, film_records(4) * 2)
+    assert import_films(session, str(source), chunk_size=3) == 8
+    assert import_films(session, str(source)) == 8
+    assert len(get_all_films(session)) == 4
+
+
+def test_ndjson_export_writes_one_object_per_line(session):
+    """NDJSON export writes every film as a JSON line"""
+    session.add_all(Films(**record) for record in film_records(3))
+    session.commit()
+    buffer = io.StringIO()
+    export_films(session, buffer, "ndjson")
+    lines = [json.loads(line) for line in buffer.getvalue().splitlines()]
+    assert [line["id"] for line in lines] == [1, 2, 3]
+    assert lines[0]["release_year"] == 2000
+
+
+def test_export_leaves_connection_options_unchanged(session):
+    """yield_per applies to the export query only, not to later statements of the session"""
+    session.add_all(Films(**record) for record in film_records(3))
+    session.commit()
+    export_films(session, io.StringIO(), "ndjson", chunk_size=2)
+    assert "yield_per" not in session.connection().get_execution_options()
+
+
+def test_import_resumes_after_last_committed_chunk(session, tmp_path):
+    """Interrupted import continues after the last committed chunk without duplicates"""
+    records = film_records(10)
+    broken = records[:7] + [{"title": "Broken", "director": "Director", "release_year": "n/a"}] + records[8:]
+    source = tmp_path / "films.ndjson"
+    write_ndjson(source, broken)
+    with pytest.raises(ValueError):
+        import_films(session, str(source), chunk_size=3)
+    assert len(get_all_films(session)) == 6
+
+    write_ndjson(source, records)
+    assert import_films(session, str(source), chunk_size=3, resume=True) == 4
+    assert [film.title for film in get_all_films(session)] == [record["title"] for record in records]
+    assert import_films(session, str(source), chunk_size=3, resume=True) == 0
+
+
+def test_import_unknown_extension(session, tmp_path):
+    """Negative test to verify that unsupported files are rejected"""
+    source = tmp_path / "films.xml"
+    source.write_text("<films/>", encoding="utf-8")
+    with pytest.raises(ValueError):
+        import_films(session, str(source))
+
+
+@pytest.mark.parametrize("existing", [False, True])
+def test_cli_import_creates_missing_tables(monkeypatch, tmp_path, existing):
+    """CLI import works on a new file and on a database created before import_progress existed"""
+    monkeypatch.setattr(database, "_engine", None)
+    monkeypatch.setattr(database, "_engine_settings", dict(database._engine_settings))
+    database.configure(url=f"sqlite:///{tmp_path / 'films.sqlite3'}")
+    if existing:
+        database.create_tables()
+        with database.Session() as session:
+            session.execute(text("DROP TABLE import_progress"))
+            session.commit()
+    source = tmp_path / "films.ndjson"
+    write_ndjson(source, film_records(3))
+    main(["import", str(source)])
+    with database.Session() as session:
+        assert len(get_all_films(session)) == 3
+    database.configure()
@@ -0,0 +1,61 @@
+"""Stress tests that cover the concurrent films service"""
+import threading
+
+from sqlalchemy import func, select
+
+from database import Base, make_engine
+from film_models import Films
+from films_service import FilmsService
+from repository_films import add_films_bulk, count_by_year
+
+
+def film_rows(start, count):
+    """Film rows with unique titles"""
+    for number in range(start, start + count):
+        yield {"title": f"Film {number}", "director": "Director", "release_year": 2000 + number % 5}
+
+
+def count_films(session):
+    """Number of rows in films"""
+    return session.scalar(select(func.count()).select_from(Films))
+
+
+def test_parallel_reads_with_single_writer(tmp_path):
+    """Readers see a consistent, growing table while one writer inserts batches"""
+    engine = make_engine("read_heavy", f"sqlite:///{tmp_path / 'films.sqlite3'}", pool_size=8)
+    Base.metadata.create_all(bind=engine)
+    with FilmsService(engine) as service:
+        assert service.readers == 8
+        service.write(add_films_bulk, film_rows(0, 100)).result()
+
+        writes = [
+            service.write(add_films_bulk, film_rows(100 + batch * 50, 50), 50) for batch in range(20)
+        ]
+        observed = []
+        lock = threading.Lock()
+
+        def read_count(session):
+            total = count_films(session)
+            per_year = sum(count_by_year(session).values())
+            with lock:
+                observed.append((total, per_year))
+            return total
+
+        service.read_many(read_count, [()] * 200)
+        inserted = sum(len(future.result()) for future in writes)
+        final = service.read(count_films).result()
+
+    assert inserted == 1000
+    assert final == 1100
+    assert all(100 <= total <= 1100 for total, _ in observed)
+    # Both queries of one call see the same snapshot even though the writer keeps going
+    assert all(total == per_year for total, per_year in observed)
+    engine.dispose()
+
+
+def test_reader_pool_defaults_to_engine_pool_size(tmp_path):
+    """Reader threads match the connection pool so readers never queue for connections"""
+    engine = make_engine("default", f"sqlite:///{tmp_path / 'films.sqlite3'}", pool_size=3)
+    with FilmsService(engine) as service:
+        assert service.readers == 3
+    engine.dispose()
@@ -0,0 +1,41 @@
+"""Tests that cover vectorized age computation"""
+from datetime import date, timedelta
+
+import pytest
+
+from Task_Standard_Library import age_calculation
+
+np = pytest.importorskip("numpy")
+from persons_columns import (compute_ages, filter_minors_batched,  # noqa: E402
+                             minor_mask, parse_birth_dates)
+
+INVALID = ["", "2023-02-30", "2023-13-01", "0000-01-01", "2023-02-29", "2010/01/05", "2010-01-05 ", "abc", "२०१०-०१-०५x"]
+UNPADDED = ["2010-1-5", "2010-01- 5", "2004-2-29"]
+
+
+@pytest.mark.parametrize("today", [date(2024, 2, 28), date(2024, 2, 29), date(2025, 2, 28), date(2025, 3, 1), date(2025, 12, 31)])
+def test_ages_match_age_calculation(today):
+    """Every day over 30 years, leap days included, gets the same age as age_calculation"""
+    values = [(date(1996, 1, 1) + timedelta(days=offset)).isoformat() for offset in range(11000)]
+    values += INVALID + UNPADDED
+    expected = [age_calculation(value, today) for value in values]
+    birth_dates = parse_birth_dates(values)
+    ages = compute_ages(birth_dates, today)
+    assert [None if invalid else int(age) for age, invalid in zip(ages, birth_dates.invalid)] == expected
+    assert minor_mask(birth_dates, today).tolist() == [age is not None and age < 18 for age in expected]
+
+
+def test_invalid_dates_are_masked_without_printing(capsys):
+    """Negative test to verify that bad dates end up in the mask and nothing is printed"""
+    birth_dates = parse_birth_dates(INVALID + [None, 20100105])
+    assert birth_dates.invalid.all()
+    assert (compute_ages(birth_dates, date(2025, 1, 1)) == -1).all()
+    assert capsys.readouterr().out == ""
+
+
+def test_filter_minors_batched():
+    """Batches keep input order and skip invalid dates"""
+    persons = [{"name": str(number), "birth_date": f"20{number:02d}-06-15"} for number in range(20)]
+    persons.insert(3, {"name": "bad", "birth_date": "2015-02-30"})
+    minors = filter_minors_batched(persons, date(2025, 6, 14), batch_size=4)
+    assert [person["name"] for person in minors] == [str(number) for number in range(7, 20)]
@@ -0,0 +1,128 @@
+"""Tests that cover the on-disk birth-date index"""
+import json
+import os
+from datetime import date, timedelta
+
+import pytest
+
+import persons_index
+from persons_cli import main
+from persons_index import BirthDateIndex, build_index, index_status, update_index
+from Task_Standard_Library import AgeFilter
+
+REFERENCE = date(2025, 2, 28)
+
+
+def make_persons(start, count):
+    """Persons with birth dates every 97 days, some malformed or invalid"""
+    persons = []
+    for number in range(start, start + count):
+        birth_date = (date(1940, 1, 1) + timedelta(days=number * 97 % 31000)).isoformat()
+        if number % 17 == 0:
+            birth_date = "2008-2-29" if number % 2 else "2023-02-30"
+        persons.append({"name": f"Żaneta café {number}", "birth_date": birth_date})
+    return persons
+
+
+def write_persons(path, persons, file_format):
+    """Write persons as a JSON array (mixing escaped and raw UTF-8) or NDJSON"""
+    lines = [json.dumps(person, ensure_ascii=bool(number % 2)) for number, person in enumerate(persons)]
+    text = "[\n" + ",\n".join(lines) + "\n]\n" if file_format == "array" else "".join(line + "\n" for line in lines)
+    path.write_text(text, encoding="utf-8")
+
+
+def expected(persons, min_age, max_age):
+    """Persons an AgeFilter scan selects"""
+    matches = AgeFilter(min_age, max_age, REFERENCE).predicate(quiet=True)
+    return [person for person in persons if matches(person["birth_date"])]
+
+
+@pytest.mark.parametrize("file_format", ["array", "ndjson"])
+def test_index_answers_brackets_like_a_scan(tmp_path, file_format):
+    """Two binary searches give the same persons, in file order, as filtering every record"""
+    persons = make_persons(0, 500)
+    path = tmp_path / f"persons.{file_format}"
+    write_persons(path, persons, file_format)
+    assert index_status(str(path)) == "missing"
+    assert build_index(str(path)) == sum(1 for number in range(500) if number % 17 or number % 2)
+    assert index_status(str(path)) == "fresh"
+    with BirthDateIndex(str(path)) as index:
+        for min_age, max_age in [(None, 17), (18, 64), (65, None), (16, 16), (None, None), (200, None)]:
+            assert list(index.query(min_age, max_age, REFERENCE)) == expected(persons, min_age, max_age)
+            assert index.count(min_age, max_age, REFERENCE) == len(expected(persons, min_age, max_age))
+
+
+@pytest.mark.parametrize("file_format", ["array", "ndjson"])
+def test_index_is_extended_after_append(tmp_path, file_format):
+    """Records appended at the end are indexed without rescanning the file"""
+    persons, more = make_persons(0, 300), make_persons(300, 40)
+    path = tmp_path / f"persons.{file_format}"
+    write_persons(path, persons, file_format)
+    build_index(str(path))
+    if file_format == "array":
+        text = path.read_text(encoding="utf-8").rstrip().rstrip("]").rstrip()
+        path.write_text(text + ",\n" + ",\n".join(json.dumps(person) for person in more) + "\n]\n", encoding="utf-8")
+    else:
+        with open(path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(person) + "\n" for person in more)
+    assert index_status(str(path)) == "appended"
+    assert update_index(str(path)) == ("appended", len(expected(more, None, None)))
+    with BirthDateIndex(str(path)) as index:
+        assert list(index.query(None, 17, REFERENCE)) == expected(persons + more, None, 17)
+
+
+@pytest.mark.parametrize("update", [False, True])
+def test_append_during_scan_is_not_lost(tmp_path, monkeypatch, update):
+    """Negative test to verify that records appended while the index is built are not marked indexed"""
+    persons, more = make_persons(0, 100), make_persons(100, 10)
+    path = tmp_path / "persons.ndjson"
+    write_persons(path, persons, "ndjson")
+    if update:
+        build_index(str(path))
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(persons[0]) + "\n")
+        persons = persons + persons[:1]
+    scan = persons_index._scan
+
+    def scan_then_append(*args):
+        result = scan(*args)
+        with open(path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(person) + "\n" for person in more)
+        return result
+
+    monkeypatch.setattr(persons_index, "_scan", scan_then_append)
+    if update:
+        update_index(str(path))
+    else:
+        build_index(str(path))
+    monkeypatch.setattr(persons_index, "_scan", scan)
+    assert index_status(str(path)) == "appended"
+    update_index(str(path))
+    with BirthDateIndex(str(path)) as index:
+        assert list(index.query(reference=REFERENCE)) == expected(persons + more, None, None)
+
+
+def test_rewritten_file_is_stale(tmp_path):
+    """Negative test to verify that a rewritten file is detected and the index rebuilt"""
+    path = tmp_path / "persons.ndjson"
+    write_persons(path, make_persons(0, 50), "ndjson")
+    build_index(str(path))
+    write_persons(path, make_persons(1000, 60), "ndjson")
+    os.utime(path, ns=(0, 0))
+    assert index_status(str(path)) == "stale"
+    with pytest.raises(ValueError):
+        BirthDateIndex(str(path))
+    assert update_index(str(path))[0] == "stale"
+    with BirthDateIndex(str(path)) as index:
+        assert list(index.query(reference=REFERENCE)) == expected(make_persons(1000, 60), None, None)
+
+
+def test_cli_bracket(tmp_path, capsys):
+    """CLI builds the index on first use and prints the bracket"""
+    persons = make_persons(0, 200)
+    path = tmp_path / "persons.json"
+    write_persons(path, persons, "array")
+    assert main(["bracket", str(path), "--max-age", "17", "--reference-date", "2025-02-28", "--count"]) == 0
+    assert capsys.readouterr().out == f"{len(expected(persons, None, 17))}\n"
+    assert main(["index", str(path)]) == 0
+    assert "index fresh" in capsys.readouterr().out
@@ -0,0 +1,81 @@
+"""Tests that cover the streaming persons reader"""
+import io
+import json
+from datetime import date
+
+import pytest
+
+import persons_io
+from persons_io import read_persons
+from Task_Standard_Library import filter_minors
+
+PERSONS = [
+    {"name": "Anna", "birth_date": "2015-04-01"},
+    {"name": "Ivan", "birth_date": "1980-12-31", "tags": ["a", "]"]},
+    {"name": "Olga", "birth_date": "not a date"},
+]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [json.dumps(PERSONS), json.dumps(PERSONS, indent=2), "\n".join(map(json.dumps, PERSONS)) + "\n"],
+    ids=["array", "indented array", "ndjson"],
+)
+def test_read_persons_formats(monkeypatch, text):
+    """Persons are decoded the same way from arrays and NDJSON, across chunk boundaries"""
+    monkeypatch.setattr(persons_io, "CHUNK_SIZE", 5)
+    assert list(read_persons(io.StringIO(text))) == PERSONS
+
+
+def test_read_persons_empty_inputs():
+    """Empty files and empty arrays give no persons"""
+    assert list(read_persons(io.StringIO(""))) == []
+    assert list(read_persons(io.StringIO(" [ ] "))) == []
+
+
+@pytest.mark.parametrize("text", ['[{"a": 1},]', '[{"a": 1} {"b": 2}]', '[{"a": 1}'])
+def test_read_persons_malformed_array(text):
+    """Negative test to verify that broken arrays raise JSONDecodeError"""
+    with pytest.raises(json.JSONDecodeError):
+        list(read_persons(io.StringIO(text), "array"))
+
+
+class CountingStream(io.StringIO):
+    """Text stream that counts read calls"""
+
+    reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def test_read_persons_stops_at_syntax_error(monkeypatch):
+    """Negative test to verify that a syntax error is raised without reading the rest of the file"""
+    monkeypatch.setattr(persons_io, "CHUNK_SIZE", 64)
+    stream = CountingStream('[{"name": "Anna" "birth_date": "2015-04-01"}, ' + json.dumps(PERSONS * 1000)[1:])
+    with pytest.raises(json.JSONDecodeError):
+        list(read_persons(stream))
+    assert stream.reads == 1
+
+
+@pytest.mark.parametrize("value", ['"Łukasz \\u0142 \\"x\\""', "-12.5e+3", "-Infinity", "true", "null"])
+def test_read_persons_values_across_chunks(monkeypatch, value):
+    """Values cut at any chunk boundary are completed from the next chunk"""
+    text = f'[{{"name": {value}}}, {{"name": {value}}}]'
+    for size in range(1, len(text)):
+        monkeypatch.setattr(persons_io, "CHUNK_SIZE", size)
+        assert list(read_persons(io.StringIO(text))) == json.loads(text)
+
+
+def test_read_persons_is_lazy():
+    """Persons before a broken record are yielded before the error is raised"""
+    persons = read_persons(io.StringIO('[{"a": 1}, {"b": '))
+    assert next(persons) == {"a": 1}
+    with pytest.raises(json.JSONDecodeError):
+        next(persons)
+
+
+def test_filter_minors():
+    """Only persons younger than 18 pass, invalid dates are skipped"""
+    assert [person["name"] for person in filter_minors(iter(PERSONS), date(2025, 1, 1))] == ["Anna"]
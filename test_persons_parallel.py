@@ -0,0 +1,122 @@
+"""Tests that cover parallel processing of persons files"""
+import json
+from datetime import date
+
+import pytest
+
+import persons_io
+from persons_cli import main
+from persons_io import read_ndjson_range
+from persons_parallel import Shard, expand_inputs, plan_shards, process_files, process_shard
+
+REFERENCE = date(2025, 1, 1)
+
+
+def write_ndjson(path, persons):
+    """Write persons one per line"""
+    path.write_text("".join(json.dumps(person, ensure_ascii=False) + "\n" for person in persons), encoding="utf-8")
+
+
+@pytest.fixture
+def persons_dir(tmp_path):
+    """Directory with an NDJSON file, a JSON array file and a broken file"""
+    write_ndjson(tmp_path / "a.ndjson", [{"name": f"a{number}", "birth_date": f"{1995 + number}-05-01"} for number in range(20)])
+    (tmp_path / "b.json").write_text(json.dumps([{"name": "b0", "birth_date": "2015-01-01"}, {"name": "b1", "birth_date": "1970-01-01"}]))
+    (tmp_path / "c.json").write_text('[{"name": "c0", "birth_date": "2015-01-01"}, {"name": ')
+    (tmp_path / "notes.txt").write_text("not persons")
+    return tmp_path
+
+
+def test_read_ndjson_range_covers_every_line_once(tmp_path):
+    """Adjacent byte ranges split lines without losing or repeating any"""
+    persons = [{"name": "Łukasz" * (number % 5), "number": number} for number in range(100)]
+    path = tmp_path / "persons.ndjson"
+    write_ndjson(path, persons)
+    size = path.stat().st_size
+    for step in (1, 13, 250, size):
+        read = []
+        for start in range(0, size, step):
+            read.extend(read_ndjson_range(str(path), start, min(start + step, size)))
+        assert read == persons
+
+
+def test_expand_and_plan_shards(persons_dir):
+    """Directories expand to persons files; only large NDJSON files are split"""
+    paths = expand_inputs([str(persons_dir)])
+    assert [path.rsplit("/", 1)[1] for path in paths] == ["a.ndjson", "b.json", "c.json"]
+    shards = plan_shards(paths, shard_size=100)
+    assert [shard.path for shard in shards].count(paths[0]) > 1
+    assert Shard(paths[1]) in shards and Shard(paths[2]) in shards
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_process_files_is_deterministic(persons_dir, jobs):
+    """Ordered results follow file and byte order whatever the number of workers"""
+    shards = plan_shards(expand_inputs([str(persons_dir / "*json")]), shard_size=64)
+    results = list(process_files(shards, ["age < 18"], REFERENCE, jobs))
+    names = [json.loads(line)["name"] for result in results if not result.error for line in result.outputs[0]]
+    assert names == [f"a{number}" for number in range(12, 20)] + ["b0"]
+    assert [result.shard.path.endswith("c.json") for result in results if result.error] == [True]
+
+
+def test_process_shard_reports_missing_file(tmp_path):
+    """Negative test to verify that unreadable files are reported instead of raising"""
+    result = process_shard(Shard(str(tmp_path / "missing.json")), ["age < 18"], REFERENCE)
+    assert result.outputs == [] and "FileNotFoundError" in result.error
+
+
+def test_cli_filter(persons_dir, capsys):
+    """CLI merges matches into one NDJSON file and fails when a file is broken"""
+    output = persons_dir / "out.ndjson"
+    code = main(["filter", str(persons_dir), "--jobs", "2", "--reference-date", "2025-01-01", "--output", str(output), "--shard-size", "64"])
+    assert code == 1
+    assert [json.loads(line)["name"] for line in output.read_text().splitlines()] == [f"a{number}" for number in range(12, 20)] + ["b0"]
+    errors = capsys.readouterr().err
+    assert "c.json: JSONDecodeError" in errors and "1 failed files" in errors
+
+
+@pytest.mark.parametrize("order", ["input", "completion"])
+def test_cli_drops_every_shard_of_a_broken_file(tmp_path, capsys, order):
+    """Negative test to verify that a bad line in one shard drops the matches of the whole file"""
+    write_ndjson(tmp_path / "a.ndjson", [{"name": f"a{number}", "birth_date": "2015-01-01"} for number in range(20)])
+    good = "".join(json.dumps({"name": f"d{number}", "birth_date": "2015-01-01"}) + "\n" for number in range(20))
+    (tmp_path / "d.ndjson").write_text(good + '{"name": }\n', encoding="utf-8")
+    output = tmp_path / "out.ndjson"
+    code = main([
+        "filter", str(tmp_path / "*.ndjson"), "--reference-date", "2025-01-01", "--jobs", "2",
+        "--order", order, "--output", str(output), "--shard-size", "64",
+    ])
+    assert code == 1
+    assert sorted(json.loads(line)["name"] for line in output.read_text().splitlines()) == sorted(f"a{number}" for number in range(20))
+    errors = capsys.readouterr().err
+    assert f"d.ndjson: JSONDecodeError: Expecting value at byte {len(good) + 9}" in errors
+    assert "20 matches" in errors and "1 failed files" in errors
+
+
+def test_array_errors_report_file_position(monkeypatch, tmp_path):
+    """Negative test to verify that errors past the first chunk of an array give their position in the file"""
+    monkeypatch.setattr(persons_io, "CHUNK_SIZE", 16)
+    text = json.dumps([{"name": f"p{number}"} for number in range(10)])[:-1] + ', {"name" 1}]'
+    path = tmp_path / "persons.json"
+    path.write_text(text, encoding="utf-8")
+    result = process_shard(Shard(str(path)), ["age < 18"], REFERENCE)
+    assert f"Expecting ':' delimiter at char {text.index(' 1}')}" in result.error
+
+
+def test_cli_answers_several_queries_in_one_pass(persons_dir):
+    """Every --where gets its own output file"""
+    minors, adults = persons_dir / "minors.ndjson", persons_dir / "adults.ndjson"
+    code = main([
+        "filter", str(persons_dir / "*json"), "--reference-date", "2025-01-01", "--jobs", "1",
+        "--where", "age < 18", "--output", str(minors),
+        "--where", "age >= 50", "--output", str(adults),
+    ])
+    assert code == 1
+    assert len(minors.read_text().splitlines()) == 9
+    assert [json.loads(line)["name"] for line in adults.read_text().splitlines()] == ["b1"]
+
+
+@pytest.mark.parametrize("arguments", [["--where", "age <"], ["--where", "age < 18", "--where", "age > 60"]])
+def test_cli_rejects_bad_queries(persons_dir, arguments):
+    """Negative test to verify that invalid queries or missing outputs stop the run"""
+    assert main(["filter", str(persons_dir)] + arguments) == 2
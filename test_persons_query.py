@@ -0,0 +1,89 @@
+"""Tests that cover the persons query language"""
+from datetime import date, timedelta
+
+import pytest
+
+from persons_query import QueryError, compile_query, route
+from Task_Standard_Library import age_calculation
+
+REFERENCE = date(2025, 3, 1)
+
+PERSONS = [
+    {"name": "Anna", "birth_date": "2008-02-29", "country": "PL", "address": {"city": "Warsaw"}},
+    {"name": "Ivan", "birth_date": "1950-05-05", "country": "BY", "address": {"city": "Minsk"}},
+    {"name": "Olga", "birth_date": "not a date", "country": "PL"},
+    {"name": "", "birth_date": "2010-1-5", "country": "DE", "address": "unknown"},
+]
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("age < 18", ["Anna", ""]),
+        ('age >= 65 and country == "PL"', []),
+        ('age >= 65 or country == "PL"', ["Anna", "Ivan", "Olga"]),
+        ("17 == age", ["Anna"]),
+        ('18 <= age < 80 or address.city in ("Warsaw",)', ["Anna", "Ivan"]),
+        ('country not in ["PL", "BY"]', [""]),
+        ("not name", [""]),
+        ("age != 17", ["Ivan", ""]),
+        ('country != "PL"', ["Ivan", ""]),
+        ('address.city != "Minsk"', ["Anna"]),
+        ("age < 17.5", ["Anna", ""]),
+        ("age > -1", ["Anna", "Ivan", ""]),
+        ("missing > 3", []),
+        ("country > 3", []),
+        ("address.city == None", ["Olga", ""]),
+        ("address.city != None", ["Anna", "Ivan"]),
+    ],
+)
+def test_compile_query(expression, expected):
+    """Expressions select persons by fields, nested fields and derived age"""
+    matches = compile_query(expression, REFERENCE)
+    assert [person["name"] for person in PERSONS if matches(person)] == expected
+
+
+@pytest.mark.parametrize(
+    "expression, check",
+    [
+        ("age < 18", lambda age: age < 18),
+        ("age <= 17", lambda age: age <= 17),
+        ("age > 64", lambda age: age > 64),
+        ("age >= 30", lambda age: age >= 30),
+        ("age == 40", lambda age: age == 40),
+        ("18 < age", lambda age: 18 < age),
+        ("18 <= age < 30", lambda age: 18 <= age < 30),
+        ("30 < age <= 20", lambda age: False),
+        ("age != 40", lambda age: age != 40),
+    ],
+)
+def test_age_comparisons_match_age_calculation(capsys, expression, check):
+    """Comparisons with whole numbers use cutoffs but agree with age_calculation on every day"""
+    persons = [{"birth_date": (date(1920, 1, 1) + timedelta(days=offset)).isoformat()} for offset in range(0, 40000, 5)]
+    persons += [{"birth_date": "2008-02-29"}, {"birth_date": "2007-3-1"}, {"birth_date": "2023-02-30"}]
+    matches = compile_query(expression, REFERENCE)
+    ages = [age_calculation(person["birth_date"], REFERENCE, quiet=True) for person in persons]
+    expected = [person for person, age in zip(persons, ages) if age is not None and check(age)]
+    assert [person for person in persons if matches(person)] == expected
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("expression", ["age != 30", 'country != "PL"', "name != name"])
+def test_not_equal_is_false_for_missing_values(expression):
+    """Negative test to verify that != does not match persons lacking the compared value"""
+    matches = compile_query(expression, REFERENCE)
+    assert not matches({}) and not matches({"birth_date": "bad"})
+
+
+@pytest.mark.parametrize("expression", ["age <", '__import__("os")', "name.upper()", "age ** 2 > 4", "lambda: 1", "age is 5", "[x for x in y]"])
+def test_compile_query_rejects_unsupported_syntax(expression):
+    """Negative test to verify that anything beyond fields, constants and comparisons is refused"""
+    with pytest.raises(QueryError):
+        compile_query(expression, REFERENCE)
+
+
+def test_route_answers_several_queries_in_one_pass():
+    """Each person is read once and reported for every query it matches"""
+    predicates = [compile_query("age < 18", REFERENCE), compile_query('country == "PL"', REFERENCE)]
+    routed = [(index, person["name"]) for index, person in route(iter(PERSONS), predicates)]
+    assert routed == [(0, "Anna"), (1, "Anna"), (1, "Olga"), (0, "")]
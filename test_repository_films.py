@@ -0,0 +1,256 @@
+"""Tests that cover films repository functionality"""
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import IntegrityError
+
+from film_models import Films
+from repository_films import (add_films_bulk, count_by_year, delete_all_films,
+                              ensure_indexes, ensure_natural_key,
+                              find_by_director,
+                              find_by_year_range,
+                              get_all_films, get_film_records,
+                              iter_film_records, iter_films, rebuild_search_index,
+                              search_films, update_films, upsert_films)
+
+
+def film_rows(count):
+    """Generate film rows lazily"""
+    for number in range(count):
+        yield {"title": f"Film {number}", "director": "Director", "release_year": 2000 + number}
+
+
+def test_add_films_bulk_returns_ids_in_order(session):
+    """Bulk insert accepts a generator and returns ids in input order"""
+    ids = add_films_bulk(session, film_rows(25), batch_size=10)
+    films = get_all_films(session)
+    assert len(ids) == 25
+    assert [film.id for film in films] == ids
+    assert [film.title for film in films] == [f"Film {number}" for number in range(25)]
+
+
+def test_add_films_bulk_accepts_model_instances(session):
+    """Bulk insert accepts Films objects as well as dicts"""
+    ids = add_films_bulk(session, [Films(title="Poor things", director="Yorgos Lanthimos", release_year=2023)])
+    assert session.get(Films, ids[0]).title == "Poor things"
+
+
+def test_add_films_bulk_invalid_batch_size(session):
+    """Negative test to verify that batch size must be positive"""
+    with pytest.raises(ValueError):
+        add_films_bulk(session, film_rows(1), batch_size=0)
+
+
+def test_iter_films_pages_through_table(session):
+    """Streaming reader yields every film in id order across several pages"""
+    ids = add_films_bulk(session, film_rows(23))
+    assert [film.id for film in iter_films(session, page_size=5)] == ids
+
+
+def test_iter_films_resumes_after_cursor(session):
+    """Streaming reader continues after the given id and leaves nothing in the identity map"""
+    ids = add_films_bulk(session, film_rows(10))
+    session.expunge_all()
+    resumed = [film.id for film in iter_films(session, page_size=3, after_id=ids[3])]
+    assert resumed == ids[4:]
+    assert len(session.identity_map) == 0
+
+
+def test_update_films_groups_and_counts_matches(session):
+    """Batched update changes rows with different column sets and counts only existing ids"""
+    ids = add_films_bulk(session, film_rows(4))
+    matched = update_films(session, {
+        ids[0]: {"title": "Kryshtal", "director": "Darya Zhuk"},
+        ids[1]: {"release_year": 1999},
+        ids[2]: {"title": "La la land"},
+        10_000: {"title": "Missing"},
+    })
+    session.expunge_all()
+    films = {film.id: film for film in get_all_films(session)}
+    assert matched == 3
+    assert (films[ids[0]].title, films[ids[0]].director) == ("Kryshtal", "Darya Zhuk")
+    assert films[ids[1]].release_year == 1999
+    assert films[ids[2]].title == "La la land"
+    assert films[ids[3]].title == "Film 3"
+
+
+def test_update_films_refreshes_loaded_instances(session):
+    """Films already in the session reflect new values without emitting a reload"""
+    ids = add_films_bulk(session, film_rows(2))
+    film = session.get(Films, ids[0])
+    update_films(session, {ids[0]: {"title": "Poor things"}})
+    assert "title" in film.__dict__
+    assert film.title == "Poor things"
+    assert film.id == ids[0]
+
+
+def test_update_films_wins_over_pending_changes(session):
+    """Batch values are not overwritten by unflushed changes of the same film"""
+    ids = add_films_bulk(session, film_rows(1))
+    film = session.get(Films, ids[0])
+    film.title = "Pending"
+    film.director = "Agnes Varda"
+    update_films(session, {ids[0]: {"title": "Batch"}})
+    stored = session.execute(text("SELECT title, director FROM films WHERE id = :id"), {"id": ids[0]}).one()
+    assert tuple(stored) == ("Batch", "Agnes Varda")
+    assert (film.title, film.director) == ("Batch", "Agnes Varda")
+
+
+def test_update_films_unknown_column(session):
+    """Negative test to verify that unknown columns are rejected"""
+    ids = add_films_bulk(session, film_rows(1))
+    with pytest.raises(ValueError):
+        update_films(session, {ids[0]: {"budget": 10}})
+
+
+def query_plans(engine, session, call):
+    """Run a repository call and return EXPLAIN QUERY PLAN details of its SELECT statements"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        call(session)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    connection = session.connection().connection.dbapi_connection
+    return [
+        " | ".join(row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters))
+        for statement, parameters in statements
+    ]
+
+
+@pytest.mark.parametrize("call, index_name", [
+    (lambda session: find_by_director(session, "Director 1"), "ix_films_director_release_year"),
+    (lambda session: find_by_year_range(session, 2001, 2003), "ix_films_release_year"),
+    (lambda session: count_by_year(session), "ix_films_release_year"),
+    (lambda session: count_by_year(session, 2001, 2003), "ix_films_release_year"),
+])
+def test_indexed_queries_use_index(engine, session, call, index_name):
+    """Indexed repository queries must not regress to a full table scan"""
+    add_films_bulk(session, film_rows(50))
+    plans = query_plans(engine, session, call)
+    assert plans
+    for plan in plans:
+        assert index_name in plan
+        assert "SCAN films" not in plan or "COVERING INDEX" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_ensure_indexes_on_old_table(engine, session):
+    """Missing lookup indexes are created once and then used by the queries"""
+    for name in ("ix_films_director", "ix_films_director_release_year"):
+        session.execute(text(f"DROP INDEX {name}"))
+    session.commit()
+    assert ensure_indexes(session) == ["ix_films_director", "ix_films_director_release_year"]
+    assert ensure_indexes(session) == []
+    add_films_bulk(session, film_rows(50))
+    plans = query_plans(engine, session, lambda session: find_by_director(session, "Director 1"))
+    assert all("ix_films_director_release_year" in plan for plan in plans)
+
+
+def test_indexed_queries_results(session):
+    """Indexed repository queries return matching films in year order"""
+    add_films_bulk(session, (
+        {"title": f"Film {number}", "director": f"Director {number % 2}", "release_year": 2000 + number % 5}
+        for number in range(20)
+    ))
+    by_director = find_by_director(session, "Director 1")
+    in_range = find_by_year_range(session, 2001, 2002)
+    assert len(by_director) == 10
+    assert [film.release_year for film in by_director] == sorted(film.release_year for film in by_director)
+    assert {film.release_year for film in in_range} == {2001, 2002}
+    assert count_by_year(session) == {year: 4 for year in range(2000, 2005)}
+    assert count_by_year(session, 2003) == {2003: 4, 2004: 4}
+
+
+def test_search_films_ranks_and_follows_changes(session):
+    """Full-text index is kept in sync by triggers on insert, update and delete"""
+    ids = add_films_bulk(session, [
+        {"title": "Blade Runner 2049", "director": "Denis Villeneuve", "release_year": 2017},
+        {"title": "Blade Runner", "director": "Ridley Scott", "release_year": 1982},
+        {"title": "Dune", "director": "Denis Villeneuve", "release_year": 2021},
+    ])
+    assert {film.id for film in search_films(session, "blade runner")} == {ids[0], ids[1]}
+    assert [film.id for film in search_films(session, "villeneuve dune")] == [ids[2]]
+
+    update_films(session, {ids[2]: {"title": "Arrival"}})
+    assert search_films(session, "dune") == []
+    assert [film.id for film in search_films(session, "arrival")] == [ids[2]]
+
+    delete_all_films(session)
+    assert search_films(session, "villeneuve") == []
+
+
+def test_search_films_quotes_user_input(session):
+    """Negative test to verify that FTS5 operators in user input do not raise"""
+    add_films_bulk(session, film_rows(3))
+    assert search_films(session, 'film" OR *') == []
+    assert search_films(session, "   ") == []
+
+
+def test_rebuild_search_index(session):
+    """Rebuild repopulates the index for rows written while it was missing"""
+    add_films_bulk(session, film_rows(3))
+    session.execute(text("DROP TABLE films_fts"))
+    session.commit()
+    rebuild_search_index(session)
+    assert len(search_films(session, "film")) == 3
+
+
+def test_upsert_films_is_idempotent(session):
+    """Replaying a feed inserts only new films, including duplicates inside one batch"""
+    first = upsert_films(session, list(film_rows(5)) + list(film_rows(2)), batch_size=3)
+    second = upsert_films(session, film_rows(7))
+    assert (first.inserted, first.updated) == (5, 0)
+    assert (second.inserted, second.updated) == (2, 0)
+    assert len(get_all_films(session)) == 7
+
+
+def test_natural_key_is_unique(session):
+    """Negative test to verify that plain inserts cannot duplicate the natural key"""
+    add_films_bulk(session, film_rows(1))
+    with pytest.raises(IntegrityError):
+        add_films_bulk(session, film_rows(1))
+
+
+def test_ensure_natural_key_on_old_table(session):
+    """Duplicates of a table without the key are removed, the oldest kept, and upserts work again"""
+    session.execute(text("DROP INDEX uq_films_natural_key"))
+    session.commit()
+    first = add_films_bulk(session, film_rows(3))
+    add_films_bulk(session, film_rows(2))
+    assert ensure_natural_key(session) == 2
+    assert [film.id for film in get_all_films(session)] == first
+    assert ensure_natural_key(session) == 0
+    result = upsert_films(session, film_rows(4))
+    assert (result.inserted, result.updated) == (1, 0)
+
+
+def test_film_records_skip_identity_map(session):
+    """Core read path returns named tuples in id order without ORM objects"""
+    ids = add_films_bulk(session, film_rows(5))
+    session.expunge_all()
+    records = get_film_records(session)
+    assert [record.id for record in records] == ids
+    assert records[0]._fields == ("id", "title", "director", "release_year")
+    assert len(session.identity_map) == 0
+
+
+def test_film_records_projection(session):
+    """Only requested columns are fetched, in the requested order"""
+    add_films_bulk(session, film_rows(3))
+    records = list(iter_film_records(session, ["title", "id"], chunk_size=2))
+    assert records[1] == ("Film 1", 2)
+    assert records[1].title == "Film 1"
+    with pytest.raises(ValueError):
+        get_film_records(session, ("budget",))
+
+
+def test_film_records_leave_connection_options_unchanged(session):
+    """yield_per applies to the streaming query only, not to later statements of the session"""
+    add_films_bulk(session, film_rows(3))
+    list(iter_film_records(session, chunk_size=2))
+    assert "yield_per" not in session.connection().get_execution_options()
@@ -0,0 +1,56 @@
+"""Tests that cover the async films repository"""
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from database import Base, make_async_engine
+from film_models import Films
+from repository_films_async import (add_film, delete_all_films, get_all_films,
+                                    iter_films, update_film)
+
+pytest.importorskip("aiosqlite")
+
+
+def run_with_session(tmp_path, scenario):
+    """Create a temporary async database and run the scenario coroutine against it"""
+
+    async def runner():
+        engine = make_async_engine("test", f"sqlite:///{tmp_path / 'films_async.sqlite3'}")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                return await scenario(session)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(runner())
+
+
+def test_async_crud_round_trip(tmp_path):
+    """Async add, update, read and delete behave like the sync repository"""
+
+    async def scenario(session):
+        for number in range(3):
+            await add_film(session, Films(title=f"Film {number}", director="Director", release_year=2000))
+        await update_film(session, 2, {"title": "Kryshtal", "director": "Darya Zhuk"})
+        titles = [film.title for film in await get_all_films(session)]
+        await delete_all_films(session)
+        return titles, await get_all_films(session)
+
+    titles, remaining = run_with_session(tmp_path, scenario)
+    assert titles == ["Film 0", "Kryshtal", "Film 2"]
+    assert remaining == []
+
+
+def test_async_iter_films_resumes(tmp_path):
+    """Async streaming reader pages by id and resumes after the cursor"""
+
+    async def scenario(session):
+        for number in range(7):
+            await add_film(session, Films(title=f"Film {number}", director="Director", release_year=2000))
+        session.expunge_all()
+        return [film.id async for film in iter_films(session, page_size=2, after_id=3)]
+
+    assert run_with_session(tmp_path, scenario) == [4, 5, 6, 7]
@@ -0,0 +1,98 @@
+"""Tests that cover SQL instrumentation"""
+import json
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from database import MEMORY_URL, Base, make_engine
+from film_models import Films
+from repository_films import add_films_bulk, get_all_films, update_films
+from sql_instrumentation import PeriodicDump, SQLStats, instrument, statement_shape
+
+
+def add_films(session, count):
+    """Insert films through the bulk path"""
+    return add_films_bulk(session, (
+        {"title": f"Film {number}", "director": "Director", "release_year": 2000}
+        for number in range(count)
+    ))
+
+
+def test_instrument_records_latency_and_rows(engine, session):
+    """Statements are grouped by shape with latency histogram and DML row counts"""
+    ids = add_films(session, 3)
+    with instrument(engine) as stats:
+        get_all_films(session)
+        update_films(session, {film_id: {"release_year": 2001} for film_id in ids})
+    snapshot = stats.snapshot()
+    select_stats = next(value for key, value in snapshot["statements"].items() if key.startswith("SELECT"))
+    update_stats = next(value for key, value in snapshot["statements"].items() if key.startswith("UPDATE"))
+    assert select_stats["count"] == 1
+    assert sum(select_stats["histogram"].values()) == 1
+    assert update_stats["rows"] == 3
+    assert snapshot["sessions"]["count"] == 1
+
+
+def test_instrument_flags_n_plus_one(engine, session):
+    """Repeated single-row lookups inside one session transaction are flagged"""
+    ids = add_films(session, 12)
+    session.expunge_all()
+    with instrument(engine, n_plus_one_threshold=10) as stats:
+        for film_id in ids:
+            session.get(Films, film_id)
+        session.commit()
+    assert len(stats.snapshot()["n_plus_one"]) == 1
+
+
+def test_instrument_ignores_sessions_of_other_engines(engine, session):
+    """Sessions bound to another engine are not counted"""
+    other = make_engine("test", MEMORY_URL)
+    Base.metadata.create_all(bind=other)
+    with instrument(engine) as stats:
+        for _ in range(5):
+            with Session(other) as other_session:
+                get_all_films(other_session)
+        get_all_films(session)
+        session.commit()
+    assert stats.snapshot()["sessions"]["count"] == 1
+    other.dispose()
+
+
+def test_instrument_survives_failed_statements(engine, session):
+    """Negative test to verify that a failing statement does not skew later timings"""
+    with instrument(engine) as stats:
+        with pytest.raises(OperationalError):
+            session.execute(text("SELECT * FROM missing_table"))
+        session.rollback()
+        get_all_films(session)
+    assert "sql_stats_started" not in session.connection().info
+    assert sum(value["count"] for value in stats.snapshot()["statements"].values()) == 1
+
+
+def test_instrument_detaches_listeners(engine, session):
+    """Nothing is recorded after the context manager exits"""
+    with instrument(engine) as stats:
+        pass
+    get_all_films(session)
+    assert stats.snapshot()["statements"] == {}
+
+
+def test_statement_shape_collapses_in_lists():
+    """IN-lists of different length share one shape"""
+    assert statement_shape("SELECT * FROM films\n WHERE id IN (?, ?, ?)") == statement_shape(
+        "SELECT * FROM films WHERE id IN (?,?)"
+    )
+
+
+def test_periodic_dump_writes_json(engine, session, tmp_path):
+    """Periodic dump writes the snapshot as JSON"""
+    stats = SQLStats().attach(engine)
+    dumper = PeriodicDump(stats, str(tmp_path / "sql_stats.json"), interval=0.01)
+    dumper.start()
+    get_all_films(session)
+    dumper.stop()
+    stats.detach()
+    data = json.loads((tmp_path / "sql_stats.json").read_text(encoding="utf-8"))
+    assert data["statements"]
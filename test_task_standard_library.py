@@ -0,0 +1,66 @@
+"""Tests that cover age calculation and age filters"""
+from datetime import date, timedelta
+
+import pytest
+
+import Task_Standard_Library
+from Task_Standard_Library import AgeFilter, age_calculation, is_iso_date
+
+BIRTH_DATES = [(date(1920, 1, 1) + timedelta(days=offset)).isoformat() for offset in range(0, 40000, 3)]
+BIRTH_DATES += ["2004-02-29", "2008-02-29", "2010-1-5", "2010-01- 5", "2023-02-30", "2023-13-01", "0000-01-01", "", "1-1-1"]
+
+
+@pytest.mark.parametrize("reference", [date(2024, 2, 28), date(2024, 2, 29), date(2025, 2, 28), date(2025, 3, 1)])
+@pytest.mark.parametrize("min_age, max_age", [(None, 17), (18, None), (18, 64), (65, None), (0, 0), (120, 200)])
+def test_age_filter_matches_age_calculation(capsys, reference, min_age, max_age):
+    """Cutoff comparison selects exactly the persons age_calculation puts in the range"""
+    persons = [{"birth_date": dob} for dob in BIRTH_DATES]
+    expected = [
+        person for person in persons
+        if (age := age_calculation(person["birth_date"], reference)) is not None
+        and (min_age is None or age >= min_age)
+        and (max_age is None or age <= max_age)
+    ]
+    capsys.readouterr()
+    assert list(AgeFilter(min_age, max_age, reference).filter(persons)) == expected
+
+
+def test_age_filter_parses_only_malformed_dates(capsys):
+    """Well-formed dates are compared as strings, only malformed ones reach age_calculation"""
+    age_filter = AgeFilter(max_age=17, reference=date(2025, 1, 1))
+    assert age_filter.matches("2010-01-05")
+    assert capsys.readouterr().out == ""
+    assert age_filter.matches("2010-1-5")
+    assert not age_filter.matches("2010/01/05")
+    assert capsys.readouterr().out == "Invalid date format: 2010/01/05\n"
+    assert not age_filter.matches(None)
+
+
+def test_age_filter_follows_the_current_date(monkeypatch):
+    """Without a reference date the cutoffs move with the calendar, not with import time"""
+
+    class FakeDate(date):
+        current = date(2025, 6, 14)
+
+        @classmethod
+        def today(cls):
+            return cls.current
+
+    monkeypatch.setattr(Task_Standard_Library, "date", FakeDate)
+    minors = AgeFilter(max_age=17)
+    assert minors.matches("2007-06-15")
+    FakeDate.current = date(2025, 6, 15)
+    assert not minors.matches("2007-06-15")
+
+
+@pytest.mark.parametrize("min_age, max_age", [(-1, None), (None, -1), (30, 20)])
+def test_age_filter_invalid_range(min_age, max_age):
+    """Negative test to verify that impossible age ranges are rejected"""
+    with pytest.raises(ValueError):
+        AgeFilter(min_age, max_age)
+
+
+@pytest.mark.parametrize("dob, expected", [("2024-02-29", True), ("2023-02-29", False), ("2023-04-31", False), ("2010-1-5", False), (None, False)])
+def test_is_iso_date(dob, expected):
+    """Only zero-padded strings naming real days are well formed"""
+    assert is_iso_date(dob) is expected